@@ -0,0 +1,145 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_fetch import return_prefix_sums
+
+EMA_SPAN = 30  # The Market Data tab's BULLISH column compares close to EMA_30
+MIN_HISTORY = 252  # Daily returns a range needs before it is scored
+
+COUNTS = (
+    "days",
+    "up_days",
+    "bullish_days",
+    "bullish_up",
+    "bearish_days",
+    "bearish_up",
+    "bullish_return",
+    "bearish_return",
+    "in_band",
+    "above_band",
+    "below_band",
+)
+
+
+def forward_returns(close, horizon):
+    """Return from each bar to the bar ``horizon`` rows later (NaN past the end)."""
+    returns = np.full(len(close), np.nan)
+    if 0 < horizon < len(close):
+        returns[:-horizon] = close[horizon:] / close[:-horizon] - 1.0
+    return returns
+
+
+def expanding_return_stats(close):
+    """Count, mean and std of daily returns up to every bar.
+
+    Bar i gets the statistics DataFetcher.return_stats would compute from the
+    history ending at bar i, for all bars at once from prefix sums.
+    """
+    count, total, squares = return_prefix_sums(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+        std = np.sqrt(np.maximum(squares / count - mean**2, 0.0))
+    return count, mean, std
+
+
+def backtest(close, horizons, span=EMA_SPAN, min_history=MIN_HISTORY):
+    """Score the BULLISH signal and the ±1 std ranges on one close series.
+
+    Every bar with at least ``min_history`` prior returns and a close
+    ``horizon`` bars later is one test. The signal is close > EMA(span) on
+    that bar; the range is mean ± std of the returns up to that bar,
+    projected ``horizon`` days as in calculate_std_ranges_many. Returns
+    horizon -> dict of COUNTS, which add up across tickers (see pool_counts).
+    """
+    close = np.asarray(close, dtype=float)
+    if len(close) <= min_history:
+        raise ValueError("Not enough history to backtest")
+    # Gaps are carried forward for the EMA, like the IndicatorEngine does
+    ema = pd.Series(close).ffill().ewm(span=span, adjust=False).mean().to_numpy()
+    bullish = close > ema
+    count, mean, std = expanding_return_stats(close)
+    enough = count >= min_history
+
+    results = {}
+    for horizon in horizons:
+        change = forward_returns(close, horizon)
+        tested = enough & np.isfinite(change)
+        up = change > 0
+        bull, bear = tested & bullish, tested & ~bullish
+
+        spread = std * np.sqrt(horizon)
+        above = tested & (change > mean * horizon + spread)
+        below = tested & (change < mean * horizon - spread)
+        results[horizon] = {
+            "days": int(tested.sum()),
+            "up_days": int((tested & up).sum()),
+            "bullish_days": int(bull.sum()),
+            "bullish_up": int((bull & up).sum()),
+            "bearish_days": int(bear.sum()),
+            "bearish_up": int((bear & up).sum()),
+            "bullish_return": float(change[bull].sum()),
+            "bearish_return": float(change[bear].sum()),
+            "in_band": int((tested & ~above & ~below).sum()),
+            "above_band": int(above.sum()),
+            "below_band": int(below.sum()),
+        }
+    return results
+
+
+def pool_counts(results):
+    """Add up the COUNTS of several backtest results for one horizon."""
+    return {name: sum(counts[name] for counts in results) for name in COUNTS}
+
+
+def _rate(numerator, denominator):
+    return numerator / denominator if denominator else float("nan")
+
+
+def summarize(counts):
+    """Turn COUNTS into hit rates and mean forward returns.
+
+    "hit_rate" is the share of BULLISH bars that were higher ``horizon``
+    days later, against "base_rate" for all bars; "band_hit_rate" is the
+    share that ended inside the ±1 std range (about 68% if returns were
+    normal with a stable mean and std).
+    """
+    return {
+        "days": counts["days"],
+        "bullish_days": counts["bullish_days"],
+        "hit_rate": _rate(counts["bullish_up"], counts["bullish_days"]),
+        "base_rate": _rate(counts["up_days"], counts["days"]),
+        "bearish_hit_rate": _rate(
+            counts["bearish_days"] - counts["bearish_up"], counts["bearish_days"]
+        ),
+        "bullish_mean_return": _rate(counts["bullish_return"], counts["bullish_days"]),
+        "bearish_mean_return": _rate(counts["bearish_return"], counts["bearish_days"]),
+        "band_hit_rate": _rate(counts["in_band"], counts["days"]),
+        "above_band_rate": _rate(counts["above_band"], counts["days"]),
+        "below_band_rate": _rate(counts["below_band"], counts["days"]),
+    }
+
+
+def _backtest_job(job):
+    ticker, close, horizons, kwargs = job
+    try:
+        return ticker, backtest(close, horizons, **kwargs)
+    except ValueError:
+        return ticker, None
+
+
+def backtest_many(closes, horizons, processes=None, **kwargs):
+    """Run ``backtest`` for every ticker -> close series in closes.
+
+    With ``processes`` > 1 the tickers are spread over a process pool.
+    Tickers with too little history map to None.
+    """
+    jobs = [
+        (ticker, np.asarray(close, dtype=float), horizons, kwargs)
+        for ticker, close in closes.items()
+    ]
+    if processes and processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as pool:
+            return dict(pool.map(_backtest_job, jobs))
+    return dict(map(_backtest_job, jobs))
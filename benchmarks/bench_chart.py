@@ -0,0 +1,109 @@
+"""Compare rebuilding the chart with mplfinance and updating a persistent one.
+
+The old path built a new figure with ``mpf.plot`` and a new canvas for every
+ticker switch and projection toggle; ``CandlestickChart`` keeps one figure
+and updates its artists. Both render to an off-screen Agg canvas, so no
+display is needed. mplfinance is only needed here, so install
+benchmarks/requirements.txt first. Run from the repository root:
+
+    python -m benchmarks.bench_chart
+"""
+
+import argparse
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import mplfinance as mpf  # noqa: E402
+import numpy as np  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from benchmarks.bench_store import make_history  # noqa: E402
+from chart import CandlestickChart  # noqa: E402
+
+
+def chart_frame(seed, bars):
+    """History with the columns the Market Data tab charts."""
+    data = make_history(bars + 200, seed)
+    data["EMA_30"] = data["Close"].ewm(span=30, adjust=False).mean()
+    data["EMA_200"] = data["Close"].ewm(span=200, adjust=False).mean()
+    projection = np.full(len(data), np.nan)
+    projection[-bars // 2 :] = data["Close"].iloc[-bars // 2 :] * 1.2
+    data["Projection 5 Years"] = projection
+    return data[-bars:]
+
+
+def mplfinance_draw(data, title, show_projection):
+    addplots = [
+        mpf.make_addplot(data["EMA_30"], color="blue"),
+        mpf.make_addplot(data["EMA_200"], color="red"),
+    ]
+    if show_projection:
+        addplots.append(
+            mpf.make_addplot(
+                data["Projection 5 Years"], color="green", linestyle="--", width=0.8
+            )
+        )
+    fig, _ = mpf.plot(
+        data,
+        type="hollow_candle",
+        style="charles",
+        title=title,
+        ylabel="Price",
+        addplot=addplots,
+        returnfig=True,
+    )
+    FigureCanvasAgg(fig).draw()
+    plt.close(fig)
+
+
+def timed(fn, repeat):
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=125, help="bars per chart")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    frames = [chart_frame(seed, args.bars) for seed in range(4)]
+    canvas = FigureCanvasAgg(Figure(figsize=(8, 5.75)))
+    chart = CandlestickChart(canvas)
+    chart.update(frames[0], "warm-up", False)
+
+    def switch(i):
+        # draw_idle renders immediately on a plain Agg canvas
+        chart.update(frames[i % len(frames)], f"T{i}", False)
+
+    def toggle(i):
+        chart.set_projection_visible(i % 2 == 0)
+
+    cases = {
+        "mplfinance, ticker switch": lambda i: mplfinance_draw(
+            frames[i % len(frames)], f"T{i}", False
+        ),
+        "mplfinance, projection toggle": lambda i: mplfinance_draw(
+            frames[0], "T", i % 2 == 0
+        ),
+        "persistent, ticker switch": switch,
+        "persistent, projection toggle": toggle,
+    }
+
+    print(f"{args.bars} bars per chart, median of {args.repeat}")
+    print(f"{'render path':<30}  {'ms':>8}")
+    for label, fn in cases.items():
+        print(f"{label:<30}  {timed(fn, args.repeat) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
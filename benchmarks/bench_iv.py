@@ -0,0 +1,72 @@
+"""Compare the batch implied-volatility solver with the per-contract py_vollib loop.
+
+py_vollib comes from benchmarks/requirements.txt. Run from the repository
+root:
+
+    python -m benchmarks.bench_iv
+"""
+
+import argparse
+import time
+
+import numpy as np
+from py_vollib.black_scholes.implied_volatility import implied_volatility
+
+from benchmarks.bench_pricing import make_chain
+from calculations import IV_OK, RISK_FREE_RATE, OptionCalculator
+
+
+def time_scalar(price, spot, strike, t, option_type):
+    start = time.perf_counter()
+    for i in range(len(price)):
+        try:
+            implied_volatility(
+                price[i], spot[i], strike[i], t[i], RISK_FREE_RATE, option_type[i]
+            )
+        except Exception:
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 100_000])
+    parser.add_argument(
+        "--scalar-limit",
+        type=int,
+        default=20_000,
+        help="time the scalar loop on at most this many quotes and extrapolate",
+    )
+    args = parser.parse_args()
+
+    calculator = OptionCalculator()
+    print(
+        f"{'quotes':>8}  {'scalar (s)':>11}  {'batch (s)':>10}  "
+        f"{'quotes/s':>11}  {'speedup':>8}  {'solved':>7}"
+    )
+    for n in args.sizes:
+        spot, strike, t, vol, option_type = make_chain(n)
+        price = calculator.price_batch(spot, strike, t, vol, option_type)
+
+        sample = min(n, args.scalar_limit)
+        scalar = time_scalar(
+            *(x[:sample] for x in (price, spot, strike, t, option_type))
+        )
+        scalar *= n / sample
+
+        start = time.perf_counter()
+        _, status = calculator.implied_volatility_batch(
+            price, spot, strike, t, option_type, full_output=True
+        )
+        batch = time.perf_counter() - start
+
+        solved = np.mean(status == IV_OK)
+        note = "" if sample == n else "  (scalar extrapolated)"
+        print(
+            f"{n:>8}  {scalar:>11.3f}  {batch:>10.4f}  {n / batch:>11.0f}  "
+            f"{scalar / batch:>7.0f}x  {solved:>6.1%}{note}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compare the batch Black-Scholes engine with the scalar py_vollib loop.
+
+py_vollib comes from benchmarks/requirements.txt. Run from the repository
+root:
+
+    python -m benchmarks.bench_pricing
+"""
+
+import argparse
+import time
+
+import numpy as np
+from py_vollib.black_scholes import black_scholes as bsm
+
+from calculations import RISK_FREE_RATE, OptionCalculator
+
+
+def make_chain(n, seed=0):
+    """Generate a random NIFTY-like chain of n contracts."""
+    rng = np.random.default_rng(seed)
+    spot = rng.uniform(20000, 26000, n)
+    strike = np.round(spot * rng.uniform(0.8, 1.2, n) / 50) * 50
+    t = rng.uniform(1 / 365, 1.0, n)
+    vol = rng.uniform(0.08, 0.45, n)
+    option_type = np.where(rng.random(n) < 0.5, "c", "p")
+    return spot, strike, t, vol, option_type
+
+
+def time_scalar(spot, strike, t, vol, option_type):
+    start = time.perf_counter()
+    for i in range(len(spot)):
+        bsm(option_type[i], spot[i], strike[i], t[i], RISK_FREE_RATE, vol[i])
+    return time.perf_counter() - start
+
+
+def time_batch(calculator, spot, strike, t, vol, option_type):
+    start = time.perf_counter()
+    calculator.price_batch(spot, strike, t, vol, option_type)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--scalar-limit",
+        type=int,
+        default=100_000,
+        help="time the scalar loop on at most this many contracts and extrapolate",
+    )
+    args = parser.parse_args()
+
+    calculator = OptionCalculator()
+    print(f"{'contracts':>10}  {'scalar (s)':>12}  {'batch (s)':>10}  {'speedup':>8}")
+    for n in args.sizes:
+        chain = make_chain(n)
+        sample = min(n, args.scalar_limit)
+        scalar = time_scalar(*(x[:sample] for x in chain)) * n / sample
+        batch = time_batch(calculator, *chain)
+        note = "" if sample == n else "  (scalar extrapolated)"
+        print(
+            f"{n:>10}  {scalar:>12.3f}  {batch:>10.4f}  {scalar / batch:>7.0f}x{note}"
+        )
+
+
+if __name__ == "__main__":
+    main()
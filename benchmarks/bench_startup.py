@@ -0,0 +1,66 @@
+"""Compare import-time cost of the headless CLI with the GUI entry point.
+
+Each target is imported in a fresh interpreter under ``python -X importtime``
+and the cumulative self-reported import time is summed.  Run from the
+repository root:
+
+    python -m benchmarks.bench_startup
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "cli (parse only)": "import cli; cli.build_parser()",
+    "cli price": "import cli, calculations",
+    "cli ranges": "import cli, calculations, data_fetch",
+    "ui (GUI)": "import ui",
+}
+
+HEAVY_MODULES = ("tkinter", "matplotlib", "mplfinance", "pandas", "yfinance")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(code):
+    """Return (total import microseconds, set of top-level modules loaded)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, _, _, name = match.groups()
+        total += int(self_us)
+        modules.add(name.split(".")[0])
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'target':<18}  {'median import (ms)':>18}  heavy modules loaded")
+    for label, code in TARGETS.items():
+        runs = [measure(code) for _ in range(args.repeat)]
+        median = statistics.median(total for total, _ in runs) / 1000
+        heavy = sorted(m for m in HEAVY_MODULES if m in runs[0][1])
+        print(f"{label:<18}  {median:>18.1f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare history loads from pickled DataFrames (diskcache) and the PriceStore.
+
+Synthetic 10-year OHLCV series are written for every watchlist ticker to a
+temporary diskcache and a temporary PriceStore, then read back the ways the
+app uses them. Run from the repository root:
+
+    python -m benchmarks.bench_store
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from diskcache import Cache
+
+from price_store import PriceStore
+from watchlist import all_tickers
+
+
+def make_history(rows, seed):
+    """Random-walk OHLCV frame shaped like a yfinance download."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, rows)))
+    spread = np.abs(rng.normal(0, 0.005, rows))
+    return pd.DataFrame(
+        {
+            "Close": close,
+            "High": close * (1 + spread),
+            "Low": close * (1 - spread),
+            "Open": close * (1 + rng.normal(0, 0.003, rows)),
+            "Volume": rng.integers(10**5, 10**7, rows).astype(float),
+        },
+        index=pd.bdate_range(end="2024-12-31", periods=rows, name="Date"),
+    )
+
+
+def measure(load, tickers, repeat):
+    """Return (median seconds per watchlist pass, peak traced bytes)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for ticker in tickers:
+            load(ticker)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    for ticker in tickers:
+        load(ticker)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(times)), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2500, help="bars per ticker")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tickers = [ticker["ticker"] for ticker in all_tickers()] + ["INR=X"]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Cache(f"{tmp}/cache")
+        store = PriceStore(f"{tmp}/store")
+        for seed, ticker in enumerate(tickers):
+            history = make_history(args.rows, seed)
+            cache.set(ticker, history)
+            store.write(ticker, history)
+
+        cases = {
+            "pickle, full frame": lambda t: cache.get(t),
+            "pickle, last 125 bars": lambda t: cache.get(t).iloc[-125:],
+            "store, full frame": lambda t: store.read(t),
+            "store, Close only": lambda t: store.read(t, columns=["Close"]),
+            "store, last 125 bars": lambda t: store.read(t, tail=125),
+            "store, 2020 range": lambda t: store.read(
+                t, start="2020-01-01", end="2020-12-31"
+            ),
+        }
+
+        print(f"{len(tickers)} tickers x {args.rows} bars")
+        print(f"{'read path':<24}  {'ms / watchlist':>14}  {'peak KiB':>9}")
+        for label, load in cases.items():
+            seconds, peak = measure(load, tickers, args.repeat)
+            print(f"{label:<24}  {seconds * 1000:>14.2f}  {peak / 1024:>9.0f}")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
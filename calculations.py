@@ -1,30 +1,533 @@
-from py_vollib.black_scholes import black_scholes as bsm
-from py_vollib.black_scholes.implied_volatility import implied_volatility
+import numpy as np
+from scipy.special import ndtr
 
+from metrics import METRICS
+from trading_calendar import TradingCalendar
 from utils import calculate_time_to_expiration
 
+RISK_FREE_RATE = 0.07
+# Times to expiration count trading sessions, so theta, charm and days
+# forward are per trading day too
+TRADING_DAYS = TradingCalendar.TRADING_DAYS_PER_YEAR
+
+# Status codes returned by implied_volatility_batch(..., full_output=True)
+IV_OK = 0
+IV_BELOW_INTRINSIC = 1
+IV_ABOVE_MAX_PRICE = 2
+IV_NOT_CONVERGED = 3
+IV_INVALID_INPUT = 4
+
+IV_STATUS_MESSAGES = {
+    IV_BELOW_INTRINSIC: "The volatility is below the intrinsic value.",
+    IV_ABOVE_MAX_PRICE: "The volatility is above the maximum value.",
+    IV_NOT_CONVERGED: "The implied volatility did not converge.",
+    IV_INVALID_INPUT: "Spot, strike and time to expiry must be positive.",
+}
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+# Coarsest volatility a quote's price may pin down for the solve to count as
+# converged: deep in- or out-of-the-money, one ulp of price spans more vol
+_VOL_RESOLUTION = 1e-6
+
+
+def is_call(option_type):
+    """Return a boolean array that is True where the option type is a call.
+
+    Accepts "CALL"/"PUT", "c"/"p" or booleans, as a scalar or an array.
+    """
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+    first = option_type.astype("U1")
+    return (first == "c") | (first == "C")
+
+
+def _black_scholes_terms(
+    spot, strike, time_to_expiration, volatility, option_type, r, q=0.0
+):
+    """Broadcast the inputs and compute the terms shared by prices and Greeks.
+
+    ``q`` is a continuous dividend yield (Black-Scholes-Merton); q = r is
+    Black-76 on a futures price. "spot" in the result is the spot
+    discounted at q, which takes the place of the spot in every formula.
+    """
+    spot, strike, t, vol, r, q = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=float)
+            for x in (spot, strike, time_to_expiration, volatility, r, q)
+        )
+    )
+    call = np.broadcast_to(is_call(option_type), spot.shape)
+
+    live = (t > 0) & (vol > 0)
+    t_live = np.where(live, t, 1.0)
+    vol_live = np.where(live, vol, 1.0)
+    sqrt_t = np.sqrt(t_live)
+    vol_sqrt_t = vol_live * sqrt_t
+    discounted_strike = strike * np.exp(-r * np.maximum(t, 0.0))
+    yield_discount = np.exp(-q * np.maximum(t, 0.0))
+
+    d1 = (
+        np.log(spot / strike) + (r - q + 0.5 * vol_live * vol_live) * t_live
+    ) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+
+    return {
+        "spot": spot * yield_discount,
+        "yield_discount": yield_discount,
+        "r": r,
+        "q": q,
+        "call": call,
+        "live": live,
+        "t": t_live,
+        "vol": vol_live,
+        "sqrt_t": sqrt_t,
+        "vol_sqrt_t": vol_sqrt_t,
+        "discounted_strike": discounted_strike,
+        "d1": d1,
+        "d2": d2,
+        "nd1": ndtr(d1),
+        "nd2": ndtr(d2),
+    }
+
+
+def _black_scholes_price_from_terms(terms):
+    spot, discounted_strike = terms["spot"], terms["discounted_strike"]
+    call = terms["call"]
+    nd1, nd2 = terms["nd1"], terms["nd2"]
+
+    call_price = spot * nd1 - discounted_strike * nd2
+    put_price = call_price - spot + discounted_strike  # put-call parity
+    price = np.where(call, call_price, put_price)
+
+    intrinsic = np.where(call, spot - discounted_strike, discounted_strike - spot)
+    return np.where(terms["live"], price, np.maximum(intrinsic, 0.0))
+
+
+def black_scholes_price(
+    spot,
+    strike,
+    time_to_expiration,
+    volatility,
+    option_type,
+    r=RISK_FREE_RATE,
+    q=0.0,
+):
+    """Price European options with Black-Scholes over broadcastable arrays.
+
+    ``q`` is a continuous dividend yield (q = r prices a futures option
+    with Black-76). Expired contracts and zero-volatility inputs are
+    valued at their discounted intrinsic value instead of producing NaN.
+    """
+    terms = _black_scholes_terms(
+        spot, strike, time_to_expiration, volatility, option_type, r, q
+    )
+    return _black_scholes_price_from_terms(terms)
+
+
+def black_scholes_greeks(
+    spot,
+    strike,
+    time_to_expiration,
+    volatility,
+    option_type,
+    r=RISK_FREE_RATE,
+    q=0.0,
+):
+    """Compute the price and first- and second-order Greeks in one pass.
+
+    d1/d2, the discount factor, N(d1), N(d2) and the normal density are
+    evaluated once and shared by every Greek. Vega, rho and vomma are per
+    1% move as in py_vollib's analytical Greeks; theta and charm are per
+    trading day (py_vollib's are per calendar day). Greeks are with respect to the undiscounted spot and,
+    for rho, the rate with ``q`` held fixed. Expired or zero-volatility
+    contracts get the intrinsic delta and zero for every other Greek.
+    """
+    terms = _black_scholes_terms(
+        spot, strike, time_to_expiration, volatility, option_type, r, q
+    )
+    spot, r, q = terms["spot"], terms["r"], terms["q"]
+    call, live, yield_discount = terms["call"], terms["live"], terms["yield_discount"]
+    t, vol, sqrt_t = terms["t"], terms["vol"], terms["sqrt_t"]
+    vol_sqrt_t, discounted_strike = terms["vol_sqrt_t"], terms["discounted_strike"]
+    d1, d2, nd1, nd2 = terms["d1"], terms["d2"], terms["nd1"], terms["nd2"]
+
+    pdf_d1 = np.exp(-0.5 * d1 * d1) / _SQRT_2PI
+    spot_pdf = spot * pdf_d1
+    undiscounted_spot = spot / yield_discount
+
+    delta = yield_discount * np.where(call, nd1, nd1 - 1.0)
+    gamma = yield_discount * pdf_d1 / (undiscounted_spot * vol_sqrt_t)
+    vega = spot_pdf * sqrt_t
+    decay = -spot_pdf * vol / (2.0 * sqrt_t)
+    carry = r * discounted_strike
+    dividends = q * spot
+    theta = np.where(
+        call,
+        decay - carry * nd2 + dividends * nd1,
+        decay + carry * (1.0 - nd2) - dividends * (1.0 - nd1),
+    )
+    rho = np.where(
+        call, t * discounted_strike * nd2, -t * discounted_strike * (1.0 - nd2)
+    )
+    vanna = -yield_discount * pdf_d1 * d2 / vol
+    vomma = vega * d1 * d2 / vol
+    charm = yield_discount * (
+        np.where(call, q * nd1, -q * (1.0 - nd1))
+        - pdf_d1 * (2.0 * (r - q) * t - d2 * vol_sqrt_t) / (2.0 * t * vol_sqrt_t)
+    )
+
+    intrinsic_delta = yield_discount * np.where(
+        call,
+        (spot > discounted_strike).astype(float),
+        -(spot < discounted_strike).astype(float),
+    )
+    dead = ~live
+    return {
+        "price": _black_scholes_price_from_terms(terms),
+        "delta": np.where(live, delta, intrinsic_delta),
+        "gamma": np.where(dead, 0.0, gamma),
+        "vega": np.where(dead, 0.0, vega / 100.0),
+        "theta": np.where(dead, 0.0, theta / TRADING_DAYS),
+        "rho": np.where(dead, 0.0, rho / 100.0),
+        "vanna": np.where(dead, 0.0, vanna),
+        "vomma": np.where(dead, 0.0, vomma / 100.0),
+        "charm": np.where(dead, 0.0, charm / TRADING_DAYS),
+    }
+
+
+def implied_volatility_batch(
+    price,
+    spot,
+    strike,
+    time_to_expiration,
+    option_type,
+    r=RISK_FREE_RATE,
+    tol=1e-10,
+    max_iter=50,
+    full_output=False,
+    q=0.0,
+):
+    """Solve Black-Scholes implied volatility for a whole chain in one pass.
+
+    Uses a Corrado-Miller starting guess refined by safeguarded Halley
+    iterations: each element keeps its own [low, high] bracket and falls
+    back to bisection whenever a step leaves it, and only elements that
+    have not converged are re-evaluated. A quote converges once the next
+    step would move sigma by at most ``tol``; one whose price is too flat
+    in volatility to pin it down (_VOL_RESOLUTION) is left IV_NOT_CONVERGED.
+    Quotes outside the no-arbitrage bounds are returned as NaN instead of
+    raising. With ``full_output`` a status array of IV_* codes aligned with
+    the inputs is returned as well.
+    A dividend yield ``q`` is handled by solving on the spot discounted at q.
+    """
+    price, spot, strike, t, r, q = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=float)
+            for x in (price, spot, strike, time_to_expiration, r, q)
+        )
+    )
+    shape = price.shape
+    price, strike, t, r = (x.ravel() for x in (price, strike, t, r))
+    spot = (spot * np.exp(-q * np.maximum(t.reshape(shape), 0.0))).ravel()
+    call = np.broadcast_to(is_call(option_type), shape).ravel()
+
+    iv = np.full(price.shape, np.nan)
+    status = np.full(price.shape, IV_NOT_CONVERGED, dtype=np.int8)
+
+    valid = (spot > 0) & (strike > 0) & (t > 0) & np.isfinite(price)
+    status[~valid] = IV_INVALID_INPUT
+
+    discounted_strike = strike * np.exp(-r * np.where(valid, t, 0.0))
+    lower = np.maximum(
+        np.where(call, spot - discounted_strike, discounted_strike - spot), 0.0
+    )
+    upper = np.where(call, spot, discounted_strike)
+    below = valid & (price <= lower)
+    above = valid & (price >= upper)
+    status[below] = IV_BELOW_INTRINSIC
+    status[above] = IV_ABOVE_MAX_PRICE
+
+    idx = np.flatnonzero(valid & ~below & ~above)
+    if idx.size:
+        c, s, k, tt, rr, target = (x[idx] for x in (call, spot, strike, t, r, price))
+        dk = discounted_strike[idx]
+        sqrt_t = np.sqrt(tt)
+
+        # Corrado-Miller guess, computed on the equivalent call price
+        call_price = np.where(c, target, target + s - dk)
+        half_gap = 0.5 * (s - dk)
+        excess = call_price - half_gap
+        root = np.sqrt(
+            np.maximum(excess * excess - half_gap * half_gap * 4.0 / np.pi, 0.0)
+        )
+        sigma = _SQRT_2PI / (s + dk) * (excess + root) / sqrt_t
+        sigma = np.where(np.isfinite(sigma) & (sigma > 0), sigma, 0.2)
+
+        low = np.full(idx.shape, 1e-9)
+        high = np.full(idx.shape, 10.0)
+        sigma = np.clip(sigma, 1e-4, 5.0)
+
+        active = np.arange(idx.size)
+        for _ in range(max_iter):
+            sg, st, ss, sk, sdk, sr, sc = (
+                x[active] for x in (sigma, sqrt_t, s, k, dk, rr, c)
+            )
+            vol_sqrt_t = sg * st
+            d1 = (np.log(ss / sk) + (sr + 0.5 * sg * sg) * tt[active]) / vol_sqrt_t
+            d2 = d1 - vol_sqrt_t
+            model = np.where(
+                sc,
+                ss * ndtr(d1) - sdk * ndtr(d2),
+                sdk * ndtr(-d2) - ss * ndtr(-d1),
+            )
+            diff = model - target[active]
+            vega = ss * np.exp(-0.5 * d1 * d1) / _SQRT_2PI * st
+            vomma = vega * d1 * d2 / sg
+
+            # Converged when the next step would move sigma by at most tol: a
+            # price tolerance would stop vega-starved quotes far from the root
+            done = np.abs(diff) <= tol * vega
+            resolved = np.spacing(target[active]) <= _VOL_RESOLUTION * vega
+            sigma_done = active[done & resolved]
+            iv[idx[sigma_done]] = sigma[sigma_done]
+            status[idx[sigma_done]] = IV_OK
+            # Flat price: any sigma nearby fits, so it stays IV_NOT_CONVERGED
+            done |= ~resolved
+
+            keep = ~done
+            active, sg, diff, vega, vomma = (
+                x[keep] for x in (active, sg, diff, vega, vomma)
+            )
+            if not active.size:
+                break
+
+            high[active] = np.where(diff > 0, sg, high[active])
+            low[active] = np.where(diff < 0, sg, low[active])
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = diff / vega
+                step = step / (1.0 - 0.5 * step * vomma / vega)
+            new_sigma = sg - step
+            lo, hi = low[active], high[active]
+            bisect = ~np.isfinite(new_sigma) | (new_sigma <= lo) | (new_sigma >= hi)
+            new_sigma = np.where(bisect, 0.5 * (lo + hi), new_sigma)
+            sigma[active] = new_sigma
+
+            # Bracket narrower than tol: the midpoint is within tol of the root
+            stuck = (hi - lo) <= tol
+            if stuck.any():
+                stuck_idx = active[stuck]
+                iv[idx[stuck_idx]] = sigma[stuck_idx]
+                status[idx[stuck_idx]] = IV_OK
+                active = active[~stuck]
+
+    iv = iv.reshape(shape)
+    if full_output:
+        return iv, status.reshape(shape)
+    return iv
+
+
+def scenario_grid(
+    spot,
+    strike,
+    time_to_expiration,
+    volatility,
+    option_type,
+    spots,
+    vol_shifts=(0.0,),
+    days=(0,),
+    r=RISK_FREE_RATE,
+    entry_price=None,
+    price=None,
+):
+    """Price one contract over every (days forward, vol shift, spot) scenario.
+
+    ``spots`` are spot prices, ``vol_shifts`` are added to ``volatility``
+    (0.05 is +5 vol points) and ``days`` are trading days forward, which
+    shorten the time to expiration down to expiry. The whole grid is one
+    broadcast pricing call: Black-Scholes at ``r``, or ``price`` (a
+    function taking spot, strike, t, volatility and option type, such as
+    OptionCalculator.price_batch). Returns a dict of the three axes plus
+    "price" and "pnl" arrays shaped (days, vol_shifts, spots); P&L is
+    measured against ``entry_price``, by default today's model price.
+    """
+    if price is None:
+
+        def price(spot, strike, t, volatility, option_type):
+            return black_scholes_price(spot, strike, t, volatility, option_type, r)
+
+    spots = np.asarray(spots, dtype=float)
+    vol_shifts = np.asarray(vol_shifts, dtype=float)
+    days = np.asarray(days, dtype=float)
+
+    t = np.maximum(time_to_expiration - days / TRADING_DAYS, 0.0)
+    vol = np.maximum(volatility + vol_shifts, 0.0)
+    prices = price(
+        spots[None, None, :],
+        strike,
+        t[:, None, None],
+        vol[None, :, None],
+        option_type,
+    )
+    if entry_price is None:
+        entry_price = price(spot, strike, time_to_expiration, volatility, option_type)
+    return {
+        "spot": spots,
+        "vol_shift": vol_shifts,
+        "days": days,
+        "price": prices,
+        "pnl": prices - entry_price,
+    }
+
+
+def format_greeks(greeks):
+    """Format a scalar result of black_scholes_greeks for display."""
+    return "\n".join(
+        f"{name.capitalize()}:\t{float(value):{'.2f' if name == 'price' else '.5g'}}"
+        for name, value in greeks.items()
+    )
+
 
 class OptionCalculator:
+    """Prices contracts with a registered pricing model (see models.py).
+
+    Each contract's rate and dividend yield come from ``curve``, a
+    rates.TermStructure that defaults to a flat ``r`` and
+    ``dividend_yield``, interpolated for a whole batch at once.
+    """
+
+    def __init__(
+        self,
+        r=RISK_FREE_RATE,
+        surface=None,
+        model="bsm",
+        curve=None,
+        dividend_yield=0.0,
+    ):
+        # Imported here: models and rates build on this module
+        from models import get_model
+        from rates import TermStructure
+
+        self.r = r
+        self.surface = surface  # option_chain.VolSurface used when no vol is given
+        self.model = get_model(model)
+        self.curve = curve or TermStructure.flat(r, dividend_yield)
+        # Bumped whenever the model or curve changes, so callers caching
+        # results (PortfolioEngine) know to recompute them
+        self.version = 0
+
+    def set_model(self, name):
+        from models import get_model
+
+        model = get_model(name)
+        if model is not self.model:
+            self.model = model
+            self.version += 1
+
+    def set_curve(self, curve):
+        """Price with a new rates.TermStructure from now on."""
+        self.curve = curve
+        self.version += 1
+
+    def _carry(self, time_to_expiration):
+        """Per-contract (r, q) from the term structure."""
+        return self.curve.rates(time_to_expiration)
+
+    def surface_volatility(self, spot, strike, time_to_expiration):
+        """Look up volatility for contracts on the loaded volatility surface."""
+        if self.surface is None:
+            raise ValueError("Enter a volatility or load an option chain")
+        return self.surface.volatility(spot, strike, time_to_expiration)
+
+    @METRICS.timed("price_batch")
+    def price_batch(self, spot, strike, time_to_expiration, volatility, option_type):
+        """Price a batch of contracts; all inputs are broadcast NumPy arrays."""
+        return self.model.price(
+            spot,
+            strike,
+            time_to_expiration,
+            volatility,
+            option_type,
+            *self._carry(time_to_expiration),
+        )
+
+    @METRICS.timed("greeks_batch")
+    def greeks_batch(self, spot, strike, time_to_expiration, volatility, option_type):
+        """Compute price and Greeks for a batch of contracts as a dict of arrays."""
+        return self.model.greeks(
+            spot,
+            strike,
+            time_to_expiration,
+            volatility,
+            option_type,
+            *self._carry(time_to_expiration),
+        )
+
+    def scenario_grid(
+        self,
+        spot,
+        strike,
+        time_to_expiration,
+        volatility,
+        option_type,
+        spots,
+        vol_shifts=(0.0,),
+        days=(0,),
+        entry_price=None,
+    ):
+        """Price a contract over a spot x vol shift x days-forward grid."""
+        return scenario_grid(
+            spot,
+            strike,
+            time_to_expiration,
+            volatility,
+            option_type,
+            spots,
+            vol_shifts,
+            days,
+            entry_price=entry_price,
+            price=self.price_batch,
+        )
+
+    @METRICS.timed("implied_volatility_batch")
+    def implied_volatility_batch(
+        self, price, spot, strike, time_to_expiration, option_type, full_output=False
+    ):
+        """Solve implied volatility for a batch of quotes; NaN where unsolvable."""
+        return self.model.implied_volatility(
+            price,
+            spot,
+            strike,
+            time_to_expiration,
+            option_type,
+            *self._carry(time_to_expiration),
+            full_output=full_output,
+        )
+
     def calculate(
         self, spot, strike, expiry_date, option_type, mode, price=None, volatility=None
     ):
         time_to_expiration = calculate_time_to_expiration(expiry_date)
-        r = 0.07  # Risk-free rate
 
         try:
             if mode == "volatility":
-                implied_vol = implied_volatility(
-                    price, spot, strike, time_to_expiration, r, option_type.lower()[0]
+                implied_vol, status = self.implied_volatility_batch(
+                    float(price), spot, strike, time_to_expiration, option_type, True
+                )
+                if status != IV_OK:
+                    return f"Error: {IV_STATUS_MESSAGES[int(status)]}"
+                return f"{float(implied_vol):.4f}"
+            elif mode == "greeks":
+                greeks = self.greeks_batch(
+                    spot, strike, time_to_expiration, float(volatility), option_type
                 )
-                return f"{implied_vol:.4f}"
+                return format_greeks(greeks)
             else:
-                option_price = bsm(
-                    option_type.lower()[0],
-                    spot,
-                    strike,
-                    time_to_expiration,
-                    r,
-                    volatility,
+                option_price = float(
+                    self.price_batch(
+                        spot, strike, time_to_expiration, float(volatility), option_type
+                    )
                 )
                 return f"{option_price:.2f}"
         except Exception as e:
@@ -0,0 +1,253 @@
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from metrics import METRICS
+
+
+class CandlestickChart:
+    """Hollow-candle chart that keeps one Figure and updates its artists in place.
+
+    Mirrors what ``mpf.plot(type="hollow_candle", style="charles")`` drew,
+    but switching tickers only replaces artist data and toggling the
+    projection line blits that one artist over a cached background instead
+    of rebuilding the figure. Works with any Agg-based canvas (TkAgg in the
+    app, plain Agg in benchmarks).
+    """
+
+    UP_COLOR = "#006340"
+    DOWN_COLOR = "#A02128"
+    BODY_WIDTH = 0.3
+    OVERLAYS = {"EMA_30": "blue", "EMA_200": "red"}
+    PROJECTION = "Projection 5 Years"
+    FAN_COLOR = "purple"
+
+    def __init__(self, canvas, overlays=None, ax=None):
+        """Draw into a new full-figure axes, or into ``ax`` of a larger figure.
+
+        A chart given ``ax`` is one tile of a grid: it neither redraws the
+        canvas on update nor blits, and the caller draws the figure once.
+        """
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.owns_figure = ax is None
+        self.ax = self.figure.add_subplot(1, 1, 1) if ax is None else ax
+        self.dates = pd.DatetimeIndex([])
+        self.show_projection = False
+        self.background = None
+        self.ylim_without_projection = None
+        self.ylim_with_projection = None
+        self.bars = 0
+        self.last_close = np.nan
+        self.visible_values = []
+        self.projection_values = []
+        self.fan_values = []
+        self.fan_data = None
+        self.show_fan = False
+
+        ax = self.ax
+        self.wicks = LineCollection([], linewidths=0.8)
+        self.bodies = PolyCollection([], linewidths=0.8)
+        ax.add_collection(self.wicks)
+        ax.add_collection(self.bodies)
+        self.lines = {
+            column: ax.plot([], [], color=color, linewidth=1.0)[0]
+            for column, color in (overlays or self.OVERLAYS).items()
+        }
+        # Animated: left out of normal draws and blitted on top instead
+        (self.projection,) = ax.plot(
+            [], [], color="green", linestyle="--", linewidth=0.8, animated=True
+        )
+        # Monte Carlo fan past the last bar: 5-95 and 25-75 percentile bands
+        self.fan_outer = PolyCollection(
+            [], facecolors=self.FAN_COLOR, alpha=0.12, linewidths=0
+        )
+        self.fan_inner = PolyCollection(
+            [], facecolors=self.FAN_COLOR, alpha=0.25, linewidths=0
+        )
+        ax.add_collection(self.fan_outer)
+        ax.add_collection(self.fan_inner)
+        (self.fan_median,) = ax.plot([], [], color=self.FAN_COLOR, linewidth=0.8)
+        self.close_text = ax.text(
+            0.5,
+            0.95,
+            "",
+            horizontalalignment="right",
+            verticalalignment="top",
+            transform=ax.transAxes,
+            fontsize=11,
+        )
+        ax.set_ylabel("Price")
+        ax.grid(True, color="#d0d0d0", linestyle="-", linewidth=0.5)
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(self._format_date))
+
+        if self.owns_figure:
+            canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _format_date(self, position, _):
+        i = int(round(position))
+        if 0 <= i < len(self.dates):
+            return self.dates[i].strftime("%b %d")
+        if i >= len(self.dates) > 0:
+            return f"+{i - len(self.dates) + 1}d"
+        return ""
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._blit_projection()
+
+    def _blit_projection(self):
+        if self.show_projection:
+            self.ax.draw_artist(self.projection)
+        self.canvas.blit(self.figure.bbox)
+
+    @METRICS.timed("chart_update")
+    def update(self, data, title, show_projection=None, fan=None, show_fan=None):
+        """Show data (Open/High/Low/Close plus overlay columns) under title.
+
+        ``fan`` is a Monte Carlo result from montecarlo.percentile_bands (in
+        display units, percentiles 5/25/50/75/95) drawn past the last bar.
+        """
+        if show_projection is not None:
+            self.show_projection = show_projection
+        if show_fan is not None:
+            self.show_fan = show_fan
+        self.fan_data = fan
+
+        o, h, l, c = (
+            data[k].to_numpy(dtype=float) for k in ("Open", "High", "Low", "Close")
+        )
+        n = len(c)
+        x = np.arange(n, dtype=float)
+        self.dates = data.index
+
+        # Charles hollow candles: color from the change vs the previous
+        # close, hollow when the bar closed above its open.
+        previous = np.concatenate(([o[0]], c[:-1])) if n else c
+        colors = np.where(c >= previous, self.UP_COLOR, self.DOWN_COLOR)
+        hollow = c > o
+
+        body_low, body_high = np.minimum(o, c), np.maximum(o, c)
+        left, right = x - self.BODY_WIDTH, x + self.BODY_WIDTH
+        self.bodies.set_verts(
+            np.stack(
+                [
+                    np.column_stack([left, body_low]),
+                    np.column_stack([left, body_high]),
+                    np.column_stack([right, body_high]),
+                    np.column_stack([right, body_low]),
+                ],
+                axis=1,
+            )
+        )
+        edge = to_rgba_array(colors)
+        face = edge.copy()
+        face[hollow] = 0.0  # Transparent
+        self.bodies.set_edgecolor(edge)
+        self.bodies.set_facecolor(face)
+
+        lower_wicks = np.stack(
+            [np.column_stack([x, l]), np.column_stack([x, body_low])], axis=1
+        )
+        upper_wicks = np.stack(
+            [np.column_stack([x, body_high]), np.column_stack([x, h])], axis=1
+        )
+        self.wicks.set_segments(np.concatenate([lower_wicks, upper_wicks]))
+        self.wicks.set_color(np.concatenate([edge, edge]))
+
+        visible = [l, h]
+        for column, line in self.lines.items():
+            values = data[column].to_numpy(dtype=float) if column in data else []
+            line.set_data(x[: len(values)], values)
+            visible.append(values)
+
+        projection = np.full(n, np.nan)
+        if self.PROJECTION in data:
+            projection = data[self.PROJECTION].to_numpy(dtype=float)
+        self.projection.set_data(x, projection)
+
+        self.bars = n
+        self.last_close = c[-1] if n else np.nan
+        self.visible_values = visible
+        self.projection_values = projection
+        self._update_fan()
+        self._relimit()
+        self.ax.set_title(title)
+        self.close_text.set_text(f"{c[-1]:.2f}" if n else "")
+        if self.owns_figure:
+            self.canvas.draw_idle()
+
+    def _update_fan(self):
+        fan = self.fan_data if self.show_fan else None
+        for artist in (self.fan_outer, self.fan_inner, self.fan_median):
+            artist.set_visible(fan is not None)
+        if fan is None:
+            self.fan_values = []
+            return
+
+        # Every band starts from the last close at the last bar
+        x = self.bars - 1 + np.concatenate(([0], fan["days"]))
+        bands = np.column_stack(
+            [np.full(len(fan["bands"]), self.last_close), fan["bands"]]
+        )
+        low, inner_low, median, inner_high, high = bands
+        self.fan_outer.set_verts(
+            [np.column_stack([np.r_[x, x[::-1]], np.r_[high, low[::-1]]])]
+        )
+        self.fan_inner.set_verts(
+            [np.column_stack([np.r_[x, x[::-1]], np.r_[inner_high, inner_low[::-1]]])]
+        )
+        self.fan_median.set_data(x, median)
+        self.fan_values = [low, high]
+
+    def _relimit(self):
+        self.ylim_without_projection = self._padded_limits(
+            self.visible_values + self.fan_values
+        )
+        self.ylim_with_projection = self._padded_limits(
+            self.visible_values + self.fan_values + [self.projection_values]
+        )
+        right = self.bars
+        if self.fan_values:
+            right += int(self.fan_data["days"][-1])
+        self.ax.set_xlim(-1, right)
+        self.ax.set_ylim(self._ylim())
+
+    def set_fan_visible(self, visible):
+        """Show or hide the Monte Carlo fan; the axes grow to fit it."""
+        self.show_fan = visible
+        if not self.bars:
+            return
+        self._update_fan()
+        self._relimit()
+        self.canvas.draw_idle()
+
+    def _ylim(self):
+        if self.show_projection:
+            return self.ylim_with_projection
+        return self.ylim_without_projection
+
+    @staticmethod
+    def _padded_limits(arrays):
+        values = np.concatenate([np.asarray(a, dtype=float).ravel() for a in arrays])
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return (0.0, 1.0)
+        low, high = values.min(), values.max()
+        pad = (high - low) * 0.05 or abs(high) * 0.05 or 1.0
+        return (low - pad, high + pad)
+
+    def set_projection_visible(self, visible):
+        """Show or hide the projection line, blitting when the axes don't move."""
+        self.show_projection = visible
+        if self.ylim_with_projection is None:
+            return
+        if self.ax.get_ylim() != self._ylim():
+            self.ax.set_ylim(self._ylim())
+            self.canvas.draw_idle()
+        elif self.background is not None:
+            self.canvas.restore_region(self.background)
+            self._blit_projection()
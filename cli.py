@@ -0,0 +1,751 @@
+import argparse
+import csv
+import json
+import logging
+import math
+import sys
+
+# Only the standard library is imported here; the calculation and data
+# modules are imported inside each command so that `optical price` never
+# pays for yfinance/pandas and nothing ever loads Tk or matplotlib.
+
+
+def read_records(stream, fmt="auto"):
+    """Read a list of dicts from CSV or JSON (records or column arrays)."""
+    text = stream.read()
+    if fmt == "auto":
+        fmt = "json" if text.lstrip()[:1] in ("[", "{") else "csv"
+    if fmt == "csv":
+        return list(csv.DictReader(text.splitlines()))
+
+    data = json.loads(text)
+    if isinstance(data, dict):
+        columns = {k: v if isinstance(v, list) else [v] for k, v in data.items()}
+        length = max(len(v) for v in columns.values())
+        return [
+            {k: v[i] if len(v) > 1 else v[0] for k, v in columns.items()}
+            for i in range(length)
+        ]
+    return data
+
+
+def write_records(records, stream, fmt="csv"):
+    """Write a list of dicts as CSV or JSON; NaN is written as empty/null."""
+    records = [
+        {
+            k: None if isinstance(v, float) and not math.isfinite(v) else v
+            for k, v in record.items()
+        }
+        for record in records
+    ]
+    if fmt == "json":
+        json.dump(records, stream, indent=2)
+        stream.write("\n")
+        return
+    if not records:
+        return
+    writer = csv.DictWriter(stream, fieldnames=list(records[0]))
+    writer.writeheader()
+    writer.writerows(records)
+
+
+def column(records, name, default=None):
+    """Return one column of the records, falling back to default if missing."""
+    values = [record.get(name, default) for record in records]
+    if any(v in (None, "") for v in values):
+        if default is None:
+            raise SystemExit(f"optical: missing required column '{name}'")
+        values = [default if v in (None, "") else v for v in values]
+    return values
+
+
+def times_to_expiration(records):
+    """Year fractions from a 't' column, or an 'expiry' (YYYY-MM-DD) column.
+
+    Expiries are converted on the NSE trading calendar, all in one call.
+    """
+    from trading_calendar import NSE
+
+    times, expiries = [], {}
+    for i, record in enumerate(records):
+        if record.get("t") not in (None, ""):
+            times.append(float(record["t"]))
+        elif record.get("expiry") not in (None, ""):
+            times.append(None)
+            expiries[i] = record["expiry"]
+        else:
+            raise SystemExit("optical: each row needs a 't' or 'expiry' column")
+    if expiries:
+        try:
+            fractions = NSE.year_fraction(list(expiries.values()))
+        except ValueError as e:
+            raise SystemExit(f"optical: {e}")
+        for i, fraction in zip(expiries, fractions.tolist()):
+            times[i] = fraction
+    return times
+
+
+def _to_python(value):
+    value = value.item() if hasattr(value, "item") else value
+    return round(value, 10) if isinstance(value, float) else value
+
+
+def make_calculator(args):
+    """Return an OptionCalculator for --rate, --curve, --dividend-yield and --model."""
+    from calculations import OptionCalculator
+    from rates import TermStructure
+
+    try:
+        curve = (
+            TermStructure.parse(args.curve, args.dividend_yield) if args.curve else None
+        )
+        return OptionCalculator(
+            r=args.rate,
+            model=args.model,
+            curve=curve,
+            dividend_yield=args.dividend_yield,
+        )
+    except ValueError as e:
+        raise SystemExit(f"optical: {e}")
+
+
+def cmd_price(args):
+    records = read_records(args.input, args.format)
+    calculator = make_calculator(args)
+    spot = [float(v) for v in column(records, "spot")]
+    strike = [float(v) for v in column(records, "strike")]
+    t = times_to_expiration(records)
+    if args.surface:
+        from option_chain import FileChainSource
+
+        # Rows without a volatility are priced off the chain's surface
+        calculator.surface = FileChainSource(args.surface).surface(calculator)
+        volatility = [float(v) for v in column(records, "volatility", "nan")]
+        looked_up = calculator.surface_volatility(spot, strike, t)
+        volatility = [v if v == v else float(s) for v, s in zip(volatility, looked_up)]
+    else:
+        volatility = [float(v) for v in column(records, "volatility")]
+    inputs = (spot, strike, t, volatility, column(records, "option_type", "CALL"))
+    if args.greeks:
+        results = calculator.greeks_batch(*inputs)
+    else:
+        results = {"price": calculator.price_batch(*inputs)}
+
+    for i, record in enumerate(records):
+        if args.surface:
+            record["volatility"] = _to_python(volatility[i])
+        record.update({k: _to_python(v[i]) for k, v in results.items()})
+    write_records(records, args.output, args.output_format)
+
+
+def cmd_iv(args):
+    from calculations import IV_STATUS_MESSAGES
+
+    records = read_records(args.input, args.format)
+    calculator = make_calculator(args)
+    iv, status = calculator.implied_volatility_batch(
+        [float(v) for v in column(records, "price")],
+        [float(v) for v in column(records, "spot")],
+        [float(v) for v in column(records, "strike")],
+        times_to_expiration(records),
+        column(records, "option_type", "CALL"),
+        full_output=True,
+    )
+    for i, record in enumerate(records):
+        record["iv"] = _to_python(iv[i])
+        record["error"] = IV_STATUS_MESSAGES.get(int(status[i]), "")
+    write_records(records, args.output, args.output_format)
+
+
+def make_provider(args):
+    """Return the market-data provider selected by --replay, or None for yfinance."""
+    if not args.replay:
+        return None
+    from providers import ReplayProvider
+
+    return ReplayProvider(args.replay, latency=args.latency)
+
+
+def selected_tickers(args):
+    """Watchlist entries for the tickers named on the command line, or all."""
+    from watchlist import all_tickers, find_ticker
+
+    if not args.tickers:
+        return all_tickers()
+    return [
+        find_ticker(name) or {"ticker": name, "label": name} for name in args.tickers
+    ]
+
+
+def report_missing(tickers, found):
+    """Name the tickers that returned no data on stderr; exit if none did.
+
+    Names that are neither a watchlist ticker nor a label are passed to
+    yfinance as symbols, so a mistyped label ends up here too.
+    """
+    missing = [info["label"] for info in tickers if info["ticker"] not in found]
+    if not missing:
+        return
+    message = (
+        f"optical: no data for {', '.join(missing)} "
+        "(use a ticker symbol or a watchlist label such as 'NIFTY 50')"
+    )
+    if len(missing) == len(tickers):
+        raise SystemExit(message)
+    print(message, file=sys.stderr)
+
+
+def make_data_fetcher(args):
+    from data_fetch import DataFetcher
+
+    if args.replay:
+        # Keep replayed history apart from the live cache
+        return DataFetcher(
+            cache_dir=f"{args.replay}/.cache",
+            store_dir=f"{args.replay}/.store",
+            provider=make_provider(args),
+        )
+    return DataFetcher()
+
+
+def cmd_ranges(args):
+    tickers = selected_tickers(args)
+    data_fetcher = make_data_fetcher(args)
+    periods = None
+    if args.horizons:
+        periods = {f"{days}d": days for days in args.horizons}
+
+    data_fetcher.download_many([info["ticker"] for info in tickers])
+    records = []
+    found = set()
+    for info in tickers:
+        result = data_fetcher.std_ranges_for_ticker(
+            info["ticker"],
+            info["label"],
+            info.get("is_forex", False),
+            info.get("multiplier", 1.0),
+            periods=periods,
+        )
+        if result is None:
+            continue
+        found.add(info["ticker"])
+        last_price, ranges = result
+        for i, period in enumerate(ranges["period"]):
+            records.append(
+                {
+                    "ticker": info["ticker"],
+                    "label": info["label"],
+                    "last_price": round(float(last_price), 2),
+                    "period": str(period),
+                    "horizon": int(ranges["horizon"][i]),
+                    "lower": round(float(ranges["lower"][i]), 2),
+                    "projected": round(float(ranges["projected"][i]), 2),
+                    "upper": round(float(ranges["upper"][i]), 2),
+                }
+            )
+    report_missing(tickers, found)
+    write_records(records, args.output, args.output_format)
+    if args.stats:
+        print(json.dumps(data_fetcher.fetch_stats()), file=sys.stderr)
+
+
+def ticker_periods(args, data_fetcher, histories):
+    """Label -> trading days per ticker with history.
+
+    --horizons applies to every ticker; otherwise each ticker gets
+    calendar_periods from its last bar, as the ranges command does.
+    """
+    periods = {}
+    for ticker, history in histories.items():
+        if history is None or history.empty:
+            continue
+        if args.horizons:
+            periods[ticker] = {f"{days}d": days for days in args.horizons}
+        else:
+            periods[ticker] = data_fetcher.calendar_periods(ticker, history.index[-1])
+    return periods
+
+
+def cmd_simulate(args):
+    from data_fetch import DataFetcher
+    from montecarlo import PERCENTILES, percentile_bands_many
+
+    tickers = selected_tickers(args)
+    data_fetcher = make_data_fetcher(args)
+
+    needs_usdinr = any(info.get("is_forex", False) for info in tickers)
+    histories = data_fetcher.download_many(
+        [info["ticker"] for info in tickers]
+        + ([DataFetcher.USDINR_TICKER] if needs_usdinr else [])
+    )
+
+    closes = {
+        info["ticker"]: histories[info["ticker"]]["Close"].to_numpy()
+        for info in tickers
+        if histories.get(info["ticker"]) is not None
+    }
+    periods = ticker_periods(args, data_fetcher, histories)
+    days = sorted({days for ticker in closes for days in periods[ticker].values()})
+    results = percentile_bands_many(
+        closes,
+        days,
+        processes=args.processes,
+        seed=args.seed,
+        paths=args.paths,
+        method=args.method,
+    )
+
+    report_missing(tickers, results)
+    records = []
+    for info in tickers:
+        result = results.get(info["ticker"])
+        if result is None:
+            continue
+        units = data_fetcher.display_units(
+            info.get("is_forex", False), info.get("multiplier", 1.0)
+        )
+        if units is None:
+            continue
+        history = histories[info["ticker"]]
+        scale = units.factor_at(history.index[-1])
+        last_price = closes[info["ticker"]][-1] * scale
+        for period, horizon in periods[info["ticker"]].items():
+            bands = result["bands"][:, days.index(horizon)] * scale
+            records.append(
+                {
+                    "ticker": info["ticker"],
+                    "label": info["label"],
+                    "last_price": round(float(last_price), 2),
+                    "period": period,
+                    "horizon": horizon,
+                    **{
+                        f"p{p}": round(float(band), 2)
+                        for p, band in zip(PERCENTILES, bands)
+                    },
+                }
+            )
+    write_records(records, args.output, args.output_format)
+
+
+def cmd_backtest(args):
+    from backtest import backtest_many, pool_counts, summarize
+
+    tickers = selected_tickers(args)
+    data_fetcher = make_data_fetcher(args)
+
+    # Returns and hit rates do not depend on the display currency or units
+    histories = data_fetcher.download_many([info["ticker"] for info in tickers])
+    closes = {
+        info["ticker"]: histories[info["ticker"]]["Close"].to_numpy()
+        for info in tickers
+        if histories.get(info["ticker"]) is not None
+    }
+    # Each ticker is scored at its own horizons; the ALL row pools by period
+    periods = ticker_periods(args, data_fetcher, histories)
+    results = backtest_many(
+        closes,
+        sorted({days for ticker in closes for days in periods[ticker].values()}),
+        processes=args.processes,
+        span=args.span,
+        min_history=args.min_history,
+    )
+
+    rows = [
+        (
+            info["ticker"],
+            info["label"],
+            {
+                period: (horizon, results[info["ticker"]][horizon])
+                for period, horizon in periods[info["ticker"]].items()
+            },
+        )
+        for info in tickers
+        if results.get(info["ticker"]) is not None
+    ]
+    if len(rows) > 1:
+        labels = dict.fromkeys(period for _, _, result in rows for period in result)
+        pooled = {}
+        for period in labels:
+            scored = [result[period] for _, _, result in rows if period in result]
+            horizons = {horizon for horizon, _ in scored}
+            # Tickers on different calendars may score a period at different days
+            horizon = horizons.pop() if len(horizons) == 1 else None
+            pooled[period] = (horizon, pool_counts([counts for _, counts in scored]))
+        rows.append(("ALL", "All tickers", pooled))
+
+    records = []
+    for ticker, label, result in rows:
+        for period, (horizon, counts) in result.items():
+            summary = summarize(counts)
+            records.append(
+                {
+                    "ticker": ticker,
+                    "label": label,
+                    "period": period,
+                    "horizon": horizon,
+                    **{k: _to_python(v) for k, v in summary.items()},
+                }
+            )
+    write_records(records, args.output, args.output_format)
+
+
+def cmd_surface(args):
+    from option_chain import FileChainSource
+
+    surface = FileChainSource(args.chain, spot=args.spot).surface(make_calculator(args))
+    if args.summary:
+        records = [
+            {k: _to_python(v) for k, v in row.items()} for row in surface.summary()
+        ]
+    else:
+        records = [
+            {
+                "expiry": f"{quote.expiry:%Y-%m-%d}",
+                "strike": _to_python(quote.strike),
+                "option_type": quote.option_type,
+                "price": _to_python(quote.price),
+                "iv": _to_python(quote.iv),
+                "fitted_iv": _to_python(quote.fitted_iv),
+            }
+            for smile in surface.smiles.values()
+            for quote in smile.itertuples()
+        ]
+    write_records(records, args.output, args.output_format)
+
+
+def cmd_record(args):
+    from data_fetch import DataFetcher
+    from providers import ReplayProvider, YFinanceProvider
+    from watchlist import all_tickers
+
+    tickers = args.tickers or [t["ticker"] for t in all_tickers()]
+    tickers += [DataFetcher.USDINR_TICKER]
+    recorded = ReplayProvider.record(
+        YFinanceProvider(), tickers, args.directory, period=args.period
+    )
+    print(f"Recorded {len(recorded)} tickers to {args.directory}", file=sys.stderr)
+
+
+def cmd_chain(args):
+    if args.step:
+        center = round(args.spot / args.step) * args.step
+        strikes = [center + i * args.step for i in range(-args.count, args.count + 1)]
+    else:
+        strikes = [
+            float(v) for v in column(read_records(args.input, args.format), "strike")
+        ]
+
+    t = times_to_expiration([{"t": args.t, "expiry": args.expiry}])[0]
+    calculator = make_calculator(args)
+    option_types = ["CALL"] * len(strikes) + ["PUT"] * len(strikes)
+    greeks = calculator.greeks_batch(args.spot, strikes * 2, t, args.vol, option_types)
+
+    records = [
+        {"strike": strike, "option_type": option_type}
+        for option_type, strike in zip(option_types, strikes * 2)
+    ]
+    for i, record in enumerate(records):
+        record.update({k: _to_python(v[i]) for k, v in greeks.items()})
+    records.sort(key=lambda record: record["strike"])
+    write_records(records, args.output, args.output_format)
+
+
+def cmd_portfolio(args):
+    import numpy as np
+
+    from portfolio import Portfolio, PortfolioEngine
+
+    try:
+        portfolio = Portfolio(read_records(args.input, args.format))
+    except (KeyError, ValueError) as e:
+        raise SystemExit(f"optical: {e}")
+    engine = PortfolioEngine(portfolio, make_calculator(args))
+
+    if args.payoff:
+        low, high, step = args.payoff
+        spots = np.arange(low, high + step / 2, step)
+        curves = {"expiry_pnl": engine.payoff(spots)}
+        if args.days is not None:
+            curves[f"day_{args.days:g}_pnl"] = engine.payoff(spots, days=args.days)
+        records = [
+            {
+                "spot": _to_python(spot),
+                **{k: _to_python(v[i]) for k, v in curves.items()},
+            }
+            for i, spot in enumerate(spots)
+        ]
+        write_records(records, args.output, args.output_format)
+        return
+
+    if args.spot is None:
+        raise SystemExit("optical: --spot is required unless --payoff is given")
+    valuation = engine.value(args.spot, args.vol_shift)
+    records = portfolio.records()
+    for i, record in enumerate(records):
+        record.update({k: _to_python(v[i]) for k, v in valuation["legs"].items()})
+    records.append(
+        {
+            "id": "TOTAL",
+            **{k: _to_python(v) for k, v in valuation["total"].items()},
+        }
+    )
+    write_records(records, args.output, args.output_format)
+
+
+def build_parser():
+    from metrics import add_arguments
+
+    parser = argparse.ArgumentParser(
+        prog="optical",
+        description="Headless option pricing and market range calculations.",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="WARNING",
+        help="log messages on stderr from this level up (default: WARNING)",
+    )
+    add_arguments(parser)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--format",
+        choices=["auto", "csv", "json"],
+        default="auto",
+        help="input format read from stdin (default: detect)",
+    )
+    common.add_argument(
+        "--output-format", choices=["csv", "json"], default="csv", help="output format"
+    )
+    common.add_argument("--rate", type=float, default=0.07, help="risk-free rate")
+    common.add_argument(
+        "--curve",
+        metavar="TENOR:RATE,...",
+        help="zero rates by tenor in years, e.g. 0.25:0.068,1:0.07 (overrides --rate)",
+    )
+    common.add_argument(
+        "--dividend-yield",
+        type=float,
+        default=0.0,
+        help="continuous dividend yield of the underlying",
+    )
+    common.add_argument(
+        "--model",
+        default="bsm",
+        help="pricing model: bsm, black76 (futures), american or american76",
+    )
+    common.set_defaults(input=sys.stdin, output=sys.stdout)
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    price = commands.add_parser(
+        "price",
+        parents=[common],
+        help="price options read from stdin",
+        description="Columns: spot, strike, volatility, option_type, and t or expiry.",
+    )
+    price.add_argument("--greeks", action="store_true", help="also output Greeks")
+    price.add_argument(
+        "--surface",
+        metavar="CHAIN",
+        help="option chain file whose fitted surface supplies missing volatilities",
+    )
+    price.set_defaults(func=cmd_price)
+
+    iv = commands.add_parser(
+        "iv",
+        parents=[common],
+        help="solve implied volatility for quotes read from stdin",
+        description="Columns: price, spot, strike, option_type, and t or expiry.",
+    )
+    iv.set_defaults(func=cmd_iv)
+
+    ranges = commands.add_parser(
+        "ranges",
+        parents=[common],
+        help="1M/3M/1Y projection ranges for watchlist tickers",
+    )
+    ranges.add_argument(
+        "tickers", nargs="*", help="ticker symbols or labels (default: whole watchlist)"
+    )
+    ranges.add_argument(
+        "--horizons",
+        type=int,
+        nargs="+",
+        metavar="DAYS",
+        help="trading-day horizons (default: 1 Month, 3 Months, 1 Year)",
+    )
+    ranges.add_argument(
+        "--stats", action="store_true", help="print fetch counters to stderr"
+    )
+    ranges.add_argument(
+        "--replay", metavar="DIR", help="serve market data from a recording in DIR"
+    )
+    ranges.add_argument(
+        "--latency", type=float, default=0.0, help="simulated seconds per download"
+    )
+    ranges.set_defaults(func=cmd_ranges)
+
+    simulate = commands.add_parser(
+        "simulate",
+        parents=[common],
+        help="Monte Carlo percentile bands for watchlist tickers",
+    )
+    simulate.add_argument(
+        "tickers", nargs="*", help="ticker symbols or labels (default: whole watchlist)"
+    )
+    simulate.add_argument(
+        "--horizons",
+        type=int,
+        nargs="+",
+        metavar="DAYS",
+        help="trading-day horizons (default: 1 Month, 3 Months, 1 Year)",
+    )
+    simulate.add_argument(
+        "--method",
+        choices=["gbm", "bootstrap"],
+        default="bootstrap",
+        help="geometric Brownian motion or resampled historical returns",
+    )
+    simulate.add_argument("--paths", type=int, default=20000, help="paths per ticker")
+    simulate.add_argument("--seed", type=int, help="seed for reproducible bands")
+    simulate.add_argument(
+        "--processes",
+        type=int,
+        help="simulate tickers in a pool of this many processes",
+    )
+    simulate.add_argument(
+        "--replay", metavar="DIR", help="serve market data from a recording in DIR"
+    )
+    simulate.add_argument(
+        "--latency", type=float, default=0.0, help="simulated seconds per download"
+    )
+    simulate.set_defaults(func=cmd_simulate)
+
+    surface = commands.add_parser(
+        "surface",
+        parents=[common],
+        help="solve IVs for an option chain file and fit a volatility surface",
+        description="CSV/JSON rows of expiry, strike, option_type, price (or "
+        "bid/ask) and spot, or NSE option-chain JSON.",
+    )
+    surface.add_argument("chain", help="option chain CSV or JSON file")
+    surface.add_argument(
+        "--spot", type=float, help="underlying price (default: from the file)"
+    )
+    surface.add_argument(
+        "--summary",
+        action="store_true",
+        help="one row per expiry (ATM vol, fit error) instead of per quote",
+    )
+    surface.set_defaults(func=cmd_surface)
+
+    backtest = commands.add_parser(
+        "backtest",
+        parents=[common],
+        help="hit rates of the BULLISH signal and the ±1 std ranges over history",
+    )
+    backtest.add_argument(
+        "tickers", nargs="*", help="ticker symbols or labels (default: whole watchlist)"
+    )
+    backtest.add_argument(
+        "--horizons",
+        type=int,
+        nargs="+",
+        metavar="DAYS",
+        help="trading-day horizons (default: 1 Month, 3 Months, 1 Year)",
+    )
+    backtest.add_argument(
+        "--span", type=int, default=30, help="EMA span of the BULLISH signal"
+    )
+    backtest.add_argument(
+        "--min-history",
+        type=int,
+        default=252,
+        help="daily returns required before a date is scored",
+    )
+    backtest.add_argument(
+        "--processes",
+        type=int,
+        help="backtest tickers in a pool of this many processes",
+    )
+    backtest.add_argument(
+        "--replay", metavar="DIR", help="serve market data from a recording in DIR"
+    )
+    backtest.add_argument(
+        "--latency", type=float, default=0.0, help="simulated seconds per download"
+    )
+    backtest.set_defaults(func=cmd_backtest)
+
+    record = commands.add_parser(
+        "record",
+        help="record watchlist history from yfinance for --replay",
+    )
+    record.add_argument("directory", help="directory to write <ticker>.csv files to")
+    record.add_argument(
+        "tickers", nargs="*", help="ticker symbols (default: whole watchlist)"
+    )
+    record.add_argument("--period", default="10y", help="history to record")
+    record.set_defaults(func=cmd_record)
+
+    chain = commands.add_parser(
+        "chain",
+        parents=[common],
+        help="price and Greeks for calls and puts across a strike ladder",
+        description="Strikes come from --step/--count or a 'strike' column on stdin.",
+    )
+    chain.add_argument("--spot", type=float, required=True)
+    chain.add_argument("--vol", type=float, required=True)
+    expiry = chain.add_mutually_exclusive_group(required=True)
+    expiry.add_argument("--expiry", help="expiry date (YYYY-MM-DD)")
+    expiry.add_argument("--t", type=float, help="time to expiry in years")
+    chain.add_argument("--step", type=float, help="strike spacing")
+    chain.add_argument(
+        "--count", type=int, default=10, help="strikes on each side of spot"
+    )
+    chain.set_defaults(func=cmd_chain)
+
+    portfolio = commands.add_parser(
+        "portfolio",
+        parents=[common],
+        help="value a multi-leg strategy or book read from stdin",
+        description=(
+            "Columns: option_type, strike, volatility, quantity (lots, negative"
+            " for short), t or expiry, and optionally lot_size, entry_price and"
+            " underlying. Prints position price, Greeks and P&L per leg plus a"
+            " TOTAL row, or a payoff curve with --payoff."
+        ),
+    )
+    portfolio.add_argument("--spot", type=float, help="spot price of the underlying")
+    portfolio.add_argument(
+        "--vol-shift", type=float, default=0.0, help="added to every leg's volatility"
+    )
+    portfolio.add_argument(
+        "--payoff",
+        type=float,
+        nargs=3,
+        metavar=("LOW", "HIGH", "STEP"),
+        help="print P&L at expiry across this spot range instead",
+    )
+    portfolio.add_argument(
+        "--days",
+        type=float,
+        help="with --payoff, also print P&L this many trading days forward",
+    )
+    portfolio.set_defaults(func=cmd_portfolio)
+
+    return parser
+
+
+def main(argv=None):
+    from metrics import instrumented
+
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=args.log_level, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+    with instrumented(args):
+        args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import logging
+import math
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from chart import CandlestickChart
+from data_fetch import DataFetcher
+from metrics import METRICS
+
+DEFAULT_TIMEOUT = 10  # Seconds a dashboard waits for its bulk download
+
+
+def chart_frame(data, indicators, ticker, units, rows, bars):
+    """Return bars up to row ``rows`` of data with indicator columns, in display units.
+
+    Only the charted rows are copied and converted with ``units`` (a
+    DisplayUnits); data is never modified. Indicators are causal, so the
+    full-history series sliced at a past row equals the series computed as
+    of that row. They are computed on quoted prices and converted at each
+    bar's rate, so close vs EMA comparisons do not depend on the currency.
+    """
+    values = indicators.update(ticker, data)
+    lo = max(0, rows - bars)
+    window = data.iloc[lo:rows]
+    factors = units.factors(window.index)
+    frame = units.convert(window, factors)
+    for column, series in values.items():
+        factor = factors if column in indicators.price_columns else 1.0
+        frame[column] = series[lo:rows] * factor
+    return frame
+
+
+def load_snapshot(data_fetcher, indicators, group, bars, timeout=DEFAULT_TIMEOUT):
+    """Bulk-load chart frames for every ticker of a watchlist group.
+
+    All tickers (plus USD/INR when the group needs it) come from one
+    ``download_many`` call bounded by ``timeout``; tickers that miss it are
+    listed under "missing" instead of holding up the rest. Returns a dict
+    with "frames" (label -> chart frame, in group order), "missing" (labels)
+    and "elapsed" (seconds).
+    """
+    started = time.monotonic()
+    tickers = [ticker["ticker"] for ticker in group]
+    needs_usdinr = any(ticker.get("is_forex", False) for ticker in group)
+    if needs_usdinr:
+        tickers.append(DataFetcher.USDINR_TICKER)
+    histories = data_fetcher.download_many(tickers, timeout=timeout)
+
+    frames, missing = {}, []
+    for ticker in group:
+        data = histories.get(ticker["ticker"])
+        if data is None or data.empty:
+            missing.append(ticker["label"])
+            continue
+
+        # USD/INR usually comes from the INR=X history just downloaded
+        remaining = None
+        if timeout is not None:
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+        units = data_fetcher.display_units(
+            ticker.get("is_forex", False), ticker.get("multiplier", 1.0), remaining
+        )
+        if units is None:
+            logging.warning(f"No USD/INR rate to convert {ticker['label']}")
+            missing.append(ticker["label"])
+            continue
+
+        frames[ticker["label"]] = chart_frame(
+            data, indicators, ticker["ticker"], units, len(data), bars
+        )
+
+    return {
+        "frames": frames,
+        "missing": missing,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def grid_shape(count):
+    """Return (rows, columns) of the most square grid holding count tiles."""
+    columns = max(1, math.ceil(math.sqrt(count)))
+    return max(1, math.ceil(count / columns)), columns
+
+
+@METRICS.timed("dashboard_render")
+def render_grid(frames, size=(8, 5.75), dpi=100):
+    """Render small-multiple candlestick charts as a binary PPM image.
+
+    Uses its own Figure on an off-screen Agg canvas and never touches Tk,
+    so it is safe to call from a worker thread; Tk's PhotoImage reads the
+    result directly.
+    """
+    figure = Figure(figsize=size, dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    rows, columns = grid_shape(len(frames))
+    axes = figure.subplots(rows, columns, squeeze=False).ravel()
+
+    for ax, (label, frame) in zip(axes, frames.items()):
+        chart = CandlestickChart(canvas, ax=ax)
+        chart.close_text.set_fontsize(8)
+        ax.set_ylabel("")
+        ax.tick_params(labelsize=6)
+        ax.xaxis.get_major_locator().set_params(nbins=3)
+        chart.update(frame, label)
+        ax.title.set_fontsize(9)
+    for ax in axes[len(frames) :]:
+        ax.set_visible(False)
+
+    figure.tight_layout(pad=0.6)
+    canvas.draw()
+    rgba = np.asarray(canvas.buffer_rgba())
+    height, width = rgba.shape[:2]
+    return f"P6 {width} {height} 255\n".encode() + rgba[..., :3].tobytes()
@@ -1,148 +1,595 @@
 import logging
 import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import numpy as np
-import yfinance as yf
+import pandas as pd
 from diskcache import Cache
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
-)
+from metrics import METRICS
+from price_store import PriceStore
+from providers import YFinanceProvider
+from trading_calendar import calendar_for
+from units import DisplayUnits
+
+
+def return_prefix_sums(close):
+    """Prefix sums of daily returns: (count, sum, sum of squares) per bar.
+
+    Element i covers the returns up to bar i, skipping gaps, so the mean
+    and std of returns as of any bar are O(1) lookups.
+    """
+    returns = close[1:] / close[:-1] - 1.0
+    valid = np.isfinite(returns)
+    returns = np.where(valid, returns, 0.0)
+    return (
+        np.concatenate(([0], np.cumsum(valid))),
+        np.concatenate(([0.0], np.cumsum(returns))),
+        np.concatenate(([0.0], np.cumsum(returns**2))),
+    )
 
 
 class DataFetcher:
-    def __init__(self, cache_dir="/tmp/data_cache", cache_timeout=3600):
+    USDINR_TICKER = "INR=X"
+    PERIODS = {"1 Month": 21, "3 Months": 63, "1 Year": 252}  # Nominal trading days
+    PERIOD_MONTHS = {"1 Month": 1, "3 Months": 3, "1 Year": 12}
+    LIVE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+    def __init__(
+        self,
+        cache_dir="/tmp/data_cache",
+        cache_timeout=3600,
+        store_dir="/tmp/data_store",
+        provider=None,
+    ):
+        self.provider = provider or YFinanceProvider()
         self.cache = Cache(cache_dir)
+        self.store = PriceStore(store_dir)  # OHLCV history, see price_store.py
         self.cache_timeout = cache_timeout
         self.lock = threading.Lock()  # To manage concurrent access to data cache
+        self.executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="data_fetch"
+        )
+        # Single-flight bookkeeping: one in-flight future per cache key
+        self.flight_lock = threading.Lock()
+        self.in_flight = {}
+        self.stats = {
+            "downloads": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "full_refreshes": 0,
+            "incremental_refreshes": 0,
+            "rows_fetched": 0,
+            "bytes_fetched": 0,
+        }
+        self.last_refresh = {}  # ticker -> rows/bytes fetched by its last refresh
+        self.stats_cache = {}  # ticker -> ((last bar, rows, close), prefix sums)
+        # Streaming: ticker -> (day, [open, high, low, close, volume]) live bar
+        self.stream_source = None
+        self.live_lock = threading.Lock()
+        self.live_bars = {}
+        self.live_dirty = set()
 
-    def download_data(self, ticker, name):
-        def fetch_data():
-            try:
-                with self.lock:
-                    if ticker in self.cache:
-                        logging.info(f"Cache hit for ticker: {ticker}")
-                        return self.cache[ticker]
+    def _fetch_data(self, ticker):
+        try:
+            return self._refresh([ticker])[ticker]
+        except Exception as e:
+            logging.error(f"Error fetching data for {ticker}: {e}")
+            return None
 
-                logging.info(f"Downloading data for ticker: {ticker}")
-                data = yf.download(ticker, period="10y")
-                if data.empty:
-                    logging.warning(f"No data found for ticker: {ticker}")
-                    return None
+    def _download_batch(self, tickers, period=None, start=None):
+        """Fetch tickers from the provider in one call."""
+        self._count("downloads")
+        with METRICS.timer("download"):
+            return self.provider.download(tickers, period=period, start=start)
+
+    def _record_refresh(self, ticker, fetched, mode):
+        rows = 0 if fetched is None else len(fetched)
+        size = 0 if fetched is None else int(fetched.memory_usage(deep=True).sum())
+        with self.flight_lock:
+            self.stats[f"{mode}_refreshes"] += 1
+            self.stats["rows_fetched"] += rows
+            self.stats["bytes_fetched"] += size
+            self.last_refresh[ticker] = {"mode": mode, "rows": rows, "bytes": size}
+        METRICS.increment(f"fetch_{mode}_refreshes")
+        METRICS.increment("fetch_rows", rows)
+        METRICS.increment("fetch_bytes", size)
+        logging.info(
+            f"{mode.capitalize()} refresh of {ticker}: {rows} rows, {size} bytes"
+        )
 
-                data.columns = data.columns.get_level_values(0)
+    def _seed_usdinr(self, ticker):
+        if ticker != self.USDINR_TICKER:
+            return
+        with self.lock:
+            if "USDINR" not in self.cache:
+                close = self.store.read(ticker, columns=["Close"], tail=1)["Close"]
+                self.cache.set("USDINR", close.iloc[-1], expire=self.cache_timeout)
+
+    def _refresh(self, tickers):
+        """Return ticker -> history, downloading only what the store lacks.
+
+        Fresh series are cache hits. Stale series download bars from their
+        high-water mark on, which replaces the last stored bar (it may have
+        been incomplete) and appends the new ones. Only tickers with no
+        history at all pull the full 10 years.
+        """
+        results, cold, stale = {}, [], {}
+        for ticker in tickers:
+            meta = self.store.metadata(ticker)
+            if meta is None:
+                cold.append(ticker)
+            elif time.time() - meta.get("refreshed_at", 0) < self.cache_timeout:
+                logging.info(f"Cache hit for ticker: {ticker}")
+                self._count("cache_hits")
+                results[ticker] = self.store.read(ticker)
+            else:
+                stale[ticker] = meta
+        if cold or stale:
+            METRICS.increment("fetch_cache_misses", len(cold) + len(stale))
 
+        if cold:
+            logging.info(f"Downloading full history for: {', '.join(cold)}")
+            for ticker, frame in self._download_batch(cold, period="10y").items():
+                if frame is None:
+                    logging.warning(f"No data found for ticker: {ticker}")
+                    results[ticker] = None
+                    continue
                 with self.lock:
-                    self.cache.set(ticker, data, expire=self.cache_timeout)
-                return data
-            except Exception as e:
-                logging.error(f"Error fetching data for {ticker}: {e}")
-                return None
+                    self.store.write(ticker, frame, refreshed_at=time.time())
+                self._record_refresh(ticker, frame, "full")
+                self._seed_usdinr(ticker)
+                results[ticker] = self.store.read(ticker)
 
-        thread = threading.Thread(target=fetch_data)
-        thread.start()
-        thread.join(timeout=5)  # Timeout of 5 seconds
-        if thread.is_alive():
-            logging.warning(f"Timeout occurred while fetching data for {ticker}")
+        if stale:
+            start = min(meta["high_water_mark"] for meta in stale.values())
+            logging.info(
+                f"Downloading bars since {start:%Y-%m-%d} for: {', '.join(stale)}"
+            )
+            frames = self._download_batch(list(stale), start=start.strftime("%Y-%m-%d"))
+            for ticker, meta in stale.items():
+                new = frames[ticker]
+                if new is not None:
+                    new = new.loc[new.index >= meta["high_water_mark"]]
+                with self.lock:
+                    if new is not None and not new.empty:
+                        self.store.append(ticker, new, refreshed_at=time.time())
+                    else:
+                        self.store.update_metadata(ticker, refreshed_at=time.time())
+                self._record_refresh(ticker, new, "incremental")
+                self._seed_usdinr(ticker)
+                results[ticker] = self.store.read(ticker)
+
+        return results
+
+    def read_history(self, ticker, columns=None, start=None, end=None, tail=None):
+        """Read stored history without triggering a download.
+
+        Only the requested columns and date range are loaded from disk; see
+        PriceStore.read. Returns None if the ticker has never been fetched.
+        """
+        return self.store.read(ticker, columns, start, end, tail)
+
+    def last_close(self, ticker):
+        """Return the last stored close for ticker, or None if it has no history."""
+        history = self.store.read(ticker, columns=["Close"], tail=1)
+        if history is None or history.empty:
             return None
+        return float(history["Close"].iloc[-1])
 
-        with self.lock:
-            return self.cache.get(ticker)
+    def start_stream(self, tickers, source):
+        """Aggregate intraday ticks from source into each ticker's current candle.
 
-    def get_usdinr_rate(self):
-        def fetch_usdinr():
-            try:
-                with self.lock:
-                    if "USDINR" in self.cache:
-                        logging.info("Cache hit for USD/INR rate")
-                        return self.cache["USDINR"]
+        ``source`` is a providers.TickSource. Ticks only update an in-memory
+        bar per ticker; consumers pull changes with ``live_updates`` at their
+        own pace and read the patched history with ``live_history``.
+        """
+        self.stop_stream()
+        self.stream_source = source
+        logging.info(f"Streaming {len(tickers)} tickers")
+        source.start(tickers, self._on_tick)
 
-                logging.info("Downloading USD/INR exchange rate")
-                usdinr_data = yf.download("INR=X", period="1d")
+    def stop_stream(self):
+        if self.stream_source is not None:
+            self.stream_source.stop()
+            self.stream_source = None
+        with self.live_lock:
+            self.live_bars.clear()
+            self.live_dirty.clear()
 
-                if usdinr_data.empty:
-                    logging.warning("No data found for USD/INR rate")
-                    return None
+    def _open_bar(self, ticker, day, price):
+        """Start a live bar, continuing the stored bar if it is for the same day."""
+        stored = self.store.read(ticker, columns=self.LIVE_COLUMNS, tail=1)
+        if stored is not None and not stored.empty and stored.index[-1] == day:
+            bar = stored.iloc[-1].to_numpy(dtype=float)
+            bar[1] = np.fmax(bar[1], price)
+            bar[2] = np.fmin(bar[2], price)
+            return bar
+        return np.array([price, price, price, price, 0.0])
 
-                usdinr_data.columns = usdinr_data.columns.get_level_values(0)
-                usdinr_rate = usdinr_data["Close"].iloc[-1]
-                with self.lock:
-                    self.cache.set("USDINR", usdinr_rate, expire=self.cache_timeout)
-                return usdinr_rate
-            except Exception as e:
-                logging.error(f"Error fetching USD/INR rate: {e}")
+    def _on_tick(self, ticker, timestamp, price, volume=0.0):
+        day = pd.Timestamp(timestamp).tz_localize(None).normalize()
+        with self.live_lock:
+            live = self.live_bars.get(ticker)
+            if live is None or live[0] != day:
+                live = self.live_bars[ticker] = (
+                    day,
+                    self._open_bar(ticker, day, price),
+                )
+            bar = live[1]  # Open, High, Low, Close, Volume; updated in place
+            if price > bar[1]:
+                bar[1] = price
+            if price < bar[2]:
+                bar[2] = price
+            bar[3] = price
+            bar[4] += volume
+            self.live_dirty.add(ticker)
+
+    def live_updates(self):
+        """Return the tickers whose live bar changed since the last call.
+
+        However many ticks arrived in between, each ticker is reported once.
+        """
+        with self.live_lock:
+            updated, self.live_dirty = self.live_dirty, set()
+        return updated
+
+    def live_history(self, ticker):
+        """Return stored history with the live bar replacing or extending its last day.
+
+        Returns the stored history unchanged when the ticker is not streaming,
+        or None when it has never been fetched.
+        """
+        data = self.store.read(ticker)
+        with self.live_lock:
+            live = self.live_bars.get(ticker)
+            if live is not None:
+                day, bar = live[0], live[1].copy()
+        if data is None or data.empty or live is None or day < data.index[-1]:
+            return data
+
+        row = pd.DataFrame(
+            [bar],
+            columns=self.LIVE_COLUMNS,
+            index=pd.DatetimeIndex([day], name=data.index.name),
+        ).reindex(columns=data.columns)
+        if data.index[-1] == day:
+            data = data.iloc[:-1]
+        return pd.concat([data, row])
+
+    def _fetch_usdinr(self):
+        try:
+            with self.lock:
+                if "USDINR" in self.cache:
+                    logging.info("Cache hit for USD/INR rate")
+                    self._count("cache_hits")
+                    return self.cache["USDINR"]
+
+            logging.info("Downloading USD/INR exchange rate")
+            self._count("downloads")
+            with METRICS.timer("download"):
+                usdinr_rate = self.provider.latest_close(self.USDINR_TICKER)
+
+            if usdinr_rate is None:
+                logging.warning("No data found for USD/INR rate")
                 return None
 
-        thread = threading.Thread(target=fetch_usdinr)
-        thread.start()
-        thread.join(timeout=5)  # Timeout of 5 seconds
-        if thread.is_alive():
+            with self.lock:
+                self.cache.set("USDINR", usdinr_rate, expire=self.cache_timeout)
+            return usdinr_rate
+        except Exception as e:
+            logging.error(f"Error fetching USD/INR rate: {e}")
+            return None
+
+    def _count(self, name, amount=1):
+        with self.flight_lock:
+            self.stats[name] += amount
+        METRICS.increment(f"fetch_{name}", amount)
+
+    def _single_flight(self, key, fn, *args):
+        """Return the in-flight future for key, submitting fn only if none exists."""
+        with self.flight_lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                METRICS.increment("fetch_coalesced")
+                logging.info(f"Joining in-flight fetch for: {key}")
+                return future
+            future = self.executor.submit(fn, *args)
+            self.in_flight[key] = future
+
+        # Registered outside the lock: the callback runs inline if already done
+        future.add_done_callback(lambda f: self._land_flight(key, f))
+        return future
+
+    def _land_flight(self, key, future):
+        with self.flight_lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def fetch_stats(self):
+        """Return fetch counters, including network downloads saved."""
+        with self.flight_lock:
+            stats = dict(self.stats)
+        stats["downloads_saved"] = stats["cache_hits"] + stats["coalesced"]
+        return stats
+
+    def download_data(self, ticker, name, timeout=5):
+        """Return the 10y history for a ticker, or None on failure.
+
+        Concurrent callers for the same ticker share one download. If it
+        takes longer than ``timeout`` seconds (None waits forever) None is
+        returned, but the download keeps running in the background and
+        still fills the cache for the next caller.
+        """
+        future = self._single_flight(ticker, self._fetch_data, ticker)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logging.warning(f"Timeout occurred while fetching data for {ticker}")
+            return None
+
+    def get_usdinr_rate(self, timeout=5):
+        future = self._single_flight("USDINR", self._fetch_usdinr)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
             logging.warning("Timeout occurred while fetching USD/INR rate")
             return None
 
-        with self.lock:
-            return self.cache.get("USDINR")
+    def display_units(self, is_forex=False, multiplier=1.0, timeout=5):
+        """Return the DisplayUnits converting a ticker's quotes for display.
 
-    def calculate_std_ranges(self, data, future_days):
+        Forex-quoted tickers are converted with the USD/INR close history,
+        falling back to the latest rate when the history is unavailable.
+        Returns None when no USD/INR rate can be fetched.
+        """
+        if not is_forex:
+            return DisplayUnits(multiplier)
+
+        history = self.download_data(self.USDINR_TICKER, "USD/INR", timeout)
+        if history is not None:
+            close = history["Close"].to_numpy(dtype=float)
+            valid = np.isfinite(close)
+            if valid.any():
+                return DisplayUnits(
+                    multiplier,
+                    fx_dates=history.index.asi8[valid],
+                    fx_rates=close[valid],
+                )
+
+        usdinr_rate = self.get_usdinr_rate(timeout)
+        if usdinr_rate is None:
+            return None
+        return DisplayUnits(multiplier, rate=usdinr_rate)
+
+    def _fetch_many(self, futures):
+        """Fill each ticker's future from the cache or batched downloads."""
         try:
-            data["Returns"] = data["Close"].pct_change()
-            mean_return = np.mean(data["Returns"])
-            std_dev = np.std(data["Returns"])
-            last_close = data["Close"].iloc[-1]
+            results = self._refresh(list(futures))
+        except Exception as e:
+            logging.error(f"Error fetching batch {list(futures)}: {e}")
+            results = {}
+        for ticker, future in futures.items():
+            future.set_result(results.get(ticker))
 
-            projected_mean = mean_return * future_days
-            projected_std_dev = std_dev * np.sqrt(future_days)
+    def _start_many(self, tickers):
+        """Return a future per ticker, batching every ticker not already in flight."""
+        futures, owned = {}, {}
+        with self.flight_lock:
+            for ticker in dict.fromkeys(tickers):
+                future = self.in_flight.get(ticker)
+                if future is not None:
+                    self.stats["coalesced"] += 1
+                    METRICS.increment("fetch_coalesced")
+                else:
+                    future = owned[ticker] = self.in_flight[ticker] = Future()
+                futures[ticker] = future
 
-            lower_bound = round(
-                (1 + projected_mean - projected_std_dev) * last_close, 0
-            )
-            upper_bound = round(
-                (1 + projected_mean + projected_std_dev) * last_close, 0
+        for ticker, future in owned.items():
+            future.add_done_callback(lambda f, t=ticker: self._land_flight(t, f))
+        if owned:
+            batch = self.executor.submit(self._fetch_many, owned)
+            batch.add_done_callback(lambda b: self._fail_unfinished(owned))
+        return futures
+
+    def _fail_unfinished(self, futures):
+        # Never leave joined callers waiting if the batch job died or was cancelled
+        for future in futures.values():
+            if not future.done():
+                future.set_result(None)
+
+    def download_many(self, tickers, timeout=None):
+        """Fetch several tickers with one batched download and fill the cache.
+
+        Tickers already cached are served from the cache and tickers already
+        being fetched are joined rather than downloaded again. Returns a dict
+        of ticker -> DataFrame (None for tickers that failed or timed out).
+        """
+        futures = self._start_many(tickers)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = {}
+        for ticker, future in futures.items():
+            remaining = (
+                None if deadline is None else max(0, deadline - time.monotonic())
             )
-            projected_price = round((1 + projected_mean) * last_close, 0)
+            try:
+                results[ticker] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                logging.warning(f"Timeout occurred while fetching data for {ticker}")
+                results[ticker] = None
+        return results
+
+    def prefetch(self, tickers):
+        """Warm the cache for the given tickers in the background.
+
+        Returns the per-ticker futures without waiting for them.
+        """
+        logging.info(f"Prefetching {len(tickers)} tickers")
+        return self._start_many(tickers)
+
+    @staticmethod
+    def as_of_rows(data, date):
+        """Number of bars of data on or before date (a binary search)."""
+        return int(data.index.searchsorted(pd.to_datetime(date), side="right"))
+
+    def return_stats(self, data, ticker=None, rows=None):
+        """Return (last_close, mean, std) of daily returns for a history.
 
-            return lower_bound, upper_bound, projected_price
+        With ``rows`` only the first rows bars count, giving the statistics
+        as of that bar. They come from prefix sums of the returns; with
+        ``ticker`` those are memoized until the history's last bar, length
+        or last close changes (a live bar moves the close in place), so
+        every as-of query after the first is O(1). The frame is only read,
+        never modified. Raises ValueError unless 1 <= rows <= len(data).
+        """
+        if rows is not None and not 1 <= rows <= len(data):
+            raise ValueError(f"rows must be between 1 and {len(data)}, got {rows}")
+        key = (data.index[-1], len(data), data["Close"].iat[-1])
+        cached = None
+        if ticker is not None:
+            with self.flight_lock:
+                cached = self.stats_cache.get(ticker)
+        if cached is not None and cached[0] == key:
+            close, sums = cached[1]
+        else:
+            close = data["Close"].to_numpy(dtype=float)
+            sums = return_prefix_sums(close)
+            if ticker is not None:
+                with self.flight_lock:
+                    self.stats_cache[ticker] = (key, (close, sums))
+
+        last = (len(close) if rows is None else rows) - 1
+        count, total, squares = (values[last] for values in sums)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+            std = np.sqrt(max(squares / count - mean**2, 0.0))
+        return close[last], mean, std
+
+    def calendar_periods(self, ticker, date):
+        """PERIOD_MONTHS as trading days after date on the ticker's calendar.
+
+        A label -> trading days dict like PERIODS, but counting the
+        sessions the ticker's exchange actually holds over each period.
+        """
+        days = calendar_for(ticker).period_days(date, list(self.PERIOD_MONTHS.values()))
+        return dict(zip(self.PERIOD_MONTHS, days.tolist()))
+
+    @METRICS.timed("ranges")
+    def calculate_std_ranges_many(
+        self, data, horizons, ticker=None, rows=None, scale=1.0
+    ):
+        """Project mean +/- 1 std ranges for every horizon (in trading days) at once.
+
+        Returns a dict of arrays aligned with ``horizons``: "horizon",
+        "lower", "projected" and "upper", each multiplied by ``scale`` (to
+        display units) and rounded to whole units. ``rows`` projects from
+        that bar instead of the last one.
+        """
+        last_close, mean_return, std_dev = self.return_stats(data, ticker, rows)
+        last_close = last_close * scale
+        horizons = np.asarray(horizons, dtype=float)
+
+        projected_mean = mean_return * horizons
+        projected_std_dev = std_dev * np.sqrt(horizons)
+        return {
+            "horizon": horizons,
+            "lower": np.round((1 + projected_mean - projected_std_dev) * last_close),
+            "projected": np.round((1 + projected_mean) * last_close),
+            "upper": np.round((1 + projected_mean + projected_std_dev) * last_close),
+        }
+
+    def calculate_std_ranges(self, data, future_days):
+        try:
+            ranges = self.calculate_std_ranges_many(data, [future_days])
+            return ranges["lower"][0], ranges["upper"][0], ranges["projected"][0]
         except Exception as e:
             logging.error(f"Error calculating standard deviation ranges: {e}")
             return None, None, None
 
-    def calculate_std_for_ticker(self, ticker, name, is_forex=False, multiplier=1.0):
-        data = self.download_data(ticker, name)
+    def std_ranges_for_ticker(
+        self,
+        ticker,
+        name,
+        is_forex=False,
+        multiplier=1.0,
+        timeout=5,
+        data=None,
+        periods=None,
+        rows=None,
+    ):
+        """Return (last_price, ranges) for a ticker, in display currency and units.
+
+        ``ranges`` is the dict of arrays from calculate_std_ranges_many plus a
+        "period" array of labels; ``periods`` maps labels to trading days and
+        defaults to calendar_periods from the as-of bar. Pass ``data`` when
+        the caller already holds the history to skip the lookup, and ``rows``
+        for ranges as of that bar (ValueError unless 1 <= rows <= len(data)).
+        """
+        if data is None:
+            data = self.download_data(ticker, name, timeout)
         if data is None:
             logging.warning(f"Data for ticker {ticker} could not be fetched")
             return None
 
-        usdinr_rate = self.get_usdinr_rate() if is_forex else 1
-        if is_forex and usdinr_rate is None:
+        units = self.display_units(is_forex, multiplier, timeout)
+        if units is None:
             logging.warning("USD/INR rate could not be fetched")
             return None
 
-        periods = {"1 Month": 21, "3 Months": 63, "1 Year": 252}
+        if rows is not None and not 1 <= rows <= len(data):
+            raise ValueError(f"rows must be between 1 and {len(data)}, got {rows}")
+        last = (len(data) if rows is None else rows) - 1
+        if periods is None:
+            periods = self.calendar_periods(ticker, data.index[last])
+        # Projected from the as-of bar, so converted at that bar's rate
+        scale = units.factor_at(data.index[last])
+        try:
+            ranges = self.calculate_std_ranges_many(
+                data, list(periods.values()), ticker, rows, scale
+            )
+        except Exception as e:
+            logging.error(f"Error calculating standard deviation ranges: {e}")
+            return None
 
-        last_price = (data["Close"].iloc[-1] * usdinr_rate) / multiplier
+        ranges["period"] = np.array(list(periods))
 
+        return data["Close"].iloc[last] * scale, ranges
+
+    def calculate_std_for_ticker(
+        self,
+        ticker,
+        name,
+        is_forex=False,
+        multiplier=1.0,
+        timeout=5,
+        data=None,
+        rows=None,
+    ):
+        result = self.std_ranges_for_ticker(
+            ticker, name, is_forex, multiplier, timeout, data, rows=rows
+        )
+        if result is None:
+            return None
+
+        last_price, ranges = result
         result_text = f"{name}:\t{last_price:.0f}\n"
-        for period, days in periods.items():
-            lower_bound, upper_bound, projected_price = self.calculate_std_ranges(
-                data, days
-            )
-            if lower_bound is None:
-                continue
-
-            if is_forex:
-                lower_bound *= usdinr_rate
-                upper_bound *= usdinr_rate
-                projected_price *= usdinr_rate
-            if multiplier != 1.0:
-                lower_bound /= multiplier
-                upper_bound /= multiplier
-                projected_price /= multiplier
+        for period, lower_bound, projected_price, upper_bound in zip(
+            ranges["period"], ranges["lower"], ranges["projected"], ranges["upper"]
+        ):
             result_text += f"{period}:\t{lower_bound:.0f}  - {projected_price:.0f} - {upper_bound:.0f}\n"
 
         return result_text
 
+    def shutdown(self):
+        """Stop streaming and accept no more work; running downloads finish."""
+        self.stop_stream()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
     def clear_cache(self):
         with self.lock:
             logging.info("Clearing cache")
             self.cache.clear()
+            self.store.clear()
@@ -0,0 +1,284 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+from metrics import METRICS
+
+
+def _segment(values, lo, hi):
+    """Return values[lo:hi] with gaps (NaN) forward-filled."""
+    segment = values[lo:hi]
+    if np.isnan(segment).any():
+        segment = pd.Series(segment).ffill().to_numpy()
+    return segment
+
+
+def _smooth(x, alpha, previous=None):
+    """Exponential smoothing y[i] = alpha * x[i] + (1 - alpha) * y[i - 1].
+
+    Matches ``ewm(alpha=alpha, adjust=False)``: without a previous value the
+    series starts at x[0]. Runs as one IIR filter call instead of a loop.
+    """
+    if len(x) == 0:
+        return x
+    start = x[0] if previous is None else previous
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * start])
+    return y
+
+
+class Indicator:
+    """One indicator; fills its output columns for rows [start, end).
+
+    ``inputs`` holds full-length Close/High/Low arrays and ``out`` the
+    engine's full-length output buffers, whose rows before ``start`` are
+    already valid and may be used as the recursion state.
+    """
+
+    columns = ()
+    price_scaled = True  # Outputs scale with prices (False for oscillators)
+
+    def compute(self, inputs, start, end, out):
+        raise NotImplementedError
+
+
+class EMA(Indicator):
+    def __init__(self, span, source="Close"):
+        self.span = span
+        self.source = source
+        self.columns = (f"EMA_{span}",)
+
+    def compute(self, inputs, start, end, out):
+        (column,) = self.columns
+        previous = out[column][start - 1] if start else None
+        x = _segment(inputs[self.source], start, end)
+        out[column][start:end] = _smooth(x, 2.0 / (self.span + 1), previous)
+
+
+class SMA(Indicator):
+    def __init__(self, window, source="Close"):
+        self.window = window
+        self.source = source
+        self.columns = (f"SMA_{window}",)
+
+    def compute(self, inputs, start, end, out):
+        (column,) = self.columns
+        lo = max(0, start - self.window + 1)
+        x = _segment(inputs[self.source], lo, end)
+        means = np.full(end - lo, np.nan)
+        if len(x) >= self.window:
+            sums = np.cumsum(np.concatenate(([0.0], x)))
+            means[self.window - 1 :] = (sums[self.window :] - sums[: -self.window]) / (
+                self.window
+            )
+        out[column][start:end] = means[start - lo :]
+
+
+class Bollinger(Indicator):
+    def __init__(self, window=20, width=2.0, source="Close"):
+        self.window = window
+        self.width = width
+        self.source = source
+        self.columns = (f"BB_{window}_mid", f"BB_{window}_upper", f"BB_{window}_lower")
+
+    def compute(self, inputs, start, end, out):
+        mid, upper, lower = self.columns
+        lo = max(0, start - self.window + 1)
+        x = _segment(inputs[self.source], lo, end)
+        mean = np.full(end - lo, np.nan)
+        std = np.full(end - lo, np.nan)
+        if len(x) >= self.window:
+            windows = sliding_window_view(x, self.window)
+            mean[self.window - 1 :] = windows.mean(axis=1)
+            std[self.window - 1 :] = windows.std(axis=1)
+        mean, std = mean[start - lo :], std[start - lo :]
+        out[mid][start:end] = mean
+        out[upper][start:end] = mean + self.width * std
+        out[lower][start:end] = mean - self.width * std
+
+
+class RSI(Indicator):
+    """Wilder's RSI; average gain and loss are kept as hidden state columns."""
+
+    price_scaled = False
+
+    def __init__(self, period=14, source="Close"):
+        self.period = period
+        self.source = source
+        self.columns = (f"RSI_{period}", f"_RSI_{period}_gain", f"_RSI_{period}_loss")
+
+    def compute(self, inputs, start, end, out):
+        column, gain_column, loss_column = self.columns
+        first = max(start, 1)  # Row 0 has no price change
+        if start == 0:
+            out[column][0] = np.nan
+        if first >= end:
+            return
+
+        x = _segment(inputs[self.source], first - 1, end)
+        delta = np.diff(x)
+        alpha = 1.0 / self.period
+        cold = first == 1
+        gain = _smooth(
+            np.maximum(delta, 0.0), alpha, None if cold else out[gain_column][first - 1]
+        )
+        loss = _smooth(
+            np.maximum(-delta, 0.0),
+            alpha,
+            None if cold else out[loss_column][first - 1],
+        )
+        out[gain_column][first:end] = gain
+        out[loss_column][first:end] = loss
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[column][first:end] = np.where(
+                loss == 0, 100.0, 100.0 - 100.0 / (1.0 + gain / loss)
+            )
+
+
+class ATR(Indicator):
+    """Average true range with Wilder smoothing."""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.columns = (f"ATR_{period}",)
+
+    def compute(self, inputs, start, end, out):
+        (column,) = self.columns
+        lo = max(start - 1, 0)
+        high = _segment(inputs["High"], lo, end)
+        low = _segment(inputs["Low"], lo, end)
+        close = _segment(inputs["Close"], lo, end)
+
+        true_range = high - low
+        previous_close = close[:-1]
+        true_range[1:] = np.maximum.reduce(
+            [
+                true_range[1:],
+                np.abs(high[1:] - previous_close),
+                np.abs(low[1:] - previous_close),
+            ]
+        )
+        true_range = true_range[start - lo :]
+        previous = out[column][start - 1] if start else None
+        out[column][start:end] = _smooth(true_range, 1.0 / self.period, previous)
+
+
+DEFAULT_INDICATORS = (EMA(30), EMA(200))
+
+
+class IndicatorEngine:
+    """Per-ticker indicator cache that only computes bars it has not seen.
+
+    ``update`` compares the history it is given with what it computed last
+    time: appended bars are computed from the stored state, a revised last
+    bar is recomputed, and only a rewritten history triggers a full pass.
+    Output buffers grow geometrically, so appending k bars costs O(k).
+    """
+
+    INPUTS = ("Close", "High", "Low")
+
+    def __init__(self, indicators=DEFAULT_INDICATORS):
+        self.indicators = list(indicators)
+        self.lock = threading.Lock()
+        self.state = {}  # ticker -> {"rows", "last_ts", "last_bar", "buffers"}
+        self.stats = {"rows_computed": 0, "full_passes": 0, "incremental_passes": 0}
+
+    @property
+    def price_columns(self):
+        """Public columns that scale linearly with prices."""
+        return [
+            column
+            for indicator in self.indicators
+            if indicator.price_scaled
+            for column in indicator.columns
+            if not column.startswith("_")
+        ]
+
+    @property
+    def columns(self):
+        return [
+            column
+            for indicator in self.indicators
+            for column in indicator.columns
+            if not column.startswith("_")
+        ]
+
+    def _resume_row(self, state, index, inputs):
+        """Return the first row that needs computing for this history."""
+        if state is None:
+            return 0
+        rows = state["rows"]
+        if len(index) < rows or index[rows - 1] != state["last_ts"]:
+            return 0  # History was rewritten
+        last_bar = tuple(values[rows - 1] for values in inputs.values())
+        if not np.array_equal(last_bar, state["last_bar"], equal_nan=True):
+            return rows - 1  # The last bar was revised by a refresh
+        return rows
+
+    def update(self, ticker, data):
+        """Bring ticker's indicators up to date with data and return them.
+
+        Returns a dict of column -> read-only array aligned with data's rows.
+        """
+        index = data.index.asi8
+        inputs = {
+            name: data[name].to_numpy(dtype=float)
+            for name in self.INPUTS
+            if name in data.columns
+        }
+        rows = len(index)
+
+        with self.lock:
+            state = self.state.get(ticker)
+            start = self._resume_row(state, index, inputs)
+            if state is None or start == 0:
+                state = {"buffers": {}}
+                self.state[ticker] = state
+
+            buffers = state["buffers"]
+            capacity = len(next(iter(buffers.values()), ()))
+            if rows > capacity:
+                capacity = max(rows, 2 * capacity, 256)
+                for indicator in self.indicators:
+                    for column in indicator.columns:
+                        grown = np.full(capacity, np.nan)
+                        old = buffers.get(column)
+                        if old is not None:
+                            grown[:start] = old[:start]
+                        buffers[column] = grown
+
+            if start < rows:
+                with METRICS.timer("indicators"):
+                    for indicator in self.indicators:
+                        indicator.compute(inputs, start, rows, buffers)
+                METRICS.increment("indicator_rows", rows - start)
+                self.stats["rows_computed"] += rows - start
+                self.stats["full_passes" if start == 0 else "incremental_passes"] += 1
+
+            state["rows"] = rows
+            state["last_ts"] = index[-1]
+            state["last_bar"] = tuple(values[-1] for values in inputs.values())
+
+            result = {}
+            for column in self.columns:
+                view = buffers[column][:rows]
+                view.flags.writeable = False
+                result[column] = view
+            return result
+
+    def tail(self, ticker, data, rows):
+        """Update ticker and return the last rows as a DataFrame on data's index."""
+        values = self.update(ticker, data)
+        return pd.DataFrame(
+            {column: values[column][-rows:] for column in values},
+            index=data.index[-rows:],
+        )
+
+    def clear(self, ticker=None):
+        with self.lock:
+            if ticker is None:
+                self.state.clear()
+            else:
+                self.state.pop(ticker, None)
@@ -1,9 +1,15 @@
+import argparse
+import logging
 from tkinter import Tk
 
+from data_fetch import DataFetcher
+from metrics import add_arguments, instrumented
+from providers import ReplayProvider, SimulatedTickSource
 from ui import OptionCalculatorUI
 
 
 def on_closing():
+    app.market_data_tab.shutdown()
     if app.market_data_tab.canvas:  # Check canvas in the MarketDataTab class
         app.market_data_tab.canvas.get_tk_widget().destroy()  # Destroy the canvas widget if it exists
     root.destroy()  # Proceed to close the app
@@ -21,8 +27,46 @@ def toggle_projection_line(event=None):
     app.market_data_tab.toggle_projection_line()
 
 
+def toggle_live(event=None):
+    app.market_data_tab.toggle_live()
+
+
+def toggle_monte_carlo(event=None):
+    app.market_data_tab.toggle_monte_carlo()
+
+
+def step_date(bars):
+    return lambda event=None: app.market_data_tab.step_date(bars)
+
+
 def main():
     global root, app
+    parser = argparse.ArgumentParser(description="OptiCal - Option Calculator")
+    parser.add_argument(
+        "--no-prefetch",
+        action="store_true",
+        help="don't warm the market data cache for the watchlist at startup",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="serve market data from a recording made with `cli.py record`",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="simulated seconds per download"
+    )
+    parser.add_argument(
+        "--stream",
+        choices=["poll", "simulate"],
+        help="start live intraday streaming: poll the provider or simulate ticks",
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+
     root = Tk()
     root.title("OptiCal - Option Calculator")
 
@@ -31,7 +75,17 @@ def main():
     screen_height = root.winfo_screenheight()
     root.geometry(f"{screen_width}x{screen_height}")
 
-    app = OptionCalculatorUI(root)
+    data_fetcher = None
+    if args.replay:
+        data_fetcher = DataFetcher(
+            cache_dir=f"{args.replay}/.cache",
+            store_dir=f"{args.replay}/.store",
+            provider=ReplayProvider(args.replay, latency=args.latency),
+        )
+
+    app = OptionCalculatorUI(
+        root, prefetch=not args.no_prefetch, data_fetcher=data_fetcher
+    )
 
     # Bind the window close event to the on_closing function
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -45,7 +99,26 @@ def main():
     # Bind Command+p to show/hide projection
     root.bind("<Command-p>", toggle_projection_line)
 
-    root.mainloop()
+    # Bind Command+l to start/stop live streaming
+    root.bind("<Command-l>", toggle_live)
+
+    # Bind Command+m to show/hide the Monte Carlo bands
+    root.bind("<Command-m>", toggle_monte_carlo)
+
+    # Bind Command+Left/Right to step the as-of date back/forward one bar
+    root.bind("<Command-Left>", step_date(-1))
+    root.bind("<Command-Right>", step_date(1))
+
+    market_data_tab = app.market_data_tab
+    if args.stream == "poll":
+        market_data_tab.start_live()
+    elif args.stream == "simulate":
+        market_data_tab.start_live(
+            SimulatedTickSource(market_data_tab.data_fetcher.last_close)
+        )
+
+    with instrumented(args):
+        root.mainloop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Upper bounds in seconds of the latency histogram buckets
+BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class _Timer:
+    """Context manager recording the time spent in its block."""
+
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, self.start)
+        return False
+
+
+class Metrics:
+    """Counters and latency histograms shared by the whole process.
+
+    Recording is a bucket search and a dict update under a lock, about a
+    microsecond, so timers can sit on hot paths such as every pricing
+    batch and chart update. While tracing (see start_trace) each timed span
+    is also kept with its thread and start time, so write_trace can lay one
+    click out on a timeline.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.counters = {}  # name -> total
+        self.histograms = {}  # name -> {"counts": per bucket + overflow, "sum", "max"}
+        self.spans = None  # (name, thread id, start, seconds) while tracing
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds, start=None):
+        """Add one latency sample; ``start`` (perf_counter) places it in a trace."""
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = {
+                    "counts": [0] * (len(self.buckets) + 1),
+                    "sum": 0.0,
+                    "max": 0.0,
+                }
+            histogram["counts"][bucket] += 1
+            histogram["sum"] += seconds
+            if seconds > histogram["max"]:
+                histogram["max"] = seconds
+            if self.spans is not None and start is not None:
+                self.spans.append((name, threading.get_ident(), start, seconds))
+
+    def timer(self, name):
+        """Time a block: ``with METRICS.timer("ranges"): ...``."""
+        return _Timer(self, name)
+
+    def timed(self, name):
+        """Decorator recording every call of the function under name."""
+
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start, start)
+
+            return wrapper
+
+        return decorate
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            if self.spans is not None:
+                self.spans = []
+
+    def _quantile(self, counts, total, q):
+        """Upper bound of the bucket holding the q quantile (inf if past the last)."""
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        """Return counters and histogram summaries as plain dicts.
+
+        Histograms report count, sum, mean and max in seconds, p50/p95 as
+        the bucket bound they fall under, and cumulative bucket counts.
+        """
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {
+                name: (list(h["counts"]), h["sum"], h["max"])
+                for name, h in self.histograms.items()
+            }
+        summaries = {}
+        for name, (counts, total_seconds, longest) in sorted(histograms.items()):
+            count = sum(counts)
+            cumulative, seen = {}, 0
+            for bound, bucket in zip(self.buckets, counts):
+                seen += bucket
+                cumulative[f"{bound:g}"] = seen
+            cumulative["+Inf"] = count
+            summaries[name] = {
+                "count": count,
+                "sum": total_seconds,
+                "mean": total_seconds / count if count else 0.0,
+                "max": longest,
+                "p50": self._quantile(counts, count, 0.5),
+                "p95": self._quantile(counts, count, 0.95),
+                "buckets": cumulative,
+            }
+        return {"counters": dict(sorted(counters.items())), "histograms": summaries}
+
+    def to_json(self):
+        snapshot = self.snapshot()
+        for summary in snapshot["histograms"].values():
+            for key in ("p50", "p95"):
+                if summary[key] == float("inf"):
+                    summary[key] = None
+        return json.dumps(snapshot, indent=2) + "\n"
+
+    def to_prometheus(self, prefix="optical_"):
+        """Prometheus text exposition: counters as _total, latencies as _seconds."""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in snapshot["counters"].items():
+            metric = f"{prefix}{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        for name, summary in snapshot["histograms"].items():
+            metric = f"{prefix}{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in summary["buckets"].items():
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum {summary['sum']:.9g}")
+            lines.append(f"{metric}_count {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write metrics to path: JSON for a .json file, else Prometheus text."""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        with open(path, "w") as f:
+            f.write(text)
+
+    def start_trace(self):
+        """Keep every timed span from now on, for write_trace."""
+        with self.lock:
+            self.spans = []
+
+    def write_trace(self, path):
+        """Write the spans as Chrome trace events (chrome://tracing, Perfetto)."""
+        with self.lock:
+            spans = list(self.spans or ())
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": seconds * 1e6,
+                "pid": pid,
+                "tid": thread,
+            }
+            for name, thread, start, seconds in spans
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+METRICS = Metrics()
+
+
+@contextmanager
+def profile(path):
+    """Profile the calling thread with cProfile and dump the stats to path.
+
+    Read the file with ``python -m pstats`` or snakeviz. cProfile only sees
+    the thread it runs on; to sample the worker threads too, run the app
+    under py-spy instead (``py-spy record -o profile.svg -- python main.py``),
+    where timed functions appear under their own names.
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def add_arguments(parser):
+    """Add the --metrics, --trace and --profile options to an argparse parser."""
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="on exit, write counters and latency histograms "
+        "(JSON for a .json file, else Prometheus text)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="on exit, write every timed span as a Chrome trace (chrome://tracing)",
+    )
+    parser.add_argument(
+        "--profile", metavar="FILE", help="profile the main thread with cProfile"
+    )
+
+
+@contextmanager
+def instrumented(args):
+    """Trace, profile and export metrics around a block, as the options ask."""
+    if args.trace:
+        METRICS.start_trace()
+    try:
+        if args.profile:
+            with profile(args.profile):
+                yield
+        else:
+            yield
+    finally:
+        if args.metrics:
+            METRICS.write(args.metrics)
+        if args.trace:
+            METRICS.write_trace(args.trace)
@@ -0,0 +1,329 @@
+import numpy as np
+from scipy.special import ndtr
+
+from calculations import (
+    IV_ABOVE_MAX_PRICE,
+    IV_BELOW_INTRINSIC,
+    IV_INVALID_INPUT,
+    IV_NOT_CONVERGED,
+    IV_OK,
+    TRADING_DAYS,
+    black_scholes_greeks,
+    black_scholes_price,
+    implied_volatility_batch,
+    is_call,
+)
+
+
+class PricingModel:
+    """One option pricing model behind a shared vectorized interface.
+
+    Every method takes broadcastable arrays of spot (the futures price for
+    futures models), strike, time to expiration, volatility and option
+    type, plus the rate ``r`` and dividend yield ``q`` for each contract
+    (see rates.TermStructure). Greeks use black_scholes_greeks' keys and
+    units.
+    """
+
+    name = ""
+    american = False
+    futures = False
+
+    def price(self, spot, strike, t, volatility, option_type, r, q):
+        raise NotImplementedError
+
+    def forward(self, spot, t, r, q):
+        """Forward price of the underlying: spot itself for futures models."""
+        if self.futures:
+            return np.asarray(spot, dtype=float)
+        return spot * np.exp((r - q) * t)
+
+    def greeks(self, spot, strike, t, volatility, option_type, r, q):
+        return _numerical_greeks(
+            self.price, spot, strike, t, volatility, option_type, r, q
+        )
+
+    def implied_volatility(
+        self, price, spot, strike, t, option_type, r, q, full_output=False
+    ):
+        return _bisect_volatility(
+            self.price, price, spot, strike, t, option_type, r, q, full_output
+        )
+
+
+class BlackScholesMerton(PricingModel):
+    """European options on a spot paying a continuous dividend yield q."""
+
+    name = "bsm"
+
+    def price(self, spot, strike, t, volatility, option_type, r, q):
+        return black_scholes_price(spot, strike, t, volatility, option_type, r, q)
+
+    def greeks(self, spot, strike, t, volatility, option_type, r, q):
+        return black_scholes_greeks(spot, strike, t, volatility, option_type, r, q)
+
+    def implied_volatility(
+        self, price, spot, strike, t, option_type, r, q, full_output=False
+    ):
+        return implied_volatility_batch(
+            price, spot, strike, t, option_type, r, full_output=full_output, q=q
+        )
+
+
+class Black76(BlackScholesMerton):
+    """European options on a futures price (index futures, MCX commodities).
+
+    Black-76 is Black-Scholes-Merton with the futures price as spot and a
+    carry of zero (q = r), so any dividend yield is ignored. Rho accounts
+    for r discounting the whole premium.
+    """
+
+    name = "black76"
+    futures = True
+
+    def price(self, spot, strike, t, volatility, option_type, r, q):
+        return super().price(spot, strike, t, volatility, option_type, r, r)
+
+    def greeks(self, spot, strike, t, volatility, option_type, r, q):
+        greeks = super().greeks(spot, strike, t, volatility, option_type, r, r)
+        greeks["rho"] = -np.maximum(t, 0.0) * greeks["price"] / 100.0
+        return greeks
+
+    def implied_volatility(
+        self, price, spot, strike, t, option_type, r, q, full_output=False
+    ):
+        return super().implied_volatility(
+            price, spot, strike, t, option_type, r, r, full_output
+        )
+
+
+class BjerksundStensland(PricingModel):
+    """American options with the Bjerksund-Stensland (1993) approximation.
+
+    A closed-form flat exercise boundary, evaluated for all contracts at
+    once; puts use the put-call transformation P(S, K, r, b) = C(K, S, r - b,
+    -b). Calls are never exercised early when the carry b = r - q is at
+    least r, and are then priced as European. With ``futures`` the spot is
+    a futures price (b = 0, American Black-76). Greeks are finite
+    differences and implied volatility is solved by bisection.
+    """
+
+    name = "american"
+    american = True
+
+    def __init__(self, futures=False):
+        self.futures = futures
+        if futures:
+            self.name = "american76"
+
+    @staticmethod
+    def _phi(spot, t, gamma, h, i, r, b, vol):
+        vol_sqrt_t = vol * np.sqrt(t)
+        lam = (-r + gamma * b + 0.5 * gamma * (gamma - 1.0) * vol * vol) * t
+        d = -(np.log(spot / h) + (b + (gamma - 0.5) * vol * vol) * t) / vol_sqrt_t
+        kappa = 2.0 * b / (vol * vol) + (2.0 * gamma - 1.0)
+        return (
+            np.exp(lam)
+            * spot**gamma
+            * (
+                ndtr(d)
+                - (i / spot) ** kappa * ndtr(d - 2.0 * np.log(i / spot) / vol_sqrt_t)
+            )
+        )
+
+    def _call(self, spot, strike, t, vol, r, b):
+        """American call with carry b; inputs already broadcast and live."""
+        european = black_scholes_price(spot, strike, t, vol, True, r, r - b)
+        early = b < r
+        # Contracts priced as European may overflow here; they are masked out
+        with np.errstate(all="ignore"):
+            v2 = vol * vol
+            beta = (0.5 - b / v2) + np.sqrt((b / v2 - 0.5) ** 2 + 2.0 * r / v2)
+            b_infinity = beta / (beta - 1.0) * strike
+            b_zero = np.maximum(strike, r / np.where(early, r - b, 1.0) * strike)
+            h = -(b * t + 2.0 * vol * np.sqrt(t)) * b_zero / (b_infinity - b_zero)
+            trigger = b_zero + (b_infinity - b_zero) * (1.0 - np.exp(h))
+            alpha = (trigger - strike) * trigger ** (-beta)
+            value = (
+                alpha * spot**beta
+                - alpha * self._phi(spot, t, beta, trigger, trigger, r, b, vol)
+                + self._phi(spot, t, 1.0, trigger, trigger, r, b, vol)
+                - self._phi(spot, t, 1.0, strike, trigger, r, b, vol)
+                - strike * self._phi(spot, t, 0.0, trigger, trigger, r, b, vol)
+                + strike * self._phi(spot, t, 0.0, strike, trigger, r, b, vol)
+            )
+        value = np.where(spot >= trigger, spot - strike, value)
+        # The approximation is a lower bound; never below the European value
+        return np.where(early, np.maximum(value, european), european)
+
+    def price(self, spot, strike, t, volatility, option_type, r, q):
+        spot, strike, t, vol, r, q = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (spot, strike, t, volatility, r, q))
+        )
+        call = np.broadcast_to(is_call(option_type), spot.shape)
+        b = np.zeros_like(r) if self.futures else r - q
+
+        live = (t > 0) & (vol > 0)
+        t_live, vol_live = np.where(live, t, 1.0), np.where(live, vol, 1.0)
+        value = np.where(
+            call,
+            self._call(spot, strike, t_live, vol_live, r, b),
+            self._call(strike, spot, t_live, vol_live, r - b, -b),
+        )
+        intrinsic = np.maximum(np.where(call, spot - strike, strike - spot), 0.0)
+        return np.where(live, np.maximum(value, intrinsic), intrinsic)
+
+
+MODELS = {
+    "bsm": BlackScholesMerton(),
+    "black76": Black76(),
+    "american": BjerksundStensland(),
+    "american76": BjerksundStensland(futures=True),
+}
+
+MODEL_LABELS = {
+    "bsm": "Black-Scholes-Merton",
+    "black76": "Black-76 (futures)",
+    "american": "American (Bjerksund-Stensland)",
+    "american76": "American on futures",
+}
+
+
+def get_model(name):
+    """Return the registered PricingModel called name."""
+    try:
+        return MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown pricing model: {name}") from None
+
+
+# Relative bumps for finite-difference Greeks
+_SPOT_BUMP = 1e-3
+_VOL_BUMP = 1e-3
+_RATE_BUMP = 1e-4
+_DAY = 1.0 / TRADING_DAYS
+
+
+def _numerical_greeks(price, spot, strike, t, volatility, option_type, r, q):
+    """Finite-difference Greeks from one batched call to price.
+
+    All bumped scenarios are stacked on a leading axis and priced
+    together, so the cost is one vectorized pricing of eleven times the
+    contracts.
+    """
+    spot, strike, t, vol, r, q = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (spot, strike, t, volatility, r, q))
+    )
+    ds = spot * _SPOT_BUMP
+    dt = np.minimum(_DAY, np.maximum(t, 0.0))
+    # spot, vol, t, r bumps for: base, S+, S-, v+, v-, S+v+, S-v+, t-1d, r+,
+    # S+t-1d, S-t-1d
+    bumps = np.array(
+        [
+            [0, 0, 0, 0],
+            [1, 0, 0, 0],
+            [-1, 0, 0, 0],
+            [0, 1, 0, 0],
+            [0, -1, 0, 0],
+            [1, 1, 0, 0],
+            [-1, 1, 0, 0],
+            [0, 0, -1, 0],
+            [0, 0, 0, 1],
+            [1, 0, -1, 0],
+            [-1, 0, -1, 0],
+        ],
+        dtype=float,
+    ).reshape((11, 4) + (1,) * spot.ndim)
+    values = price(
+        spot + bumps[:, 0] * ds,
+        strike,
+        t + bumps[:, 2] * dt,
+        np.maximum(vol + bumps[:, 1] * _VOL_BUMP, 1e-9),
+        option_type,
+        r + bumps[:, 3] * _RATE_BUMP,
+        q,
+    )
+    (
+        base,
+        up,
+        down,
+        vol_up,
+        vol_down,
+        up_vol_up,
+        down_vol_up,
+        later,
+        rate_up,
+        up_later,
+        down_later,
+    ) = values
+
+    delta = (up - down) / (2.0 * ds)
+    delta_vol_up = (up_vol_up - down_vol_up) / (2.0 * ds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        theta = np.where(dt > 0, (later - base) / dt, 0.0)
+    delta_later = (up_later - down_later) / (2.0 * ds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        charm = np.where(dt > 0, (delta_later - delta) / dt, 0.0)
+    vega = (vol_up - vol_down) / (2.0 * _VOL_BUMP)
+    return {
+        "price": base,
+        "delta": delta,
+        "gamma": (up - 2.0 * base + down) / (ds * ds),
+        "vega": vega / 100.0,
+        "theta": theta / TRADING_DAYS,
+        "rho": (rate_up - base) / _RATE_BUMP / 100.0,
+        "vanna": (delta_vol_up - delta) / _VOL_BUMP,
+        "vomma": (vol_up - 2.0 * base + vol_down) / (_VOL_BUMP**2) / 100.0,
+        "charm": charm / TRADING_DAYS,
+    }
+
+
+def _bisect_volatility(
+    price_fn,
+    price,
+    spot,
+    strike,
+    t,
+    option_type,
+    r,
+    q,
+    full_output=False,
+    low=1e-4,
+    high=5.0,
+    tol=1e-8,
+    max_iter=60,
+):
+    """Solve implied volatility for any model by vectorized bisection.
+
+    Price is increasing in volatility, so each contract's [low, high]
+    bracket halves every iteration and all contracts are priced together.
+    """
+    price, spot, strike, t, r, q = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (price, spot, strike, t, r, q))
+    )
+    option_type = np.broadcast_to(np.asarray(option_type), price.shape)
+    status = np.full(price.shape, IV_NOT_CONVERGED, dtype=np.int8)
+    valid = (spot > 0) & (strike > 0) & (t > 0) & np.isfinite(price)
+    status[~valid] = IV_INVALID_INPUT
+
+    low = np.full(price.shape, low)
+    high = np.full(price.shape, high)
+    args = (spot, strike, t)
+    below = valid & (price <= price_fn(*args, low, option_type, r, q))
+    above = valid & (price >= price_fn(*args, high, option_type, r, q))
+    status[below] = IV_BELOW_INTRINSIC
+    status[above] = IV_ABOVE_MAX_PRICE
+
+    solving = valid & ~below & ~above
+    for _ in range(max_iter):
+        middle = 0.5 * (low + high)
+        too_high = price_fn(*args, middle, option_type, r, q) > price
+        high = np.where(too_high, middle, high)
+        low = np.where(too_high, low, middle)
+        if np.all(high - low <= tol):
+            break
+    status[solving] = IV_OK
+    iv = np.where(solving, 0.5 * (low + high), np.nan)
+    if full_output:
+        return iv, status
+    return iv
@@ -0,0 +1,114 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_PATHS = 20000
+CHUNK_SIZE = 5000  # Paths simulated at a time; bounds temporary memory
+PERCENTILES = (5, 25, 50, 75, 95)
+METHODS = ("gbm", "bootstrap")
+
+
+def log_returns(close):
+    """Daily log returns of a close series, skipping gaps."""
+    close = np.asarray(close, dtype=float)
+    returns = np.diff(np.log(close))
+    return returns[np.isfinite(returns)]
+
+
+def simulate(
+    close,
+    days,
+    paths=DEFAULT_PATHS,
+    method="gbm",
+    seed=None,
+    chunk_size=CHUNK_SIZE,
+):
+    """Simulate prices ``days`` trading days after the last close.
+
+    ``gbm`` draws geometric Brownian motion with the drift and volatility
+    of the history's daily log returns. Its increments between consecutive
+    requested days are sampled exactly, so no daily steps are needed.
+    ``bootstrap`` resamples historical daily log returns with replacement,
+    keeping their fat tails and skew. Paths are generated ``chunk_size``
+    at a time, so only the (paths, len(days)) result is held in full.
+    Returns that array; ``seed`` makes it reproducible.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown simulation method: {method}")
+    close = np.asarray(close, dtype=float)
+    days = np.asarray(days, dtype=np.int64)
+    if len(days) == 0 or days.min() < 1 or np.any(np.diff(days) <= 0):
+        raise ValueError("days must be increasing positive trading-day counts")
+    returns = log_returns(close)
+    if len(returns) < 2:
+        raise ValueError("Not enough history to simulate")
+
+    rng = np.random.default_rng(seed)
+    last_close = close[np.isfinite(close)][-1]
+    result = np.empty((paths, len(days)))
+
+    if method == "gbm":
+        steps = np.diff(days, prepend=0).astype(float)
+        mean, std = returns.mean(), returns.std()
+        for lo in range(0, paths, chunk_size):
+            hi = min(lo + chunk_size, paths)
+            increments = rng.normal(
+                mean * steps, std * np.sqrt(steps), (hi - lo, len(days))
+            )
+            result[lo:hi] = last_close * np.exp(np.cumsum(increments, axis=1))
+    else:
+        for lo in range(0, paths, chunk_size):
+            hi = min(lo + chunk_size, paths)
+            picks = rng.integers(0, len(returns), (hi - lo, days[-1]), dtype=np.int32)
+            draws = returns[picks]
+            np.cumsum(draws, axis=1, out=draws)
+            result[lo:hi] = last_close * np.exp(draws[:, days - 1])
+    return result
+
+
+def percentile_bands(close, days, percentiles=PERCENTILES, **kwargs):
+    """Return simulated price percentiles at each of ``days``.
+
+    Keyword arguments go to ``simulate``. Returns a dict with "days",
+    "percentiles" and "bands", an array shaped (percentiles, days).
+    """
+    prices = simulate(close, days, **kwargs)
+    return {
+        "days": np.asarray(days),
+        "percentiles": np.asarray(percentiles),
+        "bands": np.percentile(prices, percentiles, axis=0),
+    }
+
+
+def _bands_job(job):
+    ticker, close, days, percentiles, kwargs = job
+    try:
+        return ticker, percentile_bands(close, days, percentiles, **kwargs)
+    except ValueError:
+        return ticker, None
+
+
+def percentile_bands_many(
+    closes, days, percentiles=PERCENTILES, processes=None, seed=None, **kwargs
+):
+    """Run ``percentile_bands`` for every ticker -> close series in closes.
+
+    Each ticker gets its own generator spawned from ``seed``, so results
+    are the same whether or not ``processes`` > 1 spreads the tickers over
+    a process pool. Tickers with too little history map to None.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(closes))
+    jobs = [
+        (
+            ticker,
+            np.asarray(close, dtype=float),
+            days,
+            percentiles,
+            {**kwargs, "seed": s},
+        )
+        for (ticker, close), s in zip(closes.items(), seeds)
+    ]
+    if processes and processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as pool:
+            return dict(pool.map(_bands_job, jobs))
+    return dict(map(_bands_job, jobs))
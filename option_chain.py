@@ -0,0 +1,306 @@
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from calculations import OptionCalculator
+from trading_calendar import NSE
+
+CHAIN_COLUMNS = ["expiry", "strike", "option_type", "price", "spot"]
+
+
+def _parse_expiry(values):
+    """Parse YYYY-MM-DD or NSE-style DD-Mon-YYYY expiry dates."""
+    values = pd.Series(values, dtype=str)
+    parsed = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+    nse = pd.to_datetime(values, format="%d-%b-%Y", errors="coerce")
+    return parsed.fillna(nse)
+
+
+def _quote_price(record):
+    """Mid of a two-sided quote, else the last traded price."""
+    bid = record.get("bid", record.get("bidprice"))
+    ask = record.get("ask", record.get("askPrice"))
+    try:
+        bid, ask = float(bid), float(ask)
+        if bid > 0 and ask >= bid:
+            return 0.5 * (bid + ask)
+    except (TypeError, ValueError):
+        pass
+    return record.get("price", record.get("lastPrice"))
+
+
+class ChainSource:
+    """Source of option chain quotes used to fit a VolSurface.
+
+    Subclasses implement ``load`` and ``key``; ``surface`` fits once per
+    key and serves the cached fit until the source's data changes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cached = None  # ((key, model, curve), surface)
+
+    def load(self):
+        """Return quotes as a DataFrame with CHAIN_COLUMNS (expiry as datetime)."""
+        raise NotImplementedError
+
+    def key(self):
+        """Return a value that changes whenever the quotes do."""
+        raise NotImplementedError
+
+    def surface(self, calculator=None):
+        """Fit with the calculator's model and curve; refit when either changes."""
+        calculator = calculator or OptionCalculator()
+        key = (self.key(), calculator.model, calculator.curve)
+        with self.lock:
+            if self.cached is not None and self.cached[0] == key:
+                return self.cached[1]
+        surface = VolSurface.fit(self.load(), calculator)
+        with self.lock:
+            self.cached = (key, surface)
+        return surface
+
+
+class FileChainSource(ChainSource):
+    """Read a chain from a CSV or JSON file for offline use.
+
+    Accepts one quote per row (expiry, strike, option_type, and price or
+    bid/ask, plus spot unless ``spot`` is given) as CSV or a JSON list, or
+    the JSON of NSE's option-chain API, whose rows hold CE and PE quotes
+    per strike with the underlying value.
+    """
+
+    def __init__(self, path, spot=None):
+        super().__init__()
+        self.path = path
+        self.spot = spot
+
+    def key(self):
+        return self.path, os.stat(self.path).st_mtime_ns, self.spot
+
+    def load(self):
+        with open(self.path) as f:
+            text = f.read()
+        if text.lstrip()[:1] in ("[", "{"):
+            data = json.loads(text)
+            if isinstance(data, dict) and "records" in data:
+                records = self._nse_records(data)
+            else:
+                records = data
+        else:
+            records = pd.read_csv(self.path).to_dict("records")
+
+        chain = pd.DataFrame(
+            {
+                "expiry": _parse_expiry([r.get("expiry") for r in records]),
+                "strike": [r.get("strike") for r in records],
+                "option_type": [str(r.get("option_type", "")).upper() for r in records],
+                "price": [_quote_price(r) for r in records],
+                "spot": [
+                    r.get("spot") if self.spot is None else self.spot for r in records
+                ],
+            }
+        )
+        for column in ("strike", "price", "spot"):
+            chain[column] = pd.to_numeric(chain[column], errors="coerce")
+        chain["option_type"] = chain["option_type"].replace({"CE": "CALL", "PE": "PUT"})
+        dropped = chain.isna().any(axis=1)
+        if dropped.any():
+            logging.warning(f"Skipped {dropped.sum()} incomplete quotes in {self.path}")
+        return chain.loc[~dropped, CHAIN_COLUMNS].reset_index(drop=True)
+
+    @staticmethod
+    def _nse_records(data):
+        underlying = data["records"].get("underlyingValue")
+        records = []
+        for row in data["records"]["data"]:
+            for side, option_type in (("CE", "CALL"), ("PE", "PUT")):
+                quote = row.get(side)
+                if not quote:
+                    continue
+                records.append(
+                    {
+                        **quote,
+                        "expiry": row.get("expiryDate", quote.get("expiryDate")),
+                        "strike": row.get("strikePrice", quote.get("strikePrice")),
+                        "option_type": option_type,
+                        "spot": quote.get("underlyingValue", underlying),
+                    }
+                )
+        return records
+
+
+def solve_chain(chain, calculator=None):
+    """Add t, forward, log-moneyness k and implied volatility iv to a chain.
+
+    Quotes are solved with the calculator's pricing model at its curve's
+    rate and dividend yield for each expiry (a default OptionCalculator if
+    None), all in one implied_volatility_batch call; quotes that cannot be
+    solved get NaN.
+    """
+    calculator = calculator or OptionCalculator()
+    chain = chain.copy()
+    t = NSE.year_fraction(chain["expiry"].to_numpy(dtype="datetime64[D]"))
+    r, q = calculator.curve.rates(t)
+    chain["t"] = t
+    chain["forward"] = calculator.model.forward(chain["spot"].to_numpy(), t, r, q)
+    chain["k"] = np.log(chain["strike"] / chain["forward"])
+    chain["iv"] = calculator.implied_volatility_batch(
+        chain["price"].to_numpy(),
+        chain["spot"].to_numpy(),
+        chain["strike"].to_numpy(),
+        t,
+        chain["option_type"].to_numpy(),
+    )
+    return chain
+
+
+class VolSurface:
+    """Implied volatility by strike and time, fitted to an option chain.
+
+    Each expiry's smile is a vega-weighted quadratic in log-moneyness
+    k = ln(strike / forward) fitted to total variance iv^2 * t, using the
+    out-of-the-money side of each strike. The smiles are evaluated once on
+    a uniform k grid (flat outside the strikes each expiry quoted) and made
+    non-decreasing in t, so a lookup is an arithmetic grid index plus
+    linear interpolation in k and in total variance between expiries:
+    O(1) per contract, vectorized over arrays.
+    """
+
+    GRID_POINTS = 201
+    MIN_VARIANCE = 1e-8
+
+    def __init__(self, expiries, t, k_grid, variance, smiles, model, curve):
+        self.expiries = expiries
+        self.t = t
+        self.k_grid = k_grid
+        self.variance = variance  # (expiries, GRID_POINTS) total variance
+        self.smiles = smiles  # expiry -> solved quotes with fitted_iv
+        self.model = model  # Pricing model and curve the quotes were solved with
+        self.curve = curve
+
+    @classmethod
+    def fit(cls, chain, calculator=None):
+        """Solve implied volatilities for a chain and fit the surface."""
+        calculator = calculator or OptionCalculator()
+        chain = solve_chain(chain, calculator)
+        call = chain["option_type"].str.startswith("C")
+        otm = np.where(chain["k"] >= 0, call, ~call)
+        usable = chain[otm & (chain["t"] > 0) & np.isfinite(chain["iv"])]
+        if usable.empty:
+            raise ValueError("No solvable out-of-the-money quotes in the chain")
+
+        fits = []
+        for expiry, quotes in usable.groupby("expiry"):
+            k, t = quotes["k"].to_numpy(), quotes["t"].iat[0]
+            vega = calculator.greeks_batch(
+                quotes["spot"].to_numpy(),
+                quotes["strike"].to_numpy(),
+                t,
+                quotes["iv"].to_numpy(),
+                quotes["option_type"].to_numpy(),
+            )["vega"]
+            coefficients = np.polyfit(
+                k,
+                quotes["iv"].to_numpy() ** 2 * t,
+                min(2, len(np.unique(k)) - 1),
+                w=np.sqrt(np.maximum(vega, 1e-12)),
+            )
+            fits.append((expiry, t, coefficients, k.min(), k.max()))
+
+        k_lo = min(fit[3] for fit in fits)
+        k_hi = max(fit[4] for fit in fits)
+        if k_hi - k_lo < 1e-9:
+            # Every quote at one strike: each smile is flat, so any width will do
+            k_lo, k_hi = k_lo - 1.0, k_hi + 1.0
+        k_grid = np.linspace(k_lo, k_hi, cls.GRID_POINTS)
+        variance = np.array(
+            [
+                np.polyval(coefficients, np.clip(k_grid, k_lo, k_hi))
+                for _, _, coefficients, k_lo, k_hi in fits
+            ]
+        )
+        # Total variance may not fall with time (no calendar arbitrage)
+        variance = np.maximum.accumulate(np.maximum(variance, cls.MIN_VARIANCE), axis=0)
+
+        smiles = {}
+        for (expiry, t, coefficients, k_lo, k_hi), row in zip(fits, variance):
+            quotes = chain[chain["expiry"] == expiry].copy()
+            fitted = np.interp(quotes["k"], k_grid, row)
+            quotes["fitted_iv"] = np.sqrt(fitted / t)
+            smiles[expiry] = quotes
+
+        return cls(
+            np.array([fit[0] for fit in fits]),
+            np.array([fit[1] for fit in fits]),
+            k_grid,
+            variance,
+            smiles,
+            calculator.model,
+            calculator.curve,
+        )
+
+    def _grid_variance(self, k):
+        """Total variance of every expiry at log-moneyness k (expiries first)."""
+        last = len(self.k_grid) - 1
+        step = self.k_grid[1] - self.k_grid[0] if last else 1.0
+        # NaN moneyness (a zero or missing spot or strike) reads the first column
+        x = np.clip(np.nan_to_num((k - self.k_grid[0]) / step), 0.0, last)
+        i = np.minimum(x.astype(int), max(last - 1, 0))
+        frac = x - i
+        upper = self.variance[:, np.minimum(i + 1, last)]
+        return self.variance[:, i] * (1.0 - frac) + upper * frac
+
+    def volatility(self, spot, strike, time_to_expiration):
+        """Implied volatility for contracts; inputs broadcast as NumPy arrays.
+
+        Strikes are placed on the smile by moneyness against the forward
+        of ``spot``, under the model and curve the surface was fitted with. Times before the first expiry or after the last keep
+        that expiry's volatility.
+        """
+        spot, strike, t = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (spot, strike, time_to_expiration))
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.log(strike / self.model.forward(spot, t, *self.curve.rates(t)))
+        variance = self._grid_variance(k.ravel())  # (expiries, contracts)
+
+        t_flat = t.ravel()
+        j = np.clip(np.searchsorted(self.t, t_flat), 1, len(self.t) - 1)
+        columns = np.arange(len(t_flat))
+        if len(self.t) == 1:
+            vol = np.sqrt(variance[0] / self.t[0])
+        else:
+            t0, t1 = self.t[j - 1], self.t[j]
+            w0, w1 = variance[j - 1, columns], variance[j, columns]
+            weight = np.clip((t_flat - t0) / (t1 - t0), 0.0, 1.0)
+            interpolated = w0 + (w1 - w0) * weight
+            vol = np.sqrt(interpolated / np.clip(t_flat, t0, t1))
+        return vol.reshape(t.shape)
+
+    def summary(self):
+        """Per expiry: quotes, solved quotes, ATM vol and fit error (vol RMSE)."""
+        rows = []
+        for expiry, t, variance in zip(self.expiries, self.t, self.variance):
+            quotes = self.smiles[expiry]
+            solved = quotes[np.isfinite(quotes["iv"])]
+            error = solved["iv"] - solved["fitted_iv"]
+            rows.append(
+                {
+                    "expiry": f"{expiry:%Y-%m-%d}",
+                    "t": t,
+                    "quotes": len(quotes),
+                    "solved": len(solved),
+                    "atm_vol": float(
+                        np.sqrt(np.interp(0.0, self.k_grid, variance) / t)
+                    ),
+                    "rmse": (
+                        float(np.sqrt(np.mean(error**2))) if len(solved) else np.nan
+                    ),
+                }
+            )
+        return rows
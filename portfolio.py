@@ -0,0 +1,289 @@
+import numpy as np
+
+from calculations import TRADING_DAYS, OptionCalculator, is_call
+from trading_calendar import NSE
+from utils import calculate_time_to_expiration
+
+
+class Portfolio:
+    """A book of option legs stored as parallel column arrays.
+
+    Each leg has an underlying, option type, strike, time to expiration
+    (years; pass ``expiry`` as YYYY-MM-DD instead to have it computed), a
+    volatility, a signed quantity in lots (negative is short), a lot size
+    and the entry price paid per unit. Legs given by expiry keep it, and
+    refresh_times recomputes their times from the calendar. Legs get stable
+    ascending ids so an engine can match its cached valuations to them
+    after legs are added, changed or removed.
+    """
+
+    NUMERIC = ("strike", "t", "volatility", "quantity", "lot_size", "entry_price")
+    DEFAULTS = {
+        "underlying": "",
+        "option_type": "CALL",
+        "quantity": 1.0,
+        "lot_size": 1.0,
+        "entry_price": 0.0,
+    }
+
+    def __init__(self, legs=()):
+        self.next_id = 0
+        self.columns = {"id": np.empty(0, dtype=np.int64)}
+        self.columns.update({name: np.empty(0) for name in self.NUMERIC})
+        self.columns["underlying"] = np.empty(0, dtype=object)
+        self.columns["option_type"] = np.empty(0, dtype=object)
+        self.columns["expiry"] = np.empty(0, dtype="datetime64[D]")  # NaT: fixed t
+        self.add_legs(legs)
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def _normalize(self, leg):
+        leg = {**self.DEFAULTS, **leg}
+        if leg.get("t") in (None, ""):
+            raise ValueError("Each leg needs a 't' or 'expiry'")
+        for name in self.NUMERIC:
+            if leg.get(name) in (None, ""):
+                raise ValueError(f"Leg is missing '{name}'")
+            leg[name] = float(leg[name])
+        return leg
+
+    def add_legs(self, legs):
+        """Append legs (dicts of leg fields); returns their ids."""
+        legs = [dict(leg) for leg in legs]
+        # Legs without a t keep their expiry; an explicit t stays fixed
+        expiries = np.array(
+            [
+                (
+                    leg["expiry"]
+                    if leg.get("t") in (None, "")
+                    and leg.get("expiry") not in (None, "")
+                    else "NaT"
+                )
+                for leg in legs
+            ],
+            dtype="datetime64[D]",
+        )
+        dated = np.flatnonzero(~np.isnat(expiries))
+        if dated.size:
+            # Expiries of all new legs go through the calendar in one call
+            times = NSE.year_fraction(expiries[dated])
+            for i, t in zip(dated.tolist(), times.tolist()):
+                legs[i]["t"] = t
+        for leg, expiry in zip(legs, expiries):
+            leg["expiry"] = expiry
+        legs = [self._normalize(leg) for leg in legs]
+        ids = np.arange(self.next_id, self.next_id + len(legs), dtype=np.int64)
+        self.next_id += len(legs)
+        for name, values in self.columns.items():
+            new = ids if name == "id" else [leg[name] for leg in legs]
+            self.columns[name] = np.concatenate(
+                [values, np.asarray(new, dtype=values.dtype)]
+            )
+        return ids
+
+    def add_leg(self, **leg):
+        return int(self.add_legs([leg])[0])
+
+    def _positions(self, ids):
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        positions = np.searchsorted(self.columns["id"], ids)
+        found = positions < len(self)
+        found[found] = self.columns["id"][positions[found]] == ids[found]
+        if not found.all():
+            raise KeyError(f"Unknown leg ids: {ids[~found].tolist()}")
+        return positions
+
+    def update_leg(self, leg_id, **changes):
+        """Change fields of one leg in place; a new t replaces its expiry."""
+        position = self._positions(leg_id)[0]
+        for name, value in changes.items():
+            if name == "expiry":
+                self.columns["expiry"][position] = np.datetime64(value, "D")
+                name, value = "t", calculate_time_to_expiration(value)
+            elif name == "t":
+                self.columns["expiry"][position] = np.datetime64("NaT")
+            if name not in self.columns or name == "id":
+                raise KeyError(f"Unknown leg field: {name}")
+            self.columns[name][position] = (
+                float(value) if name in self.NUMERIC else value
+            )
+
+    def remove_legs(self, ids):
+        keep = np.ones(len(self), dtype=bool)
+        keep[self._positions(ids)] = False
+        for name in self.columns:
+            self.columns[name] = self.columns[name][keep]
+
+    def clear(self):
+        self.remove_legs(self.columns["id"])
+
+    def refresh_times(self, now=None):
+        """Recompute t of the legs given by expiry, as of now.
+
+        ``now`` is exchange local time and defaults to the current minute,
+        so an engine's cached valuations stay fresh for up to a minute.
+        """
+        dated = ~np.isnat(self.columns["expiry"])
+        if not dated.any():
+            return
+        if now is None:
+            now = NSE.now().astype("datetime64[m]")
+        self.columns["t"][dated] = NSE.year_fraction(self.columns["expiry"][dated], now)
+
+    def units(self):
+        """Units held per leg: quantity in lots times lot size."""
+        return self.columns["quantity"] * self.columns["lot_size"]
+
+    def records(self):
+        """Return the legs as a list of dicts."""
+        return [
+            {
+                name: values[i].item() if hasattr(values[i], "item") else values[i]
+                for name, values in self.columns.items()
+            }
+            for i in range(len(self))
+        ]
+
+
+class PortfolioEngine:
+    """Values a Portfolio with OptionCalculator, repricing only changed legs.
+
+    Per-unit price and Greeks are cached per leg id together with the
+    inputs they were computed from (spot, strike, time, volatility, type).
+    ``value`` reprices just the legs whose inputs differ: a spot move on one
+    underlying leaves every other underlying's legs cached, and quantity or
+    lot-size changes only reweight the cached values. Changing the
+    calculator's model or curve reprices every leg. Legs given by expiry
+    have their time to expiration refreshed on every valuation, so a long
+    session keeps decaying them (and repricing them once a minute).
+    """
+
+    def __init__(self, portfolio, calculator=None):
+        self.portfolio = portfolio
+        self.calculator = calculator or OptionCalculator()
+        self.cache_ids = np.empty(0, dtype=np.int64)
+        self.cache_inputs = np.empty((0, 5))
+        self.cache_results = {}
+        self.cache_version = self.calculator.version
+        self.stats = {"legs_priced": 0, "legs_reused": 0}
+
+    def _leg_spots(self, spot):
+        """Per-leg spot from a scalar or an underlying -> spot mapping."""
+        underlying = self.portfolio.columns["underlying"]
+        if not isinstance(spot, dict):
+            return np.full(len(underlying), float(spot))
+        missing = set(underlying) - set(spot)
+        if missing:
+            raise KeyError(f"No spot for underlyings: {sorted(missing)}")
+        return np.array([spot[u] for u in underlying], dtype=float)
+
+    def _inputs(self, spot, vol_shift):
+        columns = self.portfolio.columns
+        return np.column_stack(
+            [
+                self._leg_spots(spot),
+                columns["strike"],
+                columns["t"],
+                np.maximum(columns["volatility"] + vol_shift, 0.0),
+                is_call(columns["option_type"].astype(str)),
+            ]
+        )
+
+    def unit_greeks(self, spot, vol_shift=0.0):
+        """Return per-unit price and Greeks for every leg, in portfolio order."""
+        self.portfolio.refresh_times()
+        ids = self.portfolio.columns["id"]
+        inputs = self._inputs(spot, vol_shift)
+
+        positions = np.searchsorted(self.cache_ids, ids)
+        cached = positions < len(self.cache_ids)
+        if self.cache_version != self.calculator.version:
+            cached[:] = False  # Priced with another model or curve
+        cached[cached] = self.cache_ids[positions[cached]] == ids[cached]
+        stale = ~cached
+        stale[cached] = (self.cache_inputs[positions[cached]] != inputs[cached]).any(
+            axis=1
+        )
+
+        results = {
+            name: (
+                np.where(cached, values[np.where(cached, positions, 0)], np.nan)
+                if len(values)
+                else np.full(len(ids), np.nan)
+            )
+            for name, values in self.cache_results.items()
+        }
+        if stale.any() or not results:
+            fresh = self.calculator.greeks_batch(
+                inputs[stale, 0],
+                inputs[stale, 1],
+                inputs[stale, 2],
+                inputs[stale, 3],
+                inputs[stale, 4].astype(bool),
+            )
+            for name, values in fresh.items():
+                results.setdefault(name, np.full(len(ids), np.nan))[stale] = values
+
+        self.stats["legs_priced"] += int(stale.sum())
+        self.stats["legs_reused"] += int((~stale).sum())
+        self.cache_ids, self.cache_inputs = ids.copy(), inputs
+        self.cache_results = results
+        self.cache_version = self.calculator.version
+        return results
+
+    def value(self, spot, vol_shift=0.0):
+        """Value the portfolio at spot (scalar or underlying -> spot).
+
+        Returns a dict with "legs" (position price and Greeks per leg),
+        "total" (their sums plus "pnl" against entry prices) and
+        "by_underlying" (the same totals per underlying, the ones to hedge
+        with since deltas of different underlyings do not add up).
+        """
+        units = self.portfolio.units()
+        unit = self.unit_greeks(spot, vol_shift)
+        legs = {name: values * units for name, values in unit.items()}
+        legs["pnl"] = (unit["price"] - self.portfolio.columns["entry_price"]) * units
+
+        underlying = self.portfolio.columns["underlying"]
+        by_underlying = {
+            u: {
+                name: float(values[underlying == u].sum())
+                for name, values in legs.items()
+            }
+            for u in dict.fromkeys(underlying)
+        }
+        total = {name: float(values.sum()) for name, values in legs.items()}
+        return {"legs": legs, "total": total, "by_underlying": by_underlying}
+
+    def payoff(self, spots, underlying=None, days=None):
+        """P&L of the legs on one underlying across a range of its spot prices.
+
+        With ``days`` None the legs are valued at expiry (intrinsic value);
+        otherwise with the calculator's pricing model ``days`` trading days
+        forward. All legs and spots are evaluated in one broadcast call.
+        Returns an array aligned with ``spots``.
+        """
+        self.portfolio.refresh_times()
+        columns = self.portfolio.columns
+        mask = np.ones(len(self.portfolio), dtype=bool)
+        if underlying is not None:
+            mask = columns["underlying"] == underlying
+        spots = np.asarray(spots, dtype=float)[:, None]
+        strike = columns["strike"][mask]
+        call = is_call(columns["option_type"][mask].astype(str))
+
+        if days is None:
+            value = np.where(
+                call, np.maximum(spots - strike, 0.0), np.maximum(strike - spots, 0.0)
+            )
+        else:
+            value = self.calculator.price_batch(
+                spots,
+                strike,
+                np.maximum(columns["t"][mask] - days / TRADING_DAYS, 0.0),
+                columns["volatility"][mask],
+                call,
+            )
+        pnl = (value - columns["entry_price"][mask]) * self.portfolio.units()[mask]
+        return pnl.sum(axis=1)
@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+class PriceStore:
+    """Columnar on-disk OHLCV history, one memory-mapped .npy file per column.
+
+    Each ticker gets a directory holding ``index.<v>.npy`` (datetime64[ns] as
+    int64), one ``<column>.<v>.npy`` per price column and a ``meta.json`` that
+    names the current version ``v``. Writes produce a new version and switch
+    to it by atomically replacing ``meta.json``, so readers never see a
+    half-written series. Reads map only the requested columns and copy only
+    the rows in the requested date range.
+    """
+
+    def __init__(self, root_dir="/tmp/data_store"):
+        self.root_dir = root_dir
+        self.lock = threading.Lock()
+        self.maps = {}  # (ticker, version, column) -> read-only memmap
+        self.meta_cache = {}  # ticker -> (meta.json mtime_ns, parsed metadata)
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root_dir, quote(ticker, safe=""))
+
+    def _column_path(self, ticker, column, version):
+        return os.path.join(
+            self._ticker_dir(ticker), f"{quote(column, safe='')}.{version}.npy"
+        )
+
+    def metadata(self, ticker):
+        """Return the stored metadata for a ticker, or None if it has no history.
+
+        Parsed metadata is reused until meta.json's mtime changes, so writes
+        from another process are still picked up.
+        """
+        path = os.path.join(self._ticker_dir(ticker), "meta.json")
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            cached = self.meta_cache.get(ticker)
+            if cached is not None and cached[0] == mtime:
+                return dict(cached[1])
+            with open(path) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        meta["high_water_mark"] = pd.Timestamp(meta["high_water_mark"])
+        self.meta_cache[ticker] = (mtime, meta)
+        return dict(meta)
+
+    def __contains__(self, ticker):
+        return self.metadata(ticker) is not None
+
+    def _column(self, ticker, meta, column):
+        key = (ticker, meta["version"], column)
+        with self.lock:
+            array = self.maps.get(key)
+            if array is None:
+                array = np.load(
+                    self._column_path(ticker, column, meta["version"]), mmap_mode="r"
+                )
+                self.maps[key] = array
+        return array
+
+    def read(self, ticker, columns=None, start=None, end=None, tail=None):
+        """Read a ticker's history as a DataFrame, or None if it is not stored.
+
+        ``columns`` prunes the columns loaded, ``start``/``end`` select an
+        inclusive date range by binary search on the index, and ``tail``
+        keeps only the last rows of that range.
+
+        Reads take no lock: if a write drops the version this read started
+        on, meta.json is read again and the read retried once.
+        """
+        for attempt in range(2):
+            meta = self.metadata(ticker)
+            if meta is None:
+                return None
+            try:
+                return self._read(ticker, meta, columns, start, end, tail)
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                self.meta_cache.pop(ticker, None)
+
+    def _read(self, ticker, meta, columns, start, end, tail):
+        index = self._column(ticker, meta, "index")
+        lo, hi = 0, len(index)
+        if start is not None:
+            lo = int(np.searchsorted(index, pd.Timestamp(start).value, "left"))
+        if end is not None:
+            hi = int(np.searchsorted(index, pd.Timestamp(end).value, "right"))
+        if tail is not None:
+            lo = max(lo, hi - tail)
+
+        columns = meta["columns"] if columns is None else list(columns)
+        arrays = [self._column(ticker, meta, c)[lo:hi] for c in columns]
+        index = pd.DatetimeIndex(
+            np.array(index[lo:hi]).view("datetime64[ns]"), name=meta["index_name"]
+        )
+        if len({a.dtype for a in arrays}) == 1:
+            # One 2-D block is much cheaper for pandas to wrap than a dict
+            return pd.DataFrame(
+                np.vstack(arrays).T, index=index, columns=columns, copy=False
+            )
+        return pd.DataFrame(
+            {c: np.array(a) for c, a in zip(columns, arrays)}, index=index
+        )
+
+    def write(self, ticker, data, **extra):
+        """Replace a ticker's stored history; ``extra`` is saved in the metadata."""
+        ticker_dir = self._ticker_dir(ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+        old = self.metadata(ticker)
+        version = time.time_ns()
+
+        index = pd.DatetimeIndex(data.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        np.save(
+            self._column_path(ticker, "index", version),
+            index.values.astype("datetime64[ns]").view("int64"),
+        )
+        for column in data.columns:
+            np.save(
+                self._column_path(ticker, column, version),
+                np.ascontiguousarray(data[column].to_numpy()),
+            )
+
+        meta = {
+            "version": version,
+            "columns": [str(c) for c in data.columns],
+            "index_name": data.index.name,
+            "rows": len(data),
+            "high_water_mark": index[-1].isoformat(),
+            **extra,
+        }
+        tmp_path = os.path.join(ticker_dir, f"meta.json.{version}")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(ticker_dir, "meta.json"))
+
+        if old is not None:
+            self._drop_version(ticker, old)
+
+    def append(self, ticker, new, **extra):
+        """Replace stored rows from new's first date onwards with new's rows.
+
+        Returns the number of rows now stored.
+        """
+        meta = self.metadata(ticker)
+        if meta is None:
+            self.write(ticker, new, **extra)
+            return len(new)
+
+        index = self._column(ticker, meta, "index")
+        keep = int(np.searchsorted(index, pd.Timestamp(new.index[0]).value, "left"))
+        kept = self.read(ticker).iloc[:keep]
+        self.write(ticker, pd.concat([kept, new[kept.columns]]), **extra)
+        return keep + len(new)
+
+    def update_metadata(self, ticker, **extra):
+        """Merge extra fields into a ticker's metadata without rewriting columns."""
+        ticker_dir = self._ticker_dir(ticker)
+        with open(os.path.join(ticker_dir, "meta.json")) as f:
+            meta = json.load(f)
+        meta.update(extra)
+        tmp_path = os.path.join(ticker_dir, f"meta.json.{time.time_ns()}")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(ticker_dir, "meta.json"))
+
+    def _drop_version(self, ticker, meta):
+        for column in ["index"] + meta["columns"]:
+            with self.lock:
+                self.maps.pop((ticker, meta["version"], column), None)
+            try:
+                os.remove(self._column_path(ticker, column, meta["version"]))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Delete every stored series."""
+        with self.lock:
+            self.maps.clear()
+        self.meta_cache.clear()
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        logging.info(f"Cleared price store at {self.root_dir}")
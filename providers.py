@@ -0,0 +1,225 @@
+import logging
+import os
+import threading
+import time
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+class MarketDataProvider:
+    """Source of daily OHLCV bars used by DataFetcher.
+
+    Subclasses implement ``download``; everything above it (single-flight,
+    the price store, incremental refresh) is provider-agnostic.
+    """
+
+    def download(self, tickers, period=None, start=None):
+        """Return ticker -> OHLCV DataFrame (None when a ticker has no data).
+
+        Pass either ``period`` (e.g. "10y", "1d") or ``start`` ("YYYY-MM-DD",
+        inclusive). Frames have a DatetimeIndex named "Date" and the columns
+        Close, High, Low, Open and Volume.
+        """
+        raise NotImplementedError
+
+    def latest_close(self, ticker):
+        """Return the most recent close for ticker, or None."""
+        frame = self.download([ticker], period="1d").get(ticker)
+        if frame is None or frame.empty:
+            return None
+        return frame["Close"].iloc[-1]
+
+
+class YFinanceProvider(MarketDataProvider):
+    MAX_THREADS = 8
+
+    def download(self, tickers, period=None, start=None):
+        import yfinance as yf  # Imported lazily: yfinance is slow to import
+
+        data = yf.download(
+            list(tickers),
+            period=period,
+            start=start,
+            group_by="ticker",
+            threads=min(self.MAX_THREADS, len(tickers)),
+        )
+        frames = {}
+        for ticker in tickers:
+            frame = None
+            if data is not None and not data.empty:
+                if ticker in data.columns.get_level_values(0):
+                    frame = data[ticker].dropna(how="all")
+                    frame.columns.name = None
+            frames[ticker] = frame if frame is not None and not frame.empty else None
+        return frames
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serve recorded OHLCV bars from ``<root_dir>/<ticker>.csv``.
+
+    ``latency`` seconds are slept on every download call to mimic a network
+    round trip, and ``as_of`` hides bars after that date so a recording can
+    be replayed as if it were an earlier day. Use ``record`` to capture a
+    recording from another provider.
+    """
+
+    def __init__(self, root_dir, latency=0.0, as_of=None):
+        self.root_dir = root_dir
+        self.latency = latency
+        self.as_of = None if as_of is None else pd.Timestamp(as_of)
+        self.frames = {}  # ticker -> parsed recording
+
+    def _path(self, ticker):
+        return os.path.join(self.root_dir, f"{quote(ticker, safe='')}.csv")
+
+    def _load(self, ticker):
+        if ticker not in self.frames:
+            path = self._path(ticker)
+            if not os.path.exists(path):
+                logging.warning(f"No recording for ticker {ticker} in {self.root_dir}")
+                self.frames[ticker] = None
+            else:
+                self.frames[ticker] = pd.read_csv(
+                    path, index_col="Date", parse_dates=["Date"]
+                )
+        frame = self.frames[ticker]
+        if frame is not None and self.as_of is not None:
+            frame = frame.loc[frame.index <= self.as_of]
+        return frame
+
+    def _period_start(self, end, period):
+        for suffix in ("mo", "d", "y"):
+            if period.endswith(suffix):
+                count = int(period[: -len(suffix)])
+                if suffix == "d":
+                    return end - pd.Timedelta(days=count - 1)
+                if suffix == "mo":
+                    return end - pd.DateOffset(months=count)
+                return end - pd.DateOffset(years=count)
+        raise ValueError(f"Unsupported period: {period}")
+
+    def download(self, tickers, period=None, start=None):
+        if self.latency:
+            time.sleep(self.latency)
+
+        frames = {}
+        for ticker in tickers:
+            frame = self._load(ticker)
+            if frame is not None and not frame.empty:
+                if start is not None:
+                    frame = frame.loc[frame.index >= pd.Timestamp(start)]
+                elif period is not None:
+                    begin = self._period_start(frame.index[-1].normalize(), period)
+                    frame = frame.loc[frame.index >= begin]
+            frames[ticker] = (
+                frame.copy() if frame is not None and not frame.empty else None
+            )
+        return frames
+
+    @staticmethod
+    def record(source, tickers, root_dir, period="10y"):
+        """Download tickers from source and save them as a replayable recording."""
+        os.makedirs(root_dir, exist_ok=True)
+        recorded = []
+        for ticker, frame in source.download(list(tickers), period=period).items():
+            if frame is None:
+                logging.warning(f"Nothing to record for ticker {ticker}")
+                continue
+            frame.to_csv(
+                os.path.join(root_dir, f"{quote(ticker, safe='')}.csv"),
+                index_label="Date",
+            )
+            recorded.append(ticker)
+        return recorded
+
+
+class TickSource:
+    """Stream of intraday prices for ``DataFetcher.start_stream``.
+
+    ``start`` calls ``on_tick(ticker, timestamp, price, volume)`` from a
+    background thread until ``stop`` is called. Sources only report
+    prices; aggregating them into candles is the fetcher's job.
+    """
+
+    def __init__(self):
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def start(self, tickers, on_tick):
+        self.stop()
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(list(tickers), on_tick),
+            name=type(self).__name__,
+            daemon=True,
+        )
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def _run(self, tickers, on_tick):
+        raise NotImplementedError
+
+
+class PollingTickSource(TickSource):
+    """Poll a provider's latest daily bar every ``interval`` seconds.
+
+    Each poll reports the bar's close as one tick with no volume, which is
+    as fine-grained as providers without an intraday feed get.
+    """
+
+    def __init__(self, provider, interval=15.0):
+        super().__init__()
+        self.provider = provider
+        self.interval = interval
+
+    def _run(self, tickers, on_tick):
+        while not self.stopped.is_set():
+            try:
+                frames = self.provider.download(tickers, period="1d")
+            except Exception as e:
+                logging.error(f"Error polling quotes for {tickers}: {e}")
+                frames = {}
+            for ticker, frame in frames.items():
+                if frame is not None and not frame.empty:
+                    on_tick(ticker, frame.index[-1], frame["Close"].iloc[-1], 0.0)
+            self.stopped.wait(self.interval)
+
+
+class SimulatedTickSource(TickSource):
+    """Random-walk ticks around a reference price, for testing streaming offline.
+
+    ``reference(ticker)`` returns the price a ticker's walk starts from
+    (typically its last stored close); tickers without one are skipped
+    until it becomes available. ``rate`` is ticks per second across all
+    tickers and ``step`` the standard deviation of each tick's return.
+    """
+
+    def __init__(self, reference, rate=20.0, step=0.0005, seed=None):
+        super().__init__()
+        self.reference = reference
+        self.rate = rate
+        self.step = step
+        self.rng = np.random.default_rng(seed)
+
+    def _run(self, tickers, on_tick):
+        prices = {}
+        while not self.stopped.is_set():
+            ticker = tickers[self.rng.integers(len(tickers))]
+            price = prices.get(ticker)
+            if price is None:
+                price = self.reference(ticker)
+            if price is not None:
+                price *= 1.0 + self.rng.normal(0.0, self.step)
+                prices[ticker] = price
+                on_tick(
+                    ticker, pd.Timestamp.now(), price, float(self.rng.integers(1, 100))
+                )
+            self.stopped.wait(1.0 / self.rate)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from calculations import RISK_FREE_RATE
+
+
+class TermStructure:
+    """Risk-free rate and dividend (carry) yield by time to expiration.
+
+    Both are continuously compounded zero rates given at ``tenors``
+    (years) and interpolated linearly in rate * time, i.e. in log discount
+    factor, with flat rates outside the tenors. ``rates`` interpolates
+    every contract of a batch with one vectorized np.interp call per curve.
+    """
+
+    def __init__(self, tenors=(1.0,), rates=(RISK_FREE_RATE,), dividend_yields=None):
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.zero_rates = np.asarray(rates, dtype=float)
+        if dividend_yields is None:
+            dividend_yields = np.zeros(len(self.tenors))
+        self.dividend_yields = np.broadcast_to(
+            np.asarray(dividend_yields, dtype=float), self.tenors.shape
+        )
+        if self.tenors[0] <= 0 or np.any(np.diff(self.tenors) <= 0):
+            raise ValueError("Tenors must be positive and increasing")
+
+    @classmethod
+    def flat(cls, rate=RISK_FREE_RATE, dividend_yield=0.0):
+        return cls((1.0,), (rate,), (dividend_yield,))
+
+    @classmethod
+    def parse(cls, text, dividend_yield=0.0):
+        """Build a curve from "TENOR:RATE,..." text, e.g. "0.25:0.068,1:0.07"."""
+        points = [item.split(":") for item in text.replace(" ", "").split(",") if item]
+        tenors, rates = zip(*((float(t), float(r)) for t, r in points))
+        return cls(tenors, rates, dividend_yield)
+
+    def _interpolate(self, zero_rates, t):
+        t_clipped = np.clip(t, self.tenors[0], self.tenors[-1])
+        log_discount = np.interp(t_clipped, self.tenors, zero_rates * self.tenors)
+        return log_discount / t_clipped
+
+    def rates(self, time_to_expiration):
+        """Return (rate, dividend yield) arrays shaped like time_to_expiration."""
+        t = np.asarray(time_to_expiration, dtype=float)
+        if len(self.tenors) == 1:
+            # Flat curve: nothing to interpolate
+            return (
+                np.full(t.shape, self.zero_rates[0]),
+                np.full(t.shape, self.dividend_yields[0]),
+            )
+        return (
+            self._interpolate(self.zero_rates, t),
+            self._interpolate(self.dividend_yields, t),
+        )
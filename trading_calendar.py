@@ -0,0 +1,275 @@
+import datetime as dt
+import logging
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+# NSE trading holidays (weekdays only), from the exchange's yearly circulars.
+# Add each new year's list when NSE publishes it and extend NSE_HOLIDAY_YEARS;
+# periods reaching outside those years fall back to nominal trading days.
+NSE_HOLIDAY_YEARS = (2020, 2026)
+NSE_HOLIDAYS = (
+    # 2020
+    "2020-02-21",
+    "2020-03-10",
+    "2020-04-02",
+    "2020-04-06",
+    "2020-04-10",
+    "2020-04-14",
+    "2020-05-01",
+    "2020-05-25",
+    "2020-10-02",
+    "2020-11-16",
+    "2020-11-30",
+    "2020-12-25",
+    # 2021
+    "2021-01-26",
+    "2021-03-11",
+    "2021-03-29",
+    "2021-04-02",
+    "2021-04-14",
+    "2021-04-21",
+    "2021-05-13",
+    "2021-07-21",
+    "2021-08-19",
+    "2021-09-10",
+    "2021-10-15",
+    "2021-11-04",
+    "2021-11-05",
+    "2021-11-19",
+    # 2022
+    "2022-01-26",
+    "2022-03-01",
+    "2022-03-18",
+    "2022-04-14",
+    "2022-04-15",
+    "2022-05-03",
+    "2022-08-09",
+    "2022-08-15",
+    "2022-08-31",
+    "2022-10-05",
+    "2022-10-24",
+    "2022-10-26",
+    "2022-11-08",
+    # 2023
+    "2023-01-26",
+    "2023-03-07",
+    "2023-03-30",
+    "2023-04-04",
+    "2023-04-07",
+    "2023-04-14",
+    "2023-05-01",
+    "2023-06-29",
+    "2023-08-15",
+    "2023-09-19",
+    "2023-10-02",
+    "2023-10-24",
+    "2023-11-14",
+    "2023-11-27",
+    "2023-12-25",
+    # 2024
+    "2024-01-22",
+    "2024-01-26",
+    "2024-03-08",
+    "2024-03-25",
+    "2024-03-29",
+    "2024-04-11",
+    "2024-04-17",
+    "2024-05-01",
+    "2024-05-20",
+    "2024-06-17",
+    "2024-07-17",
+    "2024-08-15",
+    "2024-10-02",
+    "2024-11-01",
+    "2024-11-15",
+    "2024-11-20",
+    "2024-12-25",
+    # 2025
+    "2025-02-26",
+    "2025-03-14",
+    "2025-03-31",
+    "2025-04-10",
+    "2025-04-14",
+    "2025-04-18",
+    "2025-05-01",
+    "2025-08-15",
+    "2025-08-27",
+    "2025-10-02",
+    "2025-10-21",
+    "2025-10-22",
+    "2025-11-05",
+    "2025-12-25",
+    # 2026
+    "2026-01-26",
+    "2026-03-03",
+    "2026-03-26",
+    "2026-03-31",
+    "2026-04-03",
+    "2026-04-14",
+    "2026-05-01",
+    "2026-05-28",
+    "2026-06-26",
+    "2026-09-14",
+    "2026-10-02",
+    "2026-10-20",
+    "2026-11-10",
+    "2026-11-24",
+    "2026-12-25",
+)
+
+
+def _seconds(time):
+    return time.hour * 3600 + time.minute * 60 + time.second
+
+
+class TradingCalendar:
+    """Trading days and session hours of one exchange.
+
+    Whether each day from FIRST_DAY to LAST_DAY is a trading day (a weekday
+    that is not in ``holidays``) is worked out once, together with a
+    running count of trading days. Counting the sessions between two
+    dates is then two array lookups however far apart they are, and every
+    method takes whole arrays of dates at once. ``years`` is the (first,
+    last) year the holiday list covers; None means every year is.
+    """
+
+    FIRST_DAY = np.datetime64("1990-01-01")
+    LAST_DAY = np.datetime64("2060-12-31")
+    TRADING_DAYS_PER_YEAR = 252
+
+    def __init__(
+        self,
+        name,
+        holidays=(),
+        open_time="09:15",
+        close_time="15:30",
+        timezone="Asia/Kolkata",
+        years=None,
+    ):
+        self.name = name
+        self.years = years
+        self.warned_years = set()
+        self.holidays = np.array(sorted(holidays), dtype="datetime64[D]")
+        self.open_time = dt.time.fromisoformat(open_time)
+        self.close_time = dt.time.fromisoformat(close_time)
+        self.timezone = ZoneInfo(timezone)
+
+        days = np.arange(self.FIRST_DAY, self.LAST_DAY + 1)
+        self.trading = np.is_busday(days, holidays=self.holidays)
+        # sessions[i] is the number of trading days before FIRST_DAY + i
+        self.sessions = np.concatenate(([0], np.cumsum(self.trading)))
+        self.trading_positions = np.flatnonzero(self.trading)
+
+    def _index(self, dates):
+        """Day numbers from FIRST_DAY; parses YYYY-MM-DD strings without strptime."""
+        index = (np.asarray(dates, dtype="datetime64[D]") - self.FIRST_DAY).astype(
+            np.int64
+        )
+        if np.any((index < 0) | (index >= len(self.trading))):
+            raise ValueError(
+                f"Dates must fall between {self.FIRST_DAY} and {self.LAST_DAY}"
+            )
+        return index
+
+    def is_trading_day(self, dates):
+        return self.trading[self._index(dates)]
+
+    def covers(self, dates):
+        """Whether the holiday list covers each date's year."""
+        if self.years is None:
+            return np.ones(np.shape(dates), dtype=bool)
+        years = np.asarray(dates, dtype="datetime64[Y]").astype(np.int64) + 1970
+        return (years >= self.years[0]) & (years <= self.years[1])
+
+    def trading_days(self, start, end):
+        """Trading days after ``start`` up to and including ``end``.
+
+        Negative when ``end`` is before ``start``.
+        """
+        return (
+            self.sessions[self._index(end) + 1] - self.sessions[self._index(start) + 1]
+        )
+
+    def roll_back(self, dates):
+        """Each date, or the trading day before it if the exchange is closed.
+
+        This is the NSE rule for an expiry that falls on a holiday.
+        """
+        last_session = self.sessions[self._index(dates) + 1] - 1
+        return self.FIRST_DAY + self.trading_positions[np.maximum(last_session, 0)]
+
+    def period_days(self, date, months):
+        """Trading days from ``date`` to the same day ``months`` months later.
+
+        ``months`` may be an array; the day is clipped to the end of shorter
+        months, so one month from 31 January is the last day of February.
+        A period reaching outside the years the holiday list covers gets
+        the nominal TRADING_DAYS_PER_YEAR / 12 days a month instead, with a
+        warning the first time each year comes up.
+        """
+        day = np.datetime64(date, "D")
+        month = day.astype("datetime64[M]")
+        months = np.asarray(months)
+        target = month + months
+        end = np.minimum(
+            target.astype("datetime64[D]") + (day - month.astype("datetime64[D]")),
+            (target + 1).astype("datetime64[D]") - 1,
+        )
+        days = self.trading_days(day, end)
+        covered = self.covers(day) & self.covers(end)
+        if np.all(covered):
+            return days
+        outside = np.append(end, day)[~self.covers(np.append(end, day))]
+        years = set((outside.astype("datetime64[Y]").astype(np.int64) + 1970).tolist())
+        for year in sorted(years - self.warned_years):
+            logging.warning(
+                f"No {self.name} holiday list for {year}; "
+                "using nominal trading days per period"
+            )
+        self.warned_years |= years
+        nominal = np.rint(months * self.TRADING_DAYS_PER_YEAR / 12).astype(np.int64)
+        return np.where(covered, days, nominal)
+
+    def now(self):
+        """The exchange's local time, to the second."""
+        return np.datetime64(dt.datetime.now(self.timezone).replace(tzinfo=None), "s")
+
+    def year_fraction(self, expiries, now=None):
+        """Years of trading left until each expiry's close, vectorized.
+
+        ``expiries`` are dates (YYYY-MM-DD strings or datetime64); one that
+        falls on a holiday expires on the trading day before, at
+        close_time. Every whole session left counts 1/TRADING_DAYS_PER_YEAR
+        and today counts the share of its session still to run: all of it
+        before the open and none after the close. So a contract expiring
+        today is worth a fraction of a day until the close and 0 after it,
+        and expired contracts get 0. ``now`` is exchange local time and
+        defaults to the current time. Years the holiday list does not cover
+        count every weekday as a session.
+        """
+        now = self.now() if now is None else np.datetime64(now, "s")
+        today = now.astype("datetime64[D]")
+        elapsed = (now - today).astype(np.int64)  # seconds since midnight
+        open_seconds = _seconds(self.open_time)
+        close_seconds = _seconds(self.close_time)
+
+        session_left = np.clip(
+            (close_seconds - elapsed) / (close_seconds - open_seconds), 0.0, 1.0
+        )
+        today_left = session_left if self.is_trading_day(today) else 0.0
+        sessions = self.trading_days(today, self.roll_back(expiries)) + today_left
+        return np.maximum(sessions, 0.0) / self.TRADING_DAYS_PER_YEAR
+
+
+NSE = TradingCalendar("NSE", NSE_HOLIDAYS, years=NSE_HOLIDAY_YEARS)
+# Commodity futures (the MCX group tracks CL=F, GC=F, SI=F) and other
+# tickers off NSE are only assumed closed at weekends
+WEEKDAYS = TradingCalendar("Weekdays")
+
+
+def calendar_for(ticker):
+    """The calendar a ticker trades on: NSE for Indian indices and shares."""
+    if ticker.startswith(("^NSE", "^BSE", "^CNX")) or ticker.endswith((".NS", ".BO")):
+        return NSE
+    return WEEKDAYS
@@ -1,25 +1,62 @@
 import json
 import os
+import time
 import tkinter as tk
-from tkinter import simpledialog, ttk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import filedialog, simpledialog, ttk
 
-import matplotlib.pyplot as plt
-import mplfinance as mpf
+import numpy as np
 import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-from calculations import OptionCalculator
+from matplotlib.figure import Figure
+
+from calculations import (
+    IV_OK,
+    IV_STATUS_MESSAGES,
+    TRADING_DAYS,
+    OptionCalculator,
+    format_greeks,
+)
+from chart import CandlestickChart
+from dashboard import chart_frame, load_snapshot, render_grid
 from data_fetch import DataFetcher
-from utils import toggle_inputs, validate_inputs
+from indicators import IndicatorEngine
+from metrics import METRICS
+from models import MODEL_LABELS
+from montecarlo import percentile_bands
+from option_chain import FileChainSource
+from portfolio import Portfolio, PortfolioEngine
+from providers import PollingTickSource
+from rates import TermStructure
+from utils import calculate_time_to_expiration, toggle_inputs, validate_inputs
+from watchlist import MARKET_GROUPS, all_tickers
+
+
+class TimedCanvas(FigureCanvasTkAgg):
+    """FigureCanvasTkAgg recording every full redraw as "canvas_draw"."""
+
+    def draw(self):
+        with METRICS.timer("canvas_draw"):
+            super().draw()
 
 
 class OptionCalculatorTab:
     TMP_FILE = "/tmp/optical.inputs"
 
+    SCENARIO_SPOTS = 101
+    SCENARIO_VOL_SHIFTS = 41
+
     def __init__(self, parent):
         self.calculator = OptionCalculator()
+        self.scenario_canvas = None
+        self.scenario_result = None
+        self.portfolio = Portfolio()
+        self.portfolio_engine = PortfolioEngine(self.portfolio, self.calculator)
+        self.payoff_canvas = None
+        self.chain_source = None
         self.parent = parent
         self.option_type_var = tk.StringVar()
+        self.model_var = tk.StringVar(value=MODEL_LABELS["bsm"])
         self.calculation_mode = tk.StringVar(value="volatility")
         self.create_tab()
 
@@ -30,6 +67,7 @@ class OptionCalculatorTab:
 
         input_frame = self.create_input_frame(self.frame)
         calc_settings_frame = self.create_calc_settings_frame(self.frame)
+        strategy_frame = self.create_strategy_frame(self.frame)
         action_frame = self.create_action_frame(self.frame)
 
     def create_input_frame(self, parent):
@@ -62,11 +100,63 @@ class OptionCalculatorTab:
 
         self.create_radio_button(frame, "Calculate Implied Volatility", 4, "volatility")
         self.create_radio_button(frame, "Calculate Option Price", 5, "price")
+        self.create_radio_button(frame, "Calculate Greeks", 6, "greeks")
+
+        self.create_label_entry(frame, "Option Price:", 7, "price_entry")
+        self.create_label_entry(
+            frame, "Implied Volatility:", 8, "volatility_entry", state="disabled"
+        )
+
+        self.create_label_entry(
+            frame, "Scenario Spot Range (±%):", 9, "spot_range_entry"
+        )
+        self.create_label_entry(frame, "Scenario Vol Shift (±):", 10, "vol_shift_entry")
+        self.create_label_entry(frame, "Scenario Trading Days:", 11, "days_entry")
+        self.spot_range_entry.insert(0, "10")
+        self.vol_shift_entry.insert(0, "0.05")
+        self.days_entry.insert(0, "30")
+
+        ttk.Label(frame, text="Pricing Model:").grid(
+            row=12, column=0, sticky="w", padx=10, pady=10
+        )
+        ttk.Combobox(
+            frame,
+            textvariable=self.model_var,
+            state="readonly",
+            values=list(MODEL_LABELS.values()),
+        ).grid(row=12, column=1, padx=10, pady=10)
+        self.create_label_entry(frame, "Dividend Yield:", 13, "dividend_yield_entry")
+        self.dividend_yield_entry.insert(0, "0")
+
+        return frame
+
+    def create_strategy_frame(self, parent):
+        """Creates the frame for building and valuing multi-leg strategies."""
+        frame = ttk.LabelFrame(parent, text="Strategy")
+        frame.grid(row=6, column=0, columnspan=2, sticky="ew", padx=10, pady=10)
 
-        self.create_label_entry(frame, "Option Price:", 6, "price_entry")
         self.create_label_entry(
-            frame, "Implied Volatility:", 7, "volatility_entry", state="disabled"
+            frame, "Quantity (lots, - for short):", 0, "quantity_entry"
         )
+        self.create_label_entry(frame, "Lot Size:", 1, "lot_size_entry")
+        self.quantity_entry.insert(0, "1")
+        self.lot_size_entry.insert(0, "1")
+
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=2, column=0, columnspan=2)
+        for column, (text, command) in enumerate(
+            [
+                ("Add Leg", self.add_leg),
+                ("Value Strategy", self.value_strategy),
+                ("Clear Legs", self.clear_legs),
+            ]
+        ):
+            ttk.Button(buttons, text=text, command=command, width=12).grid(
+                row=0, column=column, padx=5, pady=5
+            )
+
+        self.legs_label = ttk.Label(frame, text="No legs")
+        self.legs_label.grid(row=3, column=0, columnspan=2, pady=5)
 
         return frame
 
@@ -80,10 +170,13 @@ class OptionCalculatorTab:
         ).grid(row=8, column=0, columnspan=2, pady=10)
         ttk.Button(
             frame,
-            text="Multiple Spot Prices",
-            command=self.calculate_for_multiple_spots,
+            text="Scenario Grid",
+            command=self.calculate_scenarios,
             width=15,
         ).grid(row=9, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="Load Chain", command=self.load_chain, width=15).grid(
+            row=10, column=0, columnspan=2, pady=10
+        )
 
         self.result_label = ttk.Label(frame, text="")
         self.result_label.grid(row=13, column=0, columnspan=2, pady=10)
@@ -112,7 +205,37 @@ class OptionCalculatorTab:
     def toggle_inputs(self):
         toggle_inputs(self.calculation_mode, self.price_entry, self.volatility_entry)
 
+    def apply_model_settings(self):
+        """Point the calculator at the selected model and dividend yield.
+
+        The strategy engine shares the calculator, so legs are valued with
+        the same model. Returns False if the dividend yield is invalid.
+        """
+        try:
+            dividend_yield = float(self.dividend_yield_entry.get() or 0)
+        except ValueError:
+            tk.messagebox.showerror(
+                "Invalid Input", "Please enter a valid dividend yield."
+            )
+            return False
+        names = {text: name for name, text in MODEL_LABELS.items()}
+        self.calculator.set_model(names.get(self.model_var.get(), "bsm"))
+        if self.calculator.curve.dividend_yields[0] != dividend_yield:
+            self.calculator.set_curve(
+                TermStructure.flat(self.calculator.r, dividend_yield)
+            )
+        if self.calculator.surface is not None:
+            # Refit the chain under the new model or curve (cached otherwise)
+            try:
+                self.calculator.surface = self.chain_source.surface(self.calculator)
+            except (OSError, KeyError, ValueError) as e:
+                self.result_label.config(text=f"Error: {e}")
+                return False
+        return True
+
     def calculate_option(self):
+        if not self.apply_model_settings():
+            return
         inputs = validate_inputs(
             self.spot_entry,
             self.strike_entry,
@@ -120,9 +243,18 @@ class OptionCalculatorTab:
             self.price_entry,
             self.volatility_entry,
             self.calculation_mode,
+            optional_volatility=self.calculator.surface is not None,
         )
         if inputs:
             spot, strike, expiry_date, price, volatility = inputs
+            surface_note = ""
+            if volatility is None and self.calculation_mode.get() != "volatility":
+                volatility = float(
+                    self.calculator.surface_volatility(
+                        spot, strike, calculate_time_to_expiration(expiry_date)
+                    )
+                )
+                surface_note = f"\nSurface vol:\t{volatility:.4f}"
             result = self.calculator.calculate(
                 spot,
                 strike,
@@ -133,14 +265,47 @@ class OptionCalculatorTab:
                 volatility,
             )
 
-            if self.calculation_mode.get() != "volatility":
+            if self.calculation_mode.get() == "price":
                 result += f"\t{(float(result)*100.0/spot):.2f}%"
 
-            self.result_label.config(text=result)
+            self.result_label.config(text=result + surface_note)
             self.save_input_data()
 
-    def calculate_for_multiple_spots(self):
-        """Calculates the option price for multiple spot prices dynamically."""
+    def load_chain(self):
+        """Fit a volatility surface to an option chain file.
+
+        While a surface is loaded, a blank Implied Volatility entry prices
+        the contract at the surface's volatility for its strike and expiry.
+        """
+        path = filedialog.askopenfilename(
+            title="Open Option Chain",
+            filetypes=[("Option chains", "*.csv *.json"), ("All files", "*")],
+        )
+        if not path:
+            return
+        if self.chain_source is None or self.chain_source.path != path:
+            self.chain_source = FileChainSource(path)
+        try:
+            surface = self.chain_source.surface(self.calculator)
+        except (OSError, KeyError, ValueError) as e:
+            self.result_label.config(text=f"Error: {e}")
+            return
+
+        self.calculator.surface = surface
+        lines = ["Expiry\t\tATM vol\tRMSE"]
+        for row in surface.summary():
+            lines.append(f"{row['expiry']}\t{row['atm_vol']:.4f}\t{row['rmse']:.4f}")
+        self.result_label.config(text="\n".join(lines))
+
+    def _contract_inputs(self):
+        """Return (spot, strike, t, volatility, price) from the inputs, or None.
+
+        In IV mode the volatility is solved from the entered price; in the
+        other modes price is None, and a blank volatility is read from the
+        loaded option chain's surface. Errors are shown in the result label.
+        """
+        if not self.apply_model_settings():
+            return None
         inputs = validate_inputs(
             self.spot_entry,
             self.strike_entry,
@@ -148,35 +313,228 @@ class OptionCalculatorTab:
             self.price_entry,
             self.volatility_entry,
             self.calculation_mode,
+            optional_volatility=self.calculator.surface is not None,
         )
-        if inputs:
-            spot, strike, expiry_date, price, volatility = inputs
-            option_type = self.option_type_var.get()
-
-            # Generate multiple spot prices dynamically
-            spot_prices = self.generate_dynamic_spot_prices(spot)
-            results = []
-
-            # Recalculate volatility if needed
-            if self.calculation_mode.get() == "volatility":
-                volatility = self.calculator.calculate(
-                    spot,
-                    strike,
-                    expiry_date,
-                    option_type,
-                    "volatility",
-                    price,
-                    volatility,
+        if not inputs:
+            return None
+        spot, strike, expiry_date, price, volatility = inputs
+        t = calculate_time_to_expiration(expiry_date)
+        if volatility is None and self.calculation_mode.get() != "volatility":
+            volatility = float(self.calculator.surface_volatility(spot, strike, t))
+
+        if self.calculation_mode.get() == "volatility":
+            volatility, status = self.calculator.implied_volatility_batch(
+                price, spot, strike, t, self.option_type_var.get(), full_output=True
+            )
+            if status != IV_OK:
+                self.result_label.config(
+                    text=f"Error: {IV_STATUS_MESSAGES[int(status)]}"
                 )
+                return None
+            volatility = float(volatility)
+        return spot, strike, t, volatility, price
+
+    def calculate_scenarios(self):
+        """Price the option over a spot x vol shift x days-forward grid.
+
+        The result label shows prices at five round spots and three vol
+        levels today; the heatmap shows P&L over the whole grid, with a
+        slider for trading days forward.
+        """
+        try:
+            spot_range = float(self.spot_range_entry.get()) / 100.0
+            vol_shift = float(self.vol_shift_entry.get())
+            max_days = int(self.days_entry.get())
+        except ValueError:
+            tk.messagebox.showerror(
+                "Invalid Input", "Please enter valid scenario ranges."
+            )
+            return
+        inputs = self._contract_inputs()
+        if inputs is None:
+            return
+        spot, strike, t, volatility, price = inputs
+        option_type = self.option_type_var.get()
+
+        max_days = int(np.clip(max_days, 0, max(t * TRADING_DAYS, 0)))
+        grid = self.calculator.scenario_grid(
+            spot,
+            strike,
+            t,
+            volatility,
+            option_type,
+            spots=np.linspace(
+                spot * (1 - spot_range), spot * (1 + spot_range), self.SCENARIO_SPOTS
+            ),
+            vol_shifts=np.linspace(-vol_shift, vol_shift, self.SCENARIO_VOL_SHIFTS),
+            days=np.arange(max_days + 1),
+            entry_price=price,
+        )
 
-            # Calculate option price for each spot
-            for s in spot_prices:
-                result = self.calculator.calculate(
-                    s, strike, expiry_date, option_type, "price", price, volatility
-                )
-                results.append(f"{s}\t: {result}")
+        spot_prices = self.generate_dynamic_spot_prices(spot)
+        table = self.calculator.scenario_grid(
+            spot,
+            strike,
+            t,
+            volatility,
+            option_type,
+            spots=spot_prices,
+            vol_shifts=[-vol_shift, 0.0, vol_shift],
+        )["price"][0]
+        results = [
+            f"Spot\t: σ {volatility - vol_shift:.2f} / {volatility:.2f}"
+            f" / {volatility + vol_shift:.2f}"
+        ]
+        for i, s in enumerate(spot_prices):
+            results.append(f"{s}\t: " + " / ".join(f"{p:.2f}" for p in table[:, i]))
+        self.result_label.config(text="\n".join(results))
+
+        self.plot_scenarios(grid)
+
+    def plot_scenarios(self, grid):
+        """Show a scenario grid's P&L as a heatmap, reusing one Figure."""
+        self.scenario_result = grid
+        if self.scenario_canvas is None:
+            figure = Figure(figsize=(6, 4.5))
+            self.scenario_ax = figure.add_subplot(1, 1, 1)
+            self.scenario_canvas = FigureCanvasTkAgg(figure, master=self.frame)
+            self.scenario_canvas.get_tk_widget().grid(
+                row=0, column=2, rowspan=9, padx=10, pady=10
+            )
+            self.days_scale = ttk.Scale(
+                self.frame,
+                orient="horizontal",
+                command=lambda value: self.show_scenario_day(round(float(value))),
+            )
+            self.days_scale.grid(row=9, column=2, sticky="ew", padx=10)
+
+            figure.colorbar(
+                self.scenario_ax.imshow(
+                    [[0.0]], origin="lower", aspect="auto", cmap="RdYlGn"
+                ),
+                ax=self.scenario_ax,
+                label="P&L",
+            )
+            self.scenario_ax.set_xlabel("Spot")
+            self.scenario_ax.set_ylabel("Vol shift")
+
+        spots, shifts = grid["spot"], grid["vol_shift"]
+        image = self.scenario_ax.images[0]
+        image.set_extent([spots[0], spots[-1], shifts[0], shifts[-1]])
+        # Symmetric around zero so gains are green and losses red on every day
+        bound = np.abs(grid["pnl"]).max() or 1.0
+        image.set_clim(-bound, bound)
+        self.days_scale.config(to=grid["days"][-1])
+        self.days_scale.set(0)
+        self.show_scenario_day(0)
+
+    def show_scenario_day(self, index):
+        """Show one days-forward slice of the current scenario grid."""
+        grid = self.scenario_result
+        index = min(index, len(grid["days"]) - 1)
+        self.scenario_ax.images[0].set_data(grid["pnl"][index])
+        self.scenario_ax.set_title(f"P&L after {int(grid['days'][index])} days")
+        self.scenario_canvas.draw_idle()
+
+    def add_leg(self):
+        """Add the contract in the inputs to the strategy as one leg.
+
+        The entry price is the entered option price in IV mode and the
+        model price otherwise.
+        """
+        try:
+            quantity = float(self.quantity_entry.get())
+            lot_size = float(self.lot_size_entry.get())
+        except ValueError:
+            tk.messagebox.showerror("Invalid Input", "Please enter valid leg sizes.")
+            return
+        inputs = self._contract_inputs()
+        if inputs is None:
+            return
+        spot, strike, t, volatility, price = inputs
+        option_type = self.option_type_var.get()
+        if price is None:
+            price = float(
+                self.calculator.price_batch(spot, strike, t, volatility, option_type)
+            )
+
+        # By expiry, so the leg's time to expiration keeps decaying
+        self.portfolio.add_leg(
+            option_type=option_type,
+            strike=strike,
+            expiry=self.expiry_entry.get(),
+            volatility=volatility,
+            quantity=quantity,
+            lot_size=lot_size,
+            entry_price=price,
+        )
+        self.update_legs_label()
+
+    def clear_legs(self):
+        self.portfolio.clear()
+        self.update_legs_label()
+
+    def update_legs_label(self):
+        """List the strategy's legs."""
+        lines = [
+            f"{leg['quantity']:+g} x{leg['lot_size']:g} {leg['option_type']}"
+            f" {leg['strike']:g} @ {leg['entry_price']:.2f}"
+            for leg in self.portfolio.records()
+        ]
+        self.legs_label.config(text="\n".join(lines) or "No legs")
+
+    def value_strategy(self):
+        """Show the strategy's value, P&L and Greeks and plot its payoff."""
+        if not len(self.portfolio):
+            self.result_label.config(text="Add legs to value a strategy.")
+            return
+        if not self.apply_model_settings():
+            return
+        try:
+            spot = float(self.spot_entry.get())
+            spot_range = float(self.spot_range_entry.get()) / 100.0
+        except ValueError:
+            tk.messagebox.showerror("Invalid Input", "Please enter valid numbers.")
+            return
+
+        total = self.portfolio_engine.value(spot)["total"]
+        greeks = {name: value for name, value in total.items() if name != "pnl"}
+        self.result_label.config(
+            text=f"P&L:\t{total['pnl']:.2f}\n" + format_greeks(greeks)
+        )
+
+        spots = np.linspace(spot * (1 - spot_range), spot * (1 + spot_range), 201)
+        self.plot_payoff(
+            spots,
+            self.portfolio_engine.payoff(spots),
+            self.portfolio_engine.payoff(spots, days=0),
+        )
+
+    def plot_payoff(self, spots, expiry_pnl, today_pnl):
+        """Plot the strategy's P&L at expiry and today, reusing one Figure."""
+        if self.payoff_canvas is None:
+            figure = Figure(figsize=(6, 4.5))
+            ax = figure.add_subplot(1, 1, 1)
+            self.payoff_lines = (
+                ax.plot([], [], color="blue", label="At expiry")[0],
+                ax.plot([], [], color="orange", linestyle="--", label="Today")[0],
+            )
+            ax.axhline(0.0, color="grey", linewidth=0.8)
+            ax.set_xlabel("Spot")
+            ax.set_ylabel("P&L")
+            ax.grid(True, color="#d0d0d0", linewidth=0.5)
+            ax.legend()
+            self.payoff_ax = ax
+            self.payoff_canvas = FigureCanvasTkAgg(figure, master=self.frame)
+            self.payoff_canvas.get_tk_widget().grid(
+                row=0, column=3, rowspan=9, padx=10, pady=10
+            )
 
-            self.result_label.config(text="\n".join(results))
+        for line, pnl in zip(self.payoff_lines, (expiry_pnl, today_pnl)):
+            line.set_data(spots, pnl)
+        self.payoff_ax.relim()
+        self.payoff_ax.autoscale_view()
+        self.payoff_canvas.draw_idle()
 
     def generate_dynamic_spot_prices(self, spot):
         """Generates a list of spot prices around the given spot price."""
@@ -208,6 +566,8 @@ class OptionCalculatorTab:
             "calculation_mode": self.calculation_mode.get(),
             "option_price": self.price_entry.get(),
             "volatility": self.volatility_entry.get(),
+            "model": self.model_var.get(),
+            "dividend_yield": self.dividend_yield_entry.get(),
         }
         with open(self.TMP_FILE, "w") as f:
             json.dump(input_data, f)
@@ -226,18 +586,50 @@ class OptionCalculatorTab:
                 )
                 self.price_entry.insert(0, input_data.get("option_price", ""))
                 self.volatility_entry.insert(0, input_data.get("volatility", ""))
+                self.model_var.set(input_data.get("model", MODEL_LABELS["bsm"]))
+                self.dividend_yield_entry.delete(0, tk.END)
+                self.dividend_yield_entry.insert(
+                    0, input_data.get("dividend_yield", "0")
+                )
 
 
 class MarketDataTab:
-    def __init__(self, parent):
-        self.data_fetcher = DataFetcher()
+    POLL_INTERVAL_MS = 50
+    CHART_BARS = 125
+    DASHBOARD_TIMEOUT = 10
+    LIVE_REFRESH_MS = 500  # Fastest the chart redraws while streaming
+    MONTE_CARLO_FAN_DAYS = 63  # The chart's fan reaches 3 months ahead
+    MONTE_CARLO_METHOD = "bootstrap"
+    MONTE_CARLO_SEED = 0  # Fixed so redraws of a ticker show the same bands
+
+    def __init__(self, parent, prefetch=False, data_fetcher=None):
+        self.data_fetcher = data_fetcher or DataFetcher()
+        self.indicators = IndicatorEngine()
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="market")
+        self.pending_fetch = None
+        self.fetch_generation = 0
         self.canvas = None
+        self.chart = None
+        self.dashboard_label = None
+        self.showing_dashboard = False
+        self.live = False
+        self.live_job = None  # (future, ticker_info) of the in-flight live redraw
+        self.live_stale = False
+        self.dashboard_image = None  # Tk only shows a PhotoImage while it's referenced
         self.ema_data = {}
         self.last_group = None
         self.ticker_info = None
         self.show_projection = False
+        self.show_monte_carlo = False
         self.selected_date = None
         self.create_tab(parent)
+        if prefetch:
+            self.prefetch_watchlist()
+
+    def prefetch_watchlist(self):
+        """Warm the data cache for every watchlist ticker in the background."""
+        tickers = [ticker["ticker"] for ticker in all_tickers()]
+        self.data_fetcher.prefetch(tickers + [DataFetcher.USDINR_TICKER])
 
     def create_tab(self, parent):
         """Create the Market Data tab and its components."""
@@ -264,44 +656,7 @@ class MarketDataTab:
 
     def create_market_data_buttons(self, parent):
         """Create buttons for market data groups: Indices, Stocks, Commodities."""
-        market_groups = {
-            "Indices": [
-                {"label": "NIFTY 50", "ticker": "^NSEI"},
-                {"label": "BANKNIFTY", "ticker": "^NSEBANK"},
-                {"label": "MIDCAP 50", "ticker": "^NSEMDCP50"},
-            ],
-            "Stocks": [
-                {"label": "ITC", "ticker": "ITC.NS"},
-                {"label": "HDFCBANK", "ticker": "HDFCBANK.NS"},
-                {"label": "ICICIBANK", "ticker": "ICICIBANK.NS"},
-                {"label": "INFOSYS", "ticker": "INFY.NS"},
-                {"label": "RELIANCE", "ticker": "RELIANCE.NS"},
-            ],
-            "Commodities": [
-                {
-                    "label": "CRUDE MCX",
-                    "ticker": "CL=F",
-                    "is_forex": True,
-                    "group": "MCX",
-                },
-                {
-                    "label": "GOLD MCX",
-                    "ticker": "GC=F",
-                    "is_forex": True,
-                    "multiplier": 31.1035,
-                    "group": "MCX",
-                },
-                {
-                    "label": "SILVER MCX",
-                    "ticker": "SI=F",
-                    "is_forex": True,
-                    "multiplier": 31.1035,
-                    "group": "MCX",
-                },
-            ],
-        }
-
-        for row, (title, group) in enumerate(market_groups.items()):
+        for row, (title, group) in enumerate(MARKET_GROUPS.items()):
             self.add_group_buttons(parent, group, title, row)
 
     def add_group_buttons(self, parent, group, title, row):
@@ -317,6 +672,13 @@ class MarketDataTab:
                 width=10,
             ).grid(row=index, column=0, padx=10, pady=5)
 
+        ttk.Button(
+            group_frame,
+            text="Dashboard",
+            command=lambda: self.show_dashboard(title, group),
+            width=10,
+        ).grid(row=len(group), column=0, padx=10, pady=5)
+
     def show_date_input_dialog(self):
         """Prompt the user to enter a date."""
         date_input = simpledialog.askstring(
@@ -336,8 +698,22 @@ class MarketDataTab:
         """Fetch and plot data for the specified date."""
         self.fetch_and_plot_data(self.ticker_info, date_input=date_input)
 
-    def fetch_and_plot_data(self, ticker_info, date_input=None):
-        """Fetch and plot candlestick data for the selected ticker."""
+    def step_date(self, bars):
+        """Move the as-of date by ``bars`` trading days (Command+Left/Right)."""
+        if self.ticker_info:
+            self.fetch_and_plot_data(
+                self.ticker_info, date_input=self.selected_date, step=bars
+            )
+
+    def fetch_and_plot_data(self, ticker_info, date_input=None, step=0):
+        """Fetch candlestick data for the selected ticker in the background.
+
+        The download runs on the worker pool and the chart is drawn from
+        ``_poll_fetch`` on the Tk thread once it completes. Clicking another
+        ticker supersedes the pending request, whose result is then ignored.
+        ``date_input`` charts the history as of that date, moved ``step``
+        bars.
+        """
         current_group = ticker_info.get("group", "Others")
 
         if self.last_group and self.last_group != current_group:
@@ -346,65 +722,359 @@ class MarketDataTab:
         self.last_group = current_group
         self.ticker_info = ticker_info
 
-        self.market_result_label.config(text=f"Fetching {ticker_info['label']} data...")
-        self.frame.update()
+        self._submit(
+            self._load_market_data,
+            (ticker_info, date_input, self.live, step),
+            f"Fetching {ticker_info['label']} data...",
+            lambda range_text, data, fan: self._show_market_data(
+                ticker_info, range_text, data, fan, as_of=bool(date_input or step)
+            ),
+            "market_data",
+        )
+
+    @METRICS.timed("load_market_data")
+    def _load_market_data(self, ticker_info, date_input=None, live=False, step=0):
+        """Download and prepare chart data; runs on a worker thread.
+
+        Returns the range text and a frame holding only the bars to chart,
+        with indicator and projection columns already in display units.
+        With ``live`` the history includes the streaming intraday bar.
+        ``date_input`` and ``step`` pick the last bar by binary search, and
+        everything is computed as of that bar from cached state: ranges
+        from prefix sums, indicators from the engine's full-history buffers
+        and the projection for the charted window only.
+        """
+        data = None
+        if live:
+            data = self.data_fetcher.live_history(ticker_info["ticker"])
+        if data is None:
+            data = self.data_fetcher.download_data(
+                ticker_info["ticker"], ticker_info["label"], timeout=None
+            )
+        if data is None:
+            return None, None, None
 
+        rows = len(data)
+        if date_input:
+            rows = self.data_fetcher.as_of_rows(data, date_input)
+        rows = min(max(rows + step, 0), len(data))
+        if rows == 0:
+            return None, None, None
+
+        name = ticker_info["label"]
+        if rows < len(data):
+            name += f" ({data.index[rows - 1]:%Y-%m-%d})"
         range_text = self.data_fetcher.calculate_std_for_ticker(
             ticker_info["ticker"],
-            ticker_info["label"],
+            name,
             ticker_info.get("is_forex", False),
             ticker_info.get("multiplier", 1.0),
+            timeout=None,
+            data=data,
+            rows=rows,
         )
-        self.market_result_label.config(text=range_text)
 
-        data = self.data_fetcher.download_data(
-            ticker_info["ticker"], ticker_info["label"]
+        units = self.data_fetcher.display_units(
+            ticker_info.get("is_forex", False),
+            ticker_info.get("multiplier", 1.0),
+            timeout=None,
         )
+        if units is None:
+            return range_text, None, None
 
-        if ticker_info.get("is_forex", False):
-            usdinr = self.data_fetcher.get_usdinr_rate()
-            data *= usdinr
-        if ticker_info.get("multiplier", 1.0) != 1.0:
-            data /= ticker_info["multiplier"]
+        chart = chart_frame(
+            data, self.indicators, ticker_info["ticker"], units, rows, self.CHART_BARS
+        )
+        lo = rows - len(chart)
+        factors = units.factors(chart.index)
+        chart["Projection 5 Years"] = self._projection(data, rows, lo) * factors
+
+        fan = None
+        if self.show_monte_carlo:
+            fan, fan_text = self._monte_carlo(
+                data["Close"].to_numpy()[:rows],
+                factors[-1],
+                self.data_fetcher.calendar_periods(
+                    ticker_info["ticker"], data.index[rows - 1]
+                ),
+            )
+            range_text = (range_text or "") + fan_text
+        return range_text, chart, fan
+
+    def _monte_carlo(self, close, scale, horizons=None):
+        """Simulate percentile bands for the chart's fan and the period horizons.
+
+        Returns the fan (days ahead and bands in display units) and text
+        lines with the 5th/50th/95th percentiles for each of ``horizons``
+        (label -> trading days, PERIODS by default).
+        """
+        horizons = DataFetcher.PERIODS if horizons is None else horizons
+        days = np.union1d(
+            np.arange(1, self.MONTE_CARLO_FAN_DAYS + 1), list(horizons.values())
+        )
+        try:
+            bands = (
+                percentile_bands(
+                    close,
+                    days,
+                    method=self.MONTE_CARLO_METHOD,
+                    seed=self.MONTE_CARLO_SEED,
+                )["bands"]
+                * scale
+            )
+        except ValueError as e:
+            return None, f"Monte Carlo: {e}\n"
+
+        in_fan = days <= self.MONTE_CARLO_FAN_DAYS
+        text = ""
+        for period, horizon in horizons.items():
+            low, median, high = bands[[0, 2, -1], np.searchsorted(days, horizon)]
+            text += f"MC {period}:\t{low:.0f}  - {median:.0f} - {high:.0f}\n"
+        return {"days": days[in_fan], "bands": bands[:, in_fan]}, text
+
+    def _poll_fetch(self, future, generation, on_done, name=None, started=None):
+        """Hand a background job's future to on_done once it is ready.
+
+        The time from the click to on_done returning is recorded as
+        "<name>_click"; the canvas redraw it schedules is "canvas_draw".
+        """
+        if generation != self.fetch_generation:
+            METRICS.increment("superseded_jobs")
+            return  # A newer request has replaced this one
+        if not future.done():
+            self.frame.after(
+                self.POLL_INTERVAL_MS,
+                self._poll_fetch,
+                future,
+                generation,
+                on_done,
+                name,
+                started,
+            )
+            return
+
+        self.pending_fetch = None
+        self._set_loading(None)
+        try:
+            result = future.result()
+        except Exception as e:
+            self.market_result_label.config(text=f"Error fetching data: {str(e)}")
+            return
+        on_done(*result)
+        if name is not None:
+            METRICS.observe(f"{name}_click", time.perf_counter() - started, started)
+
+    def _show_market_data(self, ticker_info, range_text, data, fan=None, as_of=False):
+        if as_of and data is not None:
+            # Later steps move from the bar actually shown
+            self.selected_date = f"{data.index[-1]:%Y-%m-%d}"
+        self.market_result_label.config(
+            text=range_text or f"No data available for {ticker_info['label']}"
+        )
+        if data is not None:
+            self.plot_candlestick(data, ticker_info["label"], fan)
+
+    def _submit(self, fn, args, loading_text, on_done, name=None):
+        """Run fn(*args) on the worker pool, superseding any pending job.
+
+        ``name`` records the job's click-to-display latency (see _poll_fetch).
+        """
+        started = time.perf_counter()
+        if self.pending_fetch is not None:
+            self.pending_fetch.cancel()
+
+        self.fetch_generation += 1
+        self.pending_fetch = self.executor.submit(fn, *args)
+        self._set_loading(loading_text)
+        self.frame.after(
+            self.POLL_INTERVAL_MS,
+            self._poll_fetch,
+            self.pending_fetch,
+            self.fetch_generation,
+            on_done,
+            name,
+            started,
+        )
 
-        if date_input:
-            try:
-                date_input = pd.to_datetime(date_input)
-                data = data.loc[data.index <= date_input]
-            except Exception as e:
-                self.market_result_label.config(text=f"Error filtering data: {str(e)}")
-                return
+    def show_dashboard(self, title, group):
+        """Chart every ticker of a watchlist group at once, with its EMA table.
+
+        The group is bulk-loaded as one snapshot and the grid is rendered to
+        an image on the worker pool; the Tk thread only displays it.
+        """
+        self._submit(
+            self._load_dashboard,
+            (group,),
+            f"Loading {title} dashboard...",
+            lambda snapshot, image: self._show_dashboard(title, group, snapshot, image),
+            "dashboard",
+        )
 
-        self._add_projection(data)
-        if data is not None:
-            self.plot_candlestick(data, ticker_info["label"])
+    def _load_dashboard(self, group):
+        """Load a group snapshot and render its grid; runs on a worker thread."""
+        snapshot = load_snapshot(
+            self.data_fetcher,
+            self.indicators,
+            group,
+            self.CHART_BARS,
+            timeout=self.DASHBOARD_TIMEOUT,
+        )
+        image = render_grid(snapshot["frames"]) if snapshot["frames"] else None
+        return snapshot, image
+
+    def _show_dashboard(self, title, group, snapshot, image):
+        frames = snapshot["frames"]
+        text = (
+            f"{title}: {len(frames)}/{len(group)} charts"
+            f" in {snapshot['elapsed']:.1f}s"
+        )
+        if snapshot["missing"]:
+            text += f"\nNo data: {', '.join(snapshot['missing'])}"
+        self.market_result_label.config(text=text)
 
-    def _add_projection(self, data):
-        """Calculate and add a 5-year projection to the data."""
-        data["Projection 5 Years"] = float("nan")
+        self.ema_data = {
+            label: {"ema": frame["EMA_30"].iloc[-1], "close": frame["Close"].iloc[-1]}
+            for label, frame in frames.items()
+        }
+        self.last_group = group[0].get("group", "Others")
+        self.update_ema_label()
 
-        if len(data) > 1512:
-            start_price = data["Close"].iloc[0]
-            end_price = data["Close"].iloc[-1]
-            n_years = (data.index[-1] - data.index[0]).days / 365.0
+        if image is None:
+            return
+        self.showing_dashboard = True
+        if self.canvas is not None:
+            self.canvas.get_tk_widget().grid_remove()
+        self.dashboard_image = tk.PhotoImage(data=image)
+        if self.dashboard_label is None:
+            self.dashboard_label = ttk.Label(self.frame)
+            self.dashboard_label.grid(row=0, column=1, rowspan=5, padx=20, pady=10)
+        self.dashboard_label.config(image=self.dashboard_image)
+        self.dashboard_label.grid()
+
+    def _set_loading(self, text):
+        """Show or clear the loading state of the Market Data tab."""
+        if text:
+            self.market_result_label.config(text=text)
+        self.frame.config(cursor="watch" if text else "")
+
+    def start_live(self, source=None):
+        """Stream intraday prices for the watchlist into the current chart.
+
+        ``source`` is a providers.TickSource and defaults to polling the
+        data fetcher's provider.
+        """
+        if source is None:
+            source = PollingTickSource(self.data_fetcher.provider)
+        tickers = [ticker["ticker"] for ticker in all_tickers()]
+        self.data_fetcher.start_stream(tickers, source)
+        self.live = True
+        self.live_stale = False
+        self.market_result_label.config(text="Live streaming started")
+        self.frame.after(self.LIVE_REFRESH_MS, self._poll_live)
+
+    def stop_live(self):
+        """Stop streaming and redraw the current ticker from stored history."""
+        self.live = False
+        self.live_job = None
+        self.data_fetcher.stop_stream()
+        if self.ticker_info and not self.showing_dashboard:
+            self.fetch_and_plot_data(self.ticker_info)
+
+    def toggle_live(self):
+        """Toggle live intraday streaming."""
+        if self.live:
+            self.stop_live()
+        else:
+            self.start_live()
+
+    def _poll_live(self):
+        """Redraw the current ticker from its live bar; runs every LIVE_REFRESH_MS.
+
+        The fetcher coalesces ticks into one update per ticker and at most
+        one redraw is in flight, so the Tk loop sees a bounded update rate
+        however fast ticks arrive.
+        """
+        if not self.live:
+            return
+        ticker_info = self.ticker_info
+        if ticker_info and ticker_info["ticker"] in self.data_fetcher.live_updates():
+            self.live_stale = True
+
+        if self.live_job is not None and self.live_job[0].done():
+            (future, job_ticker), self.live_job = self.live_job, None
+            if (
+                job_ticker is self.ticker_info
+                and self.pending_fetch is None
+                and not self.showing_dashboard
+            ):
+                try:
+                    range_text, data, fan = future.result()
+                except Exception as e:
+                    self.market_result_label.config(
+                        text=f"Error fetching data: {str(e)}"
+                    )
+                else:
+                    self.ema_data.pop(job_ticker["label"], None)  # Refresh its row
+                    self._show_market_data(job_ticker, range_text, data, fan)
+
+        if (
+            self.live_stale
+            and self.live_job is None
+            and self.pending_fetch is None
+            and not self.showing_dashboard
+        ):
+            self.live_stale = False
+            future = self.executor.submit(
+                self._load_market_data, ticker_info, None, True
+            )
+            self.live_job = (future, ticker_info)
+
+        self.frame.after(self.LIVE_REFRESH_MS, self._poll_live)
+
+    def shutdown(self):
+        """Cancel queued fetches and stop the worker pools."""
+        self.live = False
+        self.fetch_generation += 1
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.data_fetcher.shutdown()
+
+    def _projection(self, data, rows, lo):
+        """Return the 5-year projection line for rows [lo, rows) of data.
+
+        The line runs from the highest close of the year five years before
+        the last bar to that price grown at the history's CAGR; rows before
+        its start are NaN.
+        """
+        projection = np.full(rows - lo, np.nan)
+
+        if rows > 1512:
+            close = data["Close"].to_numpy()
+            start_price = close[0]
+            end_price = close[rows - 1]
+            n_years = (data.index[rows - 1] - data.index[0]).days / 365.0
             cum_return = (end_price / start_price) - 1
             discount_rate = (1 + cum_return) ** (1 / n_years) - 1
 
-            five_years_ago_price = data.iloc[-1512:].head(252)["Close"].max()
+            five_years_ago_price = close[rows - 1512 : rows - 1512 + 252].max()
             projected_value = five_years_ago_price * (1 + discount_rate) ** 5
 
-            data.at[data.index[-1], "Projection 5 Years"] = projected_value
-            data.at[data.index[-1255], "Projection 5 Years"] = five_years_ago_price
-            data["Projection 5 Years"].interpolate(inplace=True)
+            first, last = rows - 1255, rows - 1
+            positions = np.arange(lo, rows)
+            line = five_years_ago_price + (projected_value - five_years_ago_price) * (
+                positions - first
+            ) / (last - first)
+            projection = np.where(positions >= first, line, np.nan)
+
+        return projection
 
-    def plot_candlestick(self, data, ticker_name):
-        """Plot a candlestick chart for the market data."""
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
+    def plot_candlestick(self, data, ticker_name, fan=None):
+        """Plot a candlestick chart for the market data.
 
-        data["EMA_30"] = data["Close"].ewm(span=30, adjust=False).mean()
-        data["EMA_200"] = data["Close"].ewm(span=200, adjust=False).mean()
-        data = data[-125:]
+        The Figure and canvas are created on first use and then reused; later
+        calls only update the chart's artists. ``fan`` holds Monte Carlo
+        bands drawn past the last bar when that overlay is on.
+        """
+        data = data[-self.CHART_BARS :]
 
         close = data.iloc[-1]["Close"]
         ema = data.iloc[-1]["EMA_30"]
@@ -414,44 +1084,22 @@ class MarketDataTab:
 
         self.update_ema_label()
 
-        addplots = [
-            mpf.make_addplot(data["EMA_30"], color="blue"),
-            mpf.make_addplot(data["EMA_200"], color="red"),
-        ]
-
-        if self.show_projection and not data["Projection 5 Years"].isna().all():
-            addplots.append(
-                mpf.make_addplot(
-                    data["Projection 5 Years"], color="green", linestyle="--", width=0.8
-                )
+        if self.dashboard_label is not None:
+            self.dashboard_label.grid_remove()
+        self.showing_dashboard = False
+        if self.chart is None:
+            self.canvas = TimedCanvas(Figure(figsize=(8, 5.75)), master=self.frame)
+            self.canvas.get_tk_widget().grid(
+                row=0, column=1, rowspan=5, padx=20, pady=10
             )
+            self.chart = CandlestickChart(self.canvas)
+        else:
+            self.canvas.get_tk_widget().grid()
 
-        fig, ax = mpf.plot(
-            data,
-            type="hollow_candle",
-            style="charles",
-            title=ticker_name,
-            ylabel="Price",
-            addplot=addplots,
-            returnfig=True,
-        )
-
-        ax[0].text(
-            0.5,
-            0.95,
-            f"{close:.2f}",
-            horizontalalignment="right",
-            verticalalignment="top",
-            transform=ax[0].transAxes,
-            fontsize=11,
+        self.chart.update(
+            data, ticker_name, self.show_projection, fan, self.show_monte_carlo
         )
 
-        self.canvas = FigureCanvasTkAgg(fig, master=self.frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().grid(row=0, column=1, rowspan=5, padx=20, pady=10)
-
-        plt.close(fig)
-
     def update_ema_label(self):
         """Update the EMA label with the latest EMA and close prices."""
         txt = "Ticker\t    EMA\tCLOSE\tBULLISH"
@@ -462,15 +1110,25 @@ class MarketDataTab:
             txt += f"\n{ticker[:8]}\t    {ema:.0f}\t{close:.0f}\t{bullish}"
         self.ema_label.config(text=txt)
 
+    def toggle_monte_carlo(self):
+        """Toggle the Monte Carlo percentile fan and its range lines."""
+        self.show_monte_carlo = not self.show_monte_carlo
+        if not self.show_monte_carlo:
+            if self.chart is not None:
+                self.chart.set_fan_visible(False)
+        elif self.ticker_info:
+            # Bands are only simulated while the overlay is on
+            self.fetch_and_plot_data(self.ticker_info, date_input=self.selected_date)
+
     def toggle_projection_line(self):
         """Toggle the projection line on the candlestick chart."""
         self.show_projection = not self.show_projection
-        if self.ticker_info:
-            self.fetch_and_plot_data(self.ticker_info, date_input=self.selected_date)
+        if self.chart is not None:
+            self.chart.set_projection_visible(self.show_projection)
 
 
 class OptionCalculatorUI:
-    def __init__(self, root):
+    def __init__(self, root, prefetch=False, data_fetcher=None):
         self.root = root
         self.root.grid_columnconfigure(0, weight=1)
         self.root.grid_rowconfigure(0, weight=1)
@@ -479,7 +1137,9 @@ class OptionCalculatorUI:
         self.notebook.grid(row=0, column=0, sticky="nsew")
 
         self.option_calculator_tab = OptionCalculatorTab(self.notebook)
-        self.market_data_tab = MarketDataTab(self.notebook)
+        self.market_data_tab = MarketDataTab(
+            self.notebook, prefetch=prefetch, data_fetcher=data_fetcher
+        )
 
         # Load saved data after initialization
         self.option_calculator_tab.load_saved_data()
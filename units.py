@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")  # Volume is never converted
+
+
+class DisplayUnits:
+    """Converts a ticker's quoted prices to display units when they are read.
+
+    A display price is the quoted price times the USD/INR rate divided by
+    the ticker's multiplier. With ``fx_dates``/``fx_rates`` (a sorted
+    USD/INR close history) each bar uses the close on or before its own
+    date, so a 2016 bar is converted at the 2016 rate; otherwise the single
+    ``rate`` applies. Nothing converted is stored: callers pass only the
+    rows they show, and the cached history is never copied or modified.
+    """
+
+    def __init__(self, multiplier=1.0, rate=1.0, fx_dates=None, fx_rates=None):
+        self.multiplier = multiplier
+        self.rate = rate
+        self.fx_dates = fx_dates  # int64 nanoseconds, as DatetimeIndex.asi8
+        self.fx_rates = fx_rates
+
+    def factors(self, index):
+        """Quoted -> display factor for each date of a DatetimeIndex."""
+        if self.fx_dates is None:
+            return np.full(len(index), self.rate / self.multiplier)
+        positions = np.searchsorted(self.fx_dates, index.asi8, side="right") - 1
+        # Bars older than the USD/INR history use its first close
+        return self.fx_rates[np.maximum(positions, 0)] / self.multiplier
+
+    def factor_at(self, date):
+        return self.factors(pd.DatetimeIndex([date]))[0]
+
+    def convert(self, window, factors=None):
+        """Return a new frame of window's rows with price columns in display units.
+
+        ``factors`` (aligned with window's rows) defaults to factors(window.index).
+        """
+        if factors is None:
+            factors = self.factors(window.index)
+        return pd.DataFrame(
+            {
+                column: window[column].to_numpy(dtype=float)
+                * (factors if column in PRICE_COLUMNS else 1.0)
+                for column in window.columns
+            },
+            index=window.index,
+        )
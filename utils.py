@@ -1,5 +1,4 @@
-from datetime import datetime
-from tkinter import messagebox
+from trading_calendar import NSE
 
 
 def validate_inputs(
@@ -9,7 +8,9 @@ def validate_inputs(
     price_entry,
     volatility_entry,
     calculation_mode,
+    optional_volatility=False,
 ):
+    """Read the calculator inputs; a blank volatility is None if optional."""
     try:
         spot = float(spot_entry.get())
         strike = float(strike_entry.get())
@@ -19,18 +20,22 @@ def validate_inputs(
             price = float(price_entry.get())
             return spot, strike, expiry_date, price, None
         else:
-            volatility = float(volatility_entry.get())
-            return spot, strike, expiry_date, None, volatility
+            volatility = volatility_entry.get()
+            if optional_volatility and not volatility.strip():
+                return spot, strike, expiry_date, None, None
+            return spot, strike, expiry_date, None, float(volatility)
 
     except ValueError:
+        # Imported lazily so headless callers of this module never load Tk
+        from tkinter import messagebox
+
         messagebox.showerror("Invalid Input", "Please enter valid numbers.")
         return None
 
 
 def calculate_time_to_expiration(expiry_date):
-    today = datetime.today()
-    expiry = datetime.strptime(expiry_date, "%Y-%m-%d")
-    return (expiry - today).days / 365.0
+    """Years of NSE trading left until the expiry's 15:30 close (see year_fraction)."""
+    return float(NSE.year_fraction(expiry_date))
 
 
 def toggle_inputs(calculation_mode, price_entry, volatility_entry):
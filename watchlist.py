@@ -0,0 +1,58 @@
+MARKET_GROUPS = {
+    "Indices": [
+        {"label": "NIFTY 50", "ticker": "^NSEI"},
+        {"label": "BANKNIFTY", "ticker": "^NSEBANK"},
+        {"label": "MIDCAP 50", "ticker": "^NSEMDCP50"},
+    ],
+    "Stocks": [
+        {"label": "ITC", "ticker": "ITC.NS"},
+        {"label": "HDFCBANK", "ticker": "HDFCBANK.NS"},
+        {"label": "ICICIBANK", "ticker": "ICICIBANK.NS"},
+        {"label": "INFOSYS", "ticker": "INFY.NS"},
+        {"label": "RELIANCE", "ticker": "RELIANCE.NS"},
+    ],
+    "Commodities": [
+        {
+            "label": "CRUDE MCX",
+            "ticker": "CL=F",
+            "is_forex": True,
+            "group": "MCX",
+        },
+        {
+            "label": "GOLD MCX",
+            "ticker": "GC=F",
+            "is_forex": True,
+            "multiplier": 31.1035,
+            "group": "MCX",
+        },
+        {
+            "label": "SILVER MCX",
+            "ticker": "SI=F",
+            "is_forex": True,
+            "multiplier": 31.1035,
+            "group": "MCX",
+        },
+    ],
+}
+
+
+def all_tickers():
+    """Return every ticker entry across all market groups."""
+    return [ticker for group in MARKET_GROUPS.values() for ticker in group]
+
+
+def find_ticker(name):
+    """Look up a watchlist entry by ticker symbol or label (case-insensitive).
+
+    Failing an exact match, the first word of a label is accepted when only
+    one label starts with it, so NIFTY finds "NIFTY 50" and GOLD finds
+    "GOLD MCX".
+    """
+    name = name.upper()
+    for ticker in all_tickers():
+        if name in (ticker["ticker"].upper(), ticker["label"].upper()):
+            return ticker
+    matches = [
+        ticker for ticker in all_tickers() if ticker["label"].upper().split()[0] == name
+    ]
+    return matches[0] if len(matches) == 1 else None